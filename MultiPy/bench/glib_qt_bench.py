@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# glib_qt_bench.py
+# GLib/Qt 메인 루프 통합 방식별 유휴 CPU·wakeup과 GLib 콜백 디스패치 지연 측정
+#
+# 사용법:
+#   python3 bench/glib_qt_bench.py                # poll / auto 두 방식 비교
+#   python3 bench/glib_qt_bench.py --idle 10 --samples 500
+#
+# 각 방식은 별도 프로세스에서 실행된다 (통합은 프로세스당 한 번만 가능).
+# 화면이 없는 환경에서는 QT_QPA_PLATFORM=offscreen 으로 실행된다.
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+RECEIVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../receiver"))
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def run_one(mode, idle_s, samples, interval_ms):
+    """현재 프로세스에서 한 가지 통합 방식 측정 → dict"""
+    sys.path.insert(0, RECEIVER_DIR)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt5 import QtCore, QtWidgets
+    from gi.repository import GLib
+    from glib_qt_integration import integrate_glib_into_qt
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    _keep = integrate_glib_into_qt(mode)
+    result = {"mode": mode}
+
+    def _measure_idle():
+        # 유휴 구간: 아무 작업도 없는 상태의 CPU 시간과 자발적 컨텍스트 스위치(wakeup 근사)
+        ru0 = resource.getrusage(resource.RUSAGE_SELF)
+        cpu0, t0 = time.process_time(), time.monotonic()
+
+        def _done():
+            ru1 = resource.getrusage(resource.RUSAGE_SELF)
+            wall = time.monotonic() - t0
+            result["idle_cpu_pct"] = round(100.0 * (time.process_time() - cpu0) / wall, 2)
+            result["idle_wakeups_per_s"] = round((ru1.ru_nvcsw - ru0.ru_nvcsw) / wall, 1)
+            _measure_latency()
+        QtCore.QTimer.singleShot(int(idle_s * 1000), _done)
+
+    def _measure_latency():
+        # 다른 스레드에서 GLib.idle_add → 콜백 실행까지 지연 (receiver_manager 경로와 동일)
+        lat = []
+
+        def _cb(t_post):
+            lat.append((time.perf_counter() - t_post) * 1000.0)
+            if len(lat) >= samples:
+                result["dispatch_p50_ms"] = round(_percentile(lat, 0.50), 3)
+                result["dispatch_p99_ms"] = round(_percentile(lat, 0.99), 3)
+                result["dispatch_max_ms"] = round(max(lat), 3)
+                app.quit()
+            return False
+
+        def _producer():
+            for _ in range(samples):
+                time.sleep(interval_ms / 1000.0)
+                GLib.idle_add(_cb, time.perf_counter())
+
+        threading.Thread(target=_producer, daemon=True).start()
+
+    QtCore.QTimer.singleShot(200, _measure_idle)  # 시작 직후 안정화 대기
+    app.exec_()
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GLib/Qt 통합 방식별 유휴 CPU·디스패치 지연 비교")
+    ap.add_argument("--modes", default="poll,auto", help="비교할 방식 (쉼표 구분)")
+    ap.add_argument("--idle", type=float, default=5.0, help="유휴 측정 시간 (초)")
+    ap.add_argument("--samples", type=int, default=300, help="디스패치 지연 샘플 수")
+    ap.add_argument("--interval", type=float, default=7.0, help="idle_add 간격 (ms)")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        res = run_one(args.child, args.idle, args.samples, args.interval)
+        print("RESULT " + json.dumps(res))
+        return
+
+    rows = []
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--idle", str(args.idle),
+             "--samples", str(args.samples), "--interval", str(args.interval)],
+            capture_output=True, text=True)
+        line = next((l for l in out.stdout.splitlines() if l.startswith("RESULT ")), None)
+        if not line:
+            print(f"[BENCH] {mode} 실패:\n{out.stderr}")
+            continue
+        rows.append(json.loads(line[len("RESULT "):]))
+
+    print(f"{'mode':<6} {'idle CPU %':>10} {'wakeups/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for r in rows:
+        print(f"{r['mode']:<6} {r.get('idle_cpu_pct', 0):>10} {r.get('idle_wakeups_per_s', 0):>10} "
+              f"{r.get('dispatch_p50_ms', 0):>8} {r.get('dispatch_p99_ms', 0):>8} "
+              f"{r.get('dispatch_max_ms', 0):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# ice_setup_bench.py
+# ICE 정책(lan / stun / public)별 연결 수립 시간 비교 (루프백, 시그널링 서버 없음)
+#
+# 사용법:
+#   python3 bench/ice_setup_bench.py                         # lan, public 비교
+#   python3 bench/ice_setup_bench.py --policies lan,stun --stun stun://192.168.0.1:3478
+#
+# 한 프로세스 안에 webrtcbin 두 개를 두고 SDP/후보를 직접 주고받는다.
+#   offerer  : receiver와 같은 recvonly 트랜시버 (gst_utils.apply_ice_policy 적용)
+#   answerer : videotestsrc → x264enc → rtph264pay → webrtcbin (같은 정책)
+# 측정: create-offer 시작 → 양쪽 수집 완료(gathering) / offerer ICE connected.
+# public 정책은 외부 STUN 응답을 기다리므로 네트워크 상태에 따라 크게 달라진다.
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+RECEIVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../receiver"))
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class _Loopback:
+    """offerer/answerer webrtcbin 한 쌍, 한 번의 연결 수립 측정"""
+
+    def __init__(self, policy, timeout_s):
+        import gi
+        gi.require_version('Gst', '1.0')
+        gi.require_version('GstWebRTC', '1.0')
+        gi.require_version('GstSdp', '1.0')
+        from gi.repository import Gst, GstWebRTC
+        from gst_utils import apply_ice_policy
+
+        self.Gst, self.GstWebRTC = Gst, GstWebRTC
+        self.timeout_s = timeout_s
+        self.times = {}
+        self._t0 = None
+        self._done = threading.Event()
+
+        self.pipe_o = Gst.Pipeline.new("offerer")
+        self.off = Gst.ElementFactory.make("webrtcbin", "off")
+        self.off.set_property("bundle-policy", GstWebRTC.WebRTCBundlePolicy.MAX_BUNDLE)
+        apply_ice_policy(self.off, policy)
+        self.pipe_o.add(self.off)
+        caps = Gst.Caps.from_string("application/x-rtp,media=video,encoding-name=H264,payload=96")
+        self.off.emit("add-transceiver", GstWebRTC.WebRTCRTPTransceiverDirection.RECVONLY, caps)
+        self.off.connect("pad-added", self._on_pad_added)
+
+        self.pipe_a = Gst.parse_launch(
+            "videotestsrc is-live=true ! video/x-raw,width=320,height=240,framerate=30/1 ! "
+            "x264enc tune=zerolatency speed-preset=ultrafast key-int-max=30 ! "
+            "rtph264pay config-interval=-1 pt=96 ! "
+            "application/x-rtp,media=video,encoding-name=H264,payload=96 ! "
+            "webrtcbin name=ans bundle-policy=max-bundle")
+        self.ans = self.pipe_a.get_by_name("ans")
+        apply_ice_policy(self.ans, policy)
+
+        self.off.connect("on-ice-candidate", self._relay, self.ans, "offerer")
+        self.ans.connect("on-ice-candidate", self._relay, self.off, "answerer")
+        self.off.connect("notify::ice-gathering-state", self._on_gathering, "gather_offerer")
+        self.ans.connect("notify::ice-gathering-state", self._on_gathering, "gather_answerer")
+        self.off.connect("notify::ice-connection-state", self._on_ice_state)
+
+    def _mark(self, key):
+        if key not in self.times and self._t0 is not None:
+            self.times[key] = (time.perf_counter() - self._t0) * 1000.0
+
+    def _on_pad_added(self, _element, pad):
+        # 수신 RTP는 fakesink로 버림 (연결 측정만)
+        sink = self.Gst.ElementFactory.make("fakesink", None)
+        sink.set_property("async", False)
+        self.pipe_o.add(sink)
+        sink.sync_state_with_parent()
+        pad.link(sink.get_static_pad("sink"))
+
+    def _relay(self, _element, mline, candidate, peer, side):
+        if side == "offerer":
+            self._mark("first_candidate")
+        peer.emit("add-ice-candidate", mline, candidate)
+
+    def _on_gathering(self, element, _pspec, key):
+        if element.get_property("ice-gathering-state") == self.GstWebRTC.WebRTCICEGatheringState.COMPLETE:
+            self._mark(key)
+
+    def _on_ice_state(self, element, _pspec):
+        state = element.get_property("ice-connection-state")
+        if state in (self.GstWebRTC.WebRTCICEConnectionState.CONNECTED,
+                     self.GstWebRTC.WebRTCICEConnectionState.COMPLETED):
+            self._mark("connected")
+            self._done.set()
+        elif state == self.GstWebRTC.WebRTCICEConnectionState.FAILED:
+            self._done.set()
+
+    def _on_offer(self, promise, _data=None):
+        Gst = self.Gst
+        promise.wait()
+        offer = promise.get_reply().get_value("offer")
+        self.off.emit("set-local-description", offer, Gst.Promise.new())
+        self.ans.emit("set-remote-description", offer, Gst.Promise.new())
+        self.ans.emit("create-answer", None, Gst.Promise.new_with_change_func(self._on_answer, None))
+
+    def _on_answer(self, promise, _data=None):
+        Gst = self.Gst
+        promise.wait()
+        answer = promise.get_reply().get_value("answer")
+        self.ans.emit("set-local-description", answer, Gst.Promise.new())
+        self.off.emit("set-remote-description", answer, Gst.Promise.new())
+        self._mark("answer_applied")
+
+    def run(self):
+        Gst = self.Gst
+        self.pipe_a.set_state(Gst.State.PLAYING)
+        self.pipe_o.set_state(Gst.State.PLAYING)
+        self._t0 = time.perf_counter()
+        self.off.emit("create-offer", None, Gst.Promise.new_with_change_func(self._on_offer, None))
+        ok = self._done.wait(self.timeout_s) and "connected" in self.times
+        # 연결 후 수집 완료가 조금 늦게 올 수 있으므로 잠시 대기
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline and not {"gather_offerer", "gather_answerer"} <= set(self.times):
+            time.sleep(0.05)
+        self.pipe_o.set_state(Gst.State.NULL)
+        self.pipe_a.set_state(Gst.State.NULL)
+        return ok, dict(self.times)
+
+
+def bench_policy(policy, args):
+    if args.stun:
+        import gst_utils
+        gst_utils.LOCAL_STUN_SERVER = args.stun
+
+    connect, gather, failures = [], [], 0
+    for i in range(args.repeat):
+        ok, times = _Loopback(policy, args.timeout).run()
+        if not ok:
+            failures += 1
+            print(f"[BENCH] {policy} #{i + 1}: 연결 실패 ({args.timeout}s)")
+            continue
+        connect.append(times["connected"])
+        g = max(times.get("gather_offerer", 0.0), times.get("gather_answerer", 0.0))
+        if g:
+            gather.append(g)
+        print(f"[BENCH] {policy} #{i + 1}: connected {times['connected']:.1f} ms, "
+              f"gathering {g:.1f} ms")
+
+    return {
+        "policy": policy,
+        "runs": args.repeat,
+        "failures": failures,
+        "connect_p50_ms": round(_percentile(connect, 0.50), 1),
+        "connect_p99_ms": round(_percentile(connect, 0.99), 1),
+        "gather_p50_ms": round(_percentile(gather, 0.50), 1),
+        "gather_p99_ms": round(_percentile(gather, 0.99), 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ICE 정책별 루프백 연결 수립 시간 비교")
+    ap.add_argument("--policies", default="lan,public", help="lan,stun,public 중 쉼표 구분")
+    ap.add_argument("--stun", help="stun 정책에 쓸 로컬 STUN (stun://host:port)")
+    ap.add_argument("--repeat", type=int, default=10, help="정책별 반복 횟수")
+    ap.add_argument("--timeout", type=float, default=15.0, help="1회 연결 대기 상한 (초)")
+    ap.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    sys.path.insert(0, RECEIVER_DIR)
+    import gi
+    gi.require_version('Gst', '1.0')
+    from gi.repository import Gst
+    Gst.init(None)
+
+    rows = []
+    for policy in args.policies.split(","):
+        print(f"[BENCH] {policy} ...")
+        rows.append(bench_policy(policy.strip(), args))
+
+    print(f"{'policy':<8} {'conn p50':>9} {'conn p99':>9} {'gath p50':>9} {'gath p99':>9} {'fail':>5}")
+    for r in rows:
+        print(f"{r['policy']:<8} {r['connect_p50_ms']:>9} {r['connect_p99_ms']:>9} "
+              f"{r['gather_p50_ms']:>9} {r['gather_p99_ms']:>9} {r['failures']:>5}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
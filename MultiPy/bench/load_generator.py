@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# load_generator.py
+# 합성 sender N개로 receiver 확장성 측정 (GPU 없는 Linux, 소프트웨어 디코딩)
+#
+# 사용법:
+#   python3 bench/load_generator.py --start-server          # N=1,2,4,8,16
+#   python3 bench/load_generator.py --counts 1,4 --measure 20
+#
+# 각 N마다:
+#   1) receiver(main.py)를 offscreen + fakesink + MQTT 없이 새로 띄우고
+#   2) 합성 sender N개(socket.io 클라이언트 + videotestsrc → x264enc → webrtcbin)를
+#      별도 프로세스에서 접속시켜 index.js와 같은 방식으로 offer에 answer한 뒤
+#   3) 측정 구간 동안 receiver 프로세스의 CPU·RSS(/proc), [STATS] 로그의 스트림별
+#      fps/drop, sender 측 협상 시간(join → offer → answer → ICE connected)을 모은다.
+#
+# --start-server를 주면 server/index.py도 띄운다 (sender/cert.pem, key.pem 필요).
+
+import argparse
+import json
+import os
+import re
+import signal
+import ssl
+import subprocess
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+RECEIVER_DIR = os.path.join(ROOT_DIR, "receiver")
+SERVER_SCRIPT = os.path.join(ROOT_DIR, "server", "index.py")
+
+_STATS_RE = re.compile(r"\[STATS\]\[(?P<name>[^\]]+)\] FPS=(?P<fps>[\d.]+), drop=(?P<drop>[\d.]+)")
+_METRICS_RE = re.compile(r"\[METRICS\] (?P<phase>\S+)\s+n=(?P<n>\d+)\s+avg=\s*(?P<avg>[\d.]+)\s+"
+                         r"p50=\s*(?P<p50>[\d.]+)")
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+# ======================================================================
+# 합성 sender (자식 프로세스)
+# ======================================================================
+
+class SyntheticSender:
+    """index.js와 같은 시그널링으로 동작하는 GStreamer 송신자"""
+
+    def __init__(self, url, name, width, height, fps, bitrate_kbps, report):
+        import socketio
+        self.url = url
+        self.name = name
+        self.caps = f"video/x-raw,width={width},height={height},framerate={fps}/1"
+        self.fps = fps
+        self.bitrate_kbps = bitrate_kbps
+        self.report = report
+        self.sio = socketio.Client(
+            logger=False, engineio_logger=False, ssl_verify=False,
+            websocket_extra_options={"sslopt": {"cert_reqs": ssl.CERT_NONE}})
+        self.pipeline = None
+        self.webrtc = None
+        self._remote_set = False
+        self._pending_candidates = []
+        self._times = {}
+        self._bind()
+
+    def _mark(self, key):
+        self._times.setdefault(key, time.monotonic())
+
+    def _ms(self, start, end):
+        t = self._times
+        return round((t[end] - t[start]) * 1000.0, 1) if start in t and end in t else None
+
+    # ----- 시그널링 -----
+    def _bind(self):
+        from gi.repository import GLib
+
+        @self.sio.event
+        def connect():
+            self._mark("connect")
+            self.sio.emit("join-room", {"role": "sender", "name": self.name}, callback=self._on_joined)
+
+        @self.sio.on("signal")
+        def on_signal(data):
+            typ, payload = data.get("type"), data.get("payload")
+            if typ == "offer" and payload:
+                self._mark("offer")
+                sdp = payload["sdp"] if isinstance(payload, dict) else payload
+                GLib.idle_add(self._on_offer, sdp)
+            elif typ == "candidate" and payload and payload.get("candidate") is not None:
+                GLib.idle_add(self._add_candidate, int(payload.get("sdpMLineIndex") or 0),
+                              payload["candidate"])
+
+        @self.sio.on("room-deleted")
+        def on_room_deleted(_=None):
+            GLib.idle_add(self.stop)
+
+    def _on_joined(self, ack):
+        if not (ack or {}).get("success"):
+            self.report({"name": self.name, "event": "join-failed", "ack": ack})
+            return
+        self._mark("joined")
+        self.sio.emit("sender-share-started", {"senderId": self.sio.sid, "name": self.name})
+
+    def connect(self):
+        self.sio.connect(self.url, transports=["websocket"])
+
+    # ----- WebRTC -----
+    def _build_pipeline(self, pt):
+        from gi.repository import Gst
+        self.pipeline = Gst.parse_launch(
+            f"videotestsrc is-live=true pattern=ball ! {self.caps} ! videoconvert ! "
+            f"x264enc tune=zerolatency speed-preset=ultrafast key-int-max={self.fps} "
+            f"bitrate={self.bitrate_kbps} ! "
+            "video/x-h264,profile=constrained-baseline ! "
+            "rtph264pay config-interval=-1 aggregate-mode=zero-latency ! "
+            f"application/x-rtp,media=video,encoding-name=H264,payload={pt} ! "
+            "webrtcbin name=webrtc bundle-policy=max-bundle")
+        self.webrtc = self.pipeline.get_by_name("webrtc")
+        self.webrtc.connect("on-ice-candidate", self._on_ice_candidate)
+        self.webrtc.connect("notify::ice-connection-state", self._on_ice_state)
+        self.pipeline.set_state(Gst.State.PLAYING)
+
+    @staticmethod
+    def _h264_payload(sdpmsg):
+        """offer에서 H264 payload type 찾기 (없으면 102)"""
+        for i in range(sdpmsg.medias_len()):
+            media = sdpmsg.get_media(i)
+            for j in range(media.attributes_len()):
+                attr = media.get_attribute(j)
+                if attr.key == "rtpmap" and "H264/90000" in (attr.value or ""):
+                    return int(attr.value.split()[0])
+        return 102
+
+    def _on_offer(self, sdp_text):
+        from gi.repository import Gst, GstSdp, GstWebRTC
+        ok, sdpmsg = GstSdp.SDPMessage.new()
+        GstSdp.sdp_message_parse_buffer(sdp_text.encode("utf-8"), sdpmsg)
+        if self.pipeline is None:
+            self._build_pipeline(self._h264_payload(sdpmsg))
+        offer = GstWebRTC.WebRTCSessionDescription.new(GstWebRTC.WebRTCSDPType.OFFER, sdpmsg)
+        promise = Gst.Promise.new_with_change_func(self._on_remote_set, None, None)
+        self.webrtc.emit("set-remote-description", offer, promise)
+        return False
+
+    def _on_remote_set(self, promise, *_):
+        # 보류 후보 목록은 메인 루프에서만 다룸
+        from gi.repository import GLib
+        GLib.idle_add(self._after_remote_set)
+
+    def _after_remote_set(self):
+        from gi.repository import Gst
+        self._remote_set = True
+        for mline, cand in self._pending_candidates:
+            self.webrtc.emit("add-ice-candidate", mline, cand)
+        self._pending_candidates.clear()
+        p = Gst.Promise.new_with_change_func(self._on_answer_created, None, None)
+        self.webrtc.emit("create-answer", None, p)
+        return False
+
+    def _on_answer_created(self, promise, *_):
+        reply = promise.get_reply()
+        answer = reply.get_value("answer") if reply else None
+        if answer is None:
+            self.report({"name": self.name, "event": "answer-failed"})
+            return
+        self.webrtc.emit("set-local-description", answer, None)
+        self.sio.emit("signal", {
+            "type": "answer",
+            "from": self.sio.sid,
+            "payload": {"type": "answer", "sdp": answer.sdp.as_text()},
+        })
+        self._mark("answer")
+
+    def _add_candidate(self, mline, cand):
+        if not self._remote_set:
+            self._pending_candidates.append((mline, cand))
+        else:
+            self.webrtc.emit("add-ice-candidate", mline, cand)
+        return False
+
+    def _on_ice_candidate(self, _element, mline, candidate):
+        self.sio.emit("signal", {
+            "type": "candidate",
+            "from": self.sio.sid,
+            "payload": {"candidate": candidate, "sdpMLineIndex": int(mline)},
+        })
+
+    def _on_ice_state(self, element, _pspec):
+        state = int(element.get_property("ice-connection-state"))
+        if state in (2, 3) and "ice-connected" not in self._times:   # CONNECTED / COMPLETED
+            self._mark("ice-connected")
+            self.report({
+                "name": self.name,
+                "event": "connected",
+                "join_to_offer_ms": self._ms("joined", "offer"),
+                "offer_to_answer_ms": self._ms("offer", "answer"),
+                "answer_to_ice_ms": self._ms("answer", "ice-connected"),
+                "join_to_connected_ms": self._ms("joined", "ice-connected"),
+            })
+
+    def stop(self):
+        from gi.repository import Gst
+        if self.pipeline:
+            self.pipeline.set_state(Gst.State.NULL)
+            self.pipeline = None
+        try:
+            self.sio.disconnect()
+        except Exception:
+            pass
+        return False
+
+
+def run_senders(args):
+    """자식 프로세스: 합성 sender N개 실행 (SIGTERM까지)"""
+    import gi
+    gi.require_version("Gst", "1.0")
+    gi.require_version("GstSdp", "1.0")
+    gi.require_version("GstWebRTC", "1.0")
+    from gi.repository import Gst, GLib
+    Gst.init(None)
+
+    lock = threading.Lock()
+
+    def report(obj):
+        with lock:
+            print("SENDER " + json.dumps(obj), flush=True)
+
+    loop = GLib.MainLoop()
+    senders = [SyntheticSender(args.url, f"synth-{i + 1:02d}", args.width, args.height,
+                               args.fps, args.bitrate, report)
+               for i in range(args.senders)]
+
+    def _quit(*_):
+        for s in senders:
+            s.stop()
+        loop.quit()
+    signal.signal(signal.SIGTERM, _quit)
+    signal.signal(signal.SIGINT, _quit)
+
+    def _connect_all():
+        for s in senders:
+            try:
+                s.connect()
+            except Exception as e:
+                report({"name": s.name, "event": "connect-failed", "error": str(e)})
+            time.sleep(args.stagger / 1000.0)
+    threading.Thread(target=_connect_all, daemon=True).start()
+    loop.run()
+
+
+# ======================================================================
+# 오케스트레이터
+# ======================================================================
+
+class _ProcReader:
+    """자식 프로세스 stdout을 줄 단위로 읽어 콜백에 전달"""
+
+    def __init__(self, proc, on_line, tee=False):
+        self.proc = proc
+        self._on_line = on_line
+        self._tee = tee
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        for line in self.proc.stdout:
+            line = line.rstrip("\n")
+            if self._tee:
+                print("   |", line)
+            self._on_line(line)
+
+
+def _proc_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime (필드 14, 15) — ")" 뒤 기준으로 인덱스 11, 12
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _proc_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+def _wait_port(url, timeout):
+    """시그널링 서버 포트가 열릴 때까지 대기"""
+    import socket
+    from urllib.parse import urlparse
+    u = urlparse(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((u.hostname, u.port or 443), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _stop(proc, timeout=10):
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def run_round(n, args):
+    """sender N개 한 라운드 → 결과 dict"""
+    env = dict(os.environ,
+               QT_QPA_PLATFORM="offscreen",
+               MULTIFLEXER_VIDEO_SINK="fakesink",
+               MULTIFLEXER_MQTT="0",
+               MULTIFLEXER_SIGNALING_URL=args.url,
+               PYTHONUNBUFFERED="1")
+
+    stats = {}          # sender 이름 -> [(t, fps, drop)]
+    receiver_metrics = {}
+    ready = threading.Event()
+
+    def on_receiver_line(line):
+        if "[SIO] connected" in line:
+            ready.set()
+        m = _STATS_RE.search(line)
+        if m:
+            stats.setdefault(m["name"], []).append((time.monotonic(), float(m["fps"]), float(m["drop"])))
+        m = _METRICS_RE.search(line)
+        if m:
+            receiver_metrics[m["phase"]] = {"n": int(m["n"]), "avg_ms": float(m["avg"]),
+                                            "p50_ms": float(m["p50"])}
+
+    receiver = subprocess.Popen([sys.executable, "main.py"], cwd=RECEIVER_DIR, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    _ProcReader(receiver, on_receiver_line, tee=args.verbose)
+    if not ready.wait(args.startup_timeout):
+        _stop(receiver)
+        return {"n": n, "error": "receiver did not connect"}
+
+    connected = []
+    failures = []
+
+    def on_sender_line(line):
+        if not line.startswith("SENDER "):
+            if args.verbose:
+                print("   S|", line)
+            return
+        ev = json.loads(line[len("SENDER "):])
+        (connected if ev.get("event") == "connected" else failures).append(ev)
+
+    senders = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--child",
+         "--url", args.url, "--senders", str(n), "--width", str(args.width),
+         "--height", str(args.height), "--fps", str(args.fps),
+         "--bitrate", str(args.bitrate), "--stagger", str(args.stagger)],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    _ProcReader(senders, on_sender_line)
+
+    # 모두 연결될 때까지 (또는 제한 시간) 대기 후 워밍업
+    deadline = time.monotonic() + args.connect_timeout
+    while len(connected) < n and time.monotonic() < deadline and senders.poll() is None:
+        time.sleep(0.2)
+    time.sleep(args.warmup)
+
+    # 측정 구간: receiver CPU·RSS 샘플링
+    t0 = time.monotonic()
+    try:
+        cpu0 = _proc_cpu_seconds(receiver.pid)
+        rss = []
+        while time.monotonic() - t0 < args.measure:
+            rss.append(_proc_rss_mb(receiver.pid))
+            time.sleep(1.0)
+        cpu_pct = 100.0 * (_proc_cpu_seconds(receiver.pid) - cpu0) / (time.monotonic() - t0)
+    except (OSError, IndexError):
+        cpu_pct, rss = 0.0, []
+    t1 = time.monotonic()
+
+    _stop(senders)
+    _stop(receiver)   # SIGTERM → 종료 시 [METRICS] 요약 출력
+    time.sleep(0.5)
+
+    # 측정 구간의 스트림별 fps/drop 평균
+    per_stream = {}
+    for name, rows in stats.items():
+        window = [(fps, drop) for t, fps, drop in rows if t0 <= t <= t1 and fps > 0]
+        if window:
+            per_stream[name] = {
+                "fps": round(sum(f for f, _ in window) / len(window), 2),
+                "drop": round(sum(d for _, d in window) / len(window), 2),
+            }
+    fps_values = [s["fps"] for s in per_stream.values()]
+    join_connected = [c["join_to_connected_ms"] for c in connected if c.get("join_to_connected_ms")]
+    offer_answer = [c["offer_to_answer_ms"] for c in connected if c.get("offer_to_answer_ms")]
+
+    return {
+        "n": n,
+        "connected": len(connected),
+        "failures": failures,
+        "cpu_pct": round(cpu_pct, 1),
+        "rss_avg_mb": round(sum(rss) / len(rss), 1) if rss else 0.0,
+        "rss_max_mb": round(max(rss), 1) if rss else 0.0,
+        "streams": per_stream,
+        "fps_avg": round(sum(fps_values) / len(fps_values), 2) if fps_values else 0.0,
+        "fps_min": round(min(fps_values), 2) if fps_values else 0.0,
+        "drop_avg": round(sum(s["drop"] for s in per_stream.values()) / len(per_stream), 2)
+                    if per_stream else 0.0,
+        "join_to_connected_p50_ms": round(_percentile(join_connected, 0.5), 1),
+        "join_to_connected_max_ms": round(max(join_connected), 1) if join_connected else 0.0,
+        "offer_to_answer_p50_ms": round(_percentile(offer_answer, 0.5), 1),
+        "receiver_metrics": receiver_metrics,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="합성 sender N개로 receiver CPU·RSS·fps·협상 시간 측정")
+    ap.add_argument("--counts", default="1,2,4,8,16", help="sender 수 목록 (쉼표 구분)")
+    ap.add_argument("--url", default="https://localhost:3001", help="시그널링 서버 URL")
+    ap.add_argument("--start-server", action="store_true", help="server/index.py를 함께 실행")
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--bitrate", type=int, default=2500, help="x264enc bitrate (kbps)")
+    ap.add_argument("--stagger", type=float, default=100.0, help="sender 접속 간격 (ms)")
+    ap.add_argument("--warmup", type=float, default=5.0, help="연결 후 측정 전 대기 (초)")
+    ap.add_argument("--measure", type=float, default=15.0, help="측정 구간 (초)")
+    ap.add_argument("--connect-timeout", type=float, default=30.0)
+    ap.add_argument("--startup-timeout", type=float, default=30.0)
+    ap.add_argument("--json", help="결과를 JSON 파일로 저장")
+    ap.add_argument("-v", "--verbose", action="store_true", help="receiver 로그 출력")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--senders", type=int, default=1, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        run_senders(args)
+        return
+
+    server = None
+    if args.start_server:
+        server = subprocess.Popen([sys.executable, SERVER_SCRIPT],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not _wait_port(args.url, 15):
+            _stop(server)
+            print("[BENCH] 시그널링 서버 시작 실패")
+            return
+
+    rows = []
+    try:
+        for n in (int(c) for c in args.counts.split(",")):
+            print(f"[BENCH] N={n} ...")
+            res = run_round(n, args)
+            rows.append(res)
+            if res.get("error"):
+                print(f"[BENCH] N={n} 실패: {res['error']}")
+            elif res["failures"]:
+                print(f"[BENCH] N={n} sender 오류: {res['failures']}")
+    finally:
+        if server:
+            _stop(server)
+
+    print(f"{'N':>3} {'conn':>5} {'CPU %':>7} {'RSS MB':>8} {'fps avg':>8} {'fps min':>8} "
+          f"{'drop':>6} {'join→ICE p50':>13} {'max':>8} {'offer→ans p50':>14}")
+    for r in rows:
+        if r.get("error"):
+            print(f"{r['n']:>3}  {r['error']}")
+            continue
+        print(f"{r['n']:>3} {r['connected']:>5} {r['cpu_pct']:>7} {r['rss_max_mb']:>8} "
+              f"{r['fps_avg']:>8} {r['fps_min']:>8} {r['drop_avg']:>6} "
+              f"{r['join_to_connected_p50_ms']:>13} {r['join_to_connected_max_ms']:>8} "
+              f"{r['offer_to_answer_p50_ms']:>14}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
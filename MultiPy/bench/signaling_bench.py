@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# signaling_bench.py
+# 시그널링 서버 구현별 signal 중계 지연(p50/p99)과 코어당 최대 연결 수 비교
+#
+# 사용법:
+#   python3 bench/signaling_bench.py                        # index.py vs index_async.py
+#   python3 bench/signaling_bench.py --servers index_async.py --max-conns 3200
+#
+# 각 서버를 http(MULTIFLEXER_SIGNALING_SSL=0)로 로컬에 띄우고 asyncio 클라이언트로
+#   1) 지연: receiver 1 + sender S가 join한 뒤 candidate 형태의 signal을 양방향으로
+#      주고받으며 송신 → 수신 시간을 잰다 (같은 프로세스의 monotonic 시계 사용)
+#   2) 용량: sender 연결을 단계적으로 늘리며 각 단계에서 중계 부하를 걸고
+#      서버 CPU(/proc)와 p99를 잰다. p99가 --p99-limit을 넘거나 연결이 실패하면 중단.
+# 코어당 연결 수 = 유지된 연결 수 ÷ 그 단계의 서버 CPU 사용량(코어 단위).
+# 클라이언트도 한 프로세스(한 코어)이므로 큰 연결 수에서는 클라이언트가 먼저 포화될 수 있다.
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.abspath(os.path.join(BENCH_DIR, "../server"))
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _proc_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _wait_port(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class _Peers:
+    """벤치 클라이언트 묶음 (receiver 1 + sender 여러 개)"""
+
+    def __init__(self, url):
+        self.url = url
+        self.receiver = None
+        self.senders = []     # [(client, sid)]
+        self.latencies = []   # ms
+
+    def _on_signal(self, data):
+        payload = (data or {}).get("payload") or {}
+        t = payload.get("t")
+        if t is not None:
+            self.latencies.append((time.perf_counter() - t) * 1000.0)
+
+    async def _client(self):
+        import socketio
+        c = socketio.AsyncClient(reconnection=False)
+        c.on("signal", self._on_signal)
+        await c.connect(self.url, transports=["websocket"])
+        return c
+
+    async def start_receiver(self):
+        self.receiver = await self._client()
+        ack = await self.receiver.call("join-room", {"role": "receiver", "name": "bench-receiver"})
+        if not (ack or {}).get("success"):
+            raise RuntimeError(f"receiver join 실패: {ack}")
+
+    async def add_senders(self, count, batch=50):
+        """sender를 count개 추가 (batch개씩 동시에 접속)"""
+        async def _one(i):
+            c = await self._client()
+            ack = await c.call("join-room", {"role": "sender", "name": f"bench-{i}"})
+            if not (ack or {}).get("success"):
+                raise RuntimeError(f"sender join 실패: {ack}")
+            return c, c.get_sid()
+
+        start = len(self.senders)
+        for base in range(start, start + count, batch):
+            n = min(batch, start + count - base)
+            self.senders += await asyncio.gather(*(_one(base + i) for i in range(n)))
+
+    async def relay_round(self, messages, active):
+        """active개 sender ↔ receiver 양방향으로 messages개씩 signal 중계"""
+        self.latencies = []
+        peers = self.senders[:active]
+
+        def _payload():
+            return {"candidate": "candidate:bench 1 udp 1 127.0.0.1 9 typ host",
+                    "sdpMLineIndex": 0, "t": time.perf_counter()}
+
+        for _ in range(messages):
+            for c, sid in peers:
+                await c.emit("signal", {"type": "candidate", "payload": _payload()})
+                await self.receiver.emit("signal", {"type": "candidate", "to": sid,
+                                                    "payload": _payload()})
+            await asyncio.sleep(0)
+        expected = messages * len(peers) * 2
+        deadline = time.monotonic() + 10
+        while len(self.latencies) < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return list(self.latencies), expected
+
+    async def close(self):
+        clients = [c for c, _ in self.senders] + ([self.receiver] if self.receiver else [])
+        await asyncio.gather(*(c.disconnect() for c in clients), return_exceptions=True)
+
+
+async def bench_server(script, args):
+    port = args.port
+    env = dict(os.environ, MULTIFLEXER_SIGNALING_PORT=str(port), MULTIFLEXER_SIGNALING_SSL="0")
+    server = subprocess.Popen([sys.executable, script], cwd=SERVER_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {"server": script}
+    peers = _Peers(f"http://127.0.0.1:{port}")
+    try:
+        if not _wait_port(port, 15):
+            result["error"] = "server did not start"
+            return result
+        await peers.start_receiver()
+
+        # 1) 지연
+        await peers.add_senders(args.senders)
+        lat, expected = await peers.relay_round(args.messages, args.senders)
+        result.update({
+            "relay_p50_ms": round(_percentile(lat, 0.50), 2),
+            "relay_p99_ms": round(_percentile(lat, 0.99), 2),
+            "relay_max_ms": round(max(lat), 2) if lat else 0.0,
+            "relay_lost": expected - len(lat),
+        })
+
+        # 2) 용량
+        steps = []
+        target = args.senders
+        while target * 2 <= args.max_conns:
+            target *= 2
+            try:
+                await peers.add_senders(target - len(peers.senders))
+            except Exception as e:
+                steps.append({"conns": len(peers.senders) + 1, "error": str(e)})
+                break
+            cpu0, t0 = _proc_cpu_seconds(server.pid), time.monotonic()
+            lat, expected = await peers.relay_round(args.load_messages, min(target, args.load_senders))
+            cores = (_proc_cpu_seconds(server.pid) - cpu0) / (time.monotonic() - t0)
+            step = {
+                "conns": len(peers.senders) + 1,
+                "p99_ms": round(_percentile(lat, 0.99), 2),
+                "lost": expected - len(lat),
+                "cpu_pct": round(cores * 100.0, 1),
+            }
+            steps.append(step)
+            print(f"[BENCH] {script} conns={step['conns']} p99={step['p99_ms']} ms "
+                  f"cpu={step['cpu_pct']}% lost={step['lost']}")
+            if step["p99_ms"] > args.p99_limit or step["lost"]:
+                break
+        ok = [s for s in steps if "error" not in s and s["p99_ms"] <= args.p99_limit and not s["lost"]]
+        best = ok[-1] if ok else None
+        result["steps"] = steps
+        result["max_conns"] = best["conns"] if best else 0
+        result["conns_per_core"] = (int(best["conns"] / max(best["cpu_pct"] / 100.0, 0.01))
+                                    if best else 0)
+    finally:
+        await peers.close()
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="시그널링 서버별 중계 지연·코어당 연결 수 비교")
+    ap.add_argument("--servers", default="index.py,index_async.py", help="server/ 아래 스크립트 (쉼표 구분)")
+    ap.add_argument("--port", type=int, default=3101)
+    ap.add_argument("--senders", type=int, default=16, help="지연 측정 sender 수")
+    ap.add_argument("--messages", type=int, default=100, help="지연 측정: sender당 왕복 signal 수")
+    ap.add_argument("--max-conns", type=int, default=1600, help="용량 측정 최대 연결 수")
+    ap.add_argument("--load-senders", type=int, default=64, help="용량 단계별 중계 부하 sender 수")
+    ap.add_argument("--load-messages", type=int, default=20, help="용량 단계별 sender당 signal 수")
+    ap.add_argument("--p99-limit", type=float, default=100.0, help="용량 판정 p99 상한 (ms)")
+    ap.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    rows = []
+    for script in args.servers.split(","):
+        print(f"[BENCH] {script} ...")
+        rows.append(asyncio.run(bench_server(script, args)))
+
+    print(f"{'server':<16} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'lost':>5} "
+          f"{'max conns':>10} {'conns/core':>11}")
+    for r in rows:
+        if r.get("error"):
+            print(f"{r['server']:<16} {r['error']}")
+            continue
+        print(f"{r['server']:<16} {r['relay_p50_ms']:>8} {r['relay_p99_ms']:>8} "
+              f"{r['relay_max_ms']:>8} {r['relay_lost']:>5} {r['max_conns']:>10} "
+              f"{r['conns_per_core']:>11}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
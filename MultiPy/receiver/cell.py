@@ -3,16 +3,37 @@ from PyQt5 import QtCore, QtWidgets
 
 class Cell(QtWidgets.QFrame):
     clicked = QtCore.pyqtSignal()
+    resized = QtCore.pyqtSignal()   # 셀 픽셀 크기 변경 (렌더 크기/인코딩 상한 갱신용)
+
+    # 포커스 표시는 동적 속성 하나로 전환 (스타일시트는 생성 시 한 번만 지정)
+    _STYLE = """
+        Cell { background: white; border: 1px solid black; }
+        Cell[focused="true"] { border: 1px solid #2563eb; }   /* 두께는 같게: 영상 영역 크기 유지 */
+    """
 
     def __init__(self):
         super().__init__()
         self._layout = QtWidgets.QVBoxLayout(self)
         self._layout.setContentsMargins(0, 0, 0, 0)
         self._layout.setSpacing(0)
+        self.placeholder = None   # 이 셀 전용 대기 화면 (ViewModeManager가 재사용)
+        self.setProperty("focused", False)
+        self.setStyleSheet(self._STYLE)
 
     def mousePressEvent(self, e):
         self.clicked.emit()
 
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self.resized.emit()
+
+    def set_focused(self, on: bool):
+        if bool(self.property("focused")) == on:
+            return
+        self.setProperty("focused", on)
+        self.style().unpolish(self)
+        self.style().polish(self)
+
     def put_widget(self, w: QtWidgets.QWidget):
         while self._layout.count():
             item = self._layout.takeAt(0)
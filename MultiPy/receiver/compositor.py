@@ -0,0 +1,134 @@
+# compositor.py
+# 분할 화면용 단일 컴포지터 파이프라인
+#
+# 각 PeerReceiver는 디코딩한 프레임을 intervideosink(channel=sender_id)로 내보내고,
+# 이 파이프라인이 intervideosrc → compositor/glvideomixer → 싱크 하나로 합성한다.
+# 레이아웃 전환은 믹서 pad의 xpos/ypos/width/height만 갱신하므로 위젯 재배치가 없다.
+
+import gi
+
+gi.require_version('Gst', '1.0')
+gi.require_version('GstVideo', '1.0')
+
+from gi.repository import Gst, GstVideo
+from gst_utils import _make, _first_available, _set_props_if_supported, make_video_sink
+from config import COMPOSITOR_ELEMENTS, COMPOSITOR_CANVAS
+from layout_engine import AUTO, cell_rects
+
+
+def channel_for(sender_id: str) -> str:
+    """sender별 intervideo 채널 이름"""
+    return f"mf-{sender_id}"
+
+
+class CompositorPipeline:
+    """모든 sender 스트림을 하나의 믹서/싱크로 합성하는 파이프라인"""
+
+    def __init__(self):
+        self.pipeline = Gst.Pipeline.new("compositor-pipeline")
+        self.mixer = _first_available(*COMPOSITOR_ELEMENTS)
+        if not self.mixer:
+            raise RuntimeError("compositor 엘리먼트 생성 실패")
+        self._is_gl = self.mixer.get_factory().get_name().startswith("gl")
+        _set_props_if_supported(self.mixer, background=1)  # black
+
+        self.canvas_w, self.canvas_h = COMPOSITOR_CANVAS
+        canvas = _make("capsfilter")
+        canvas.set_property("caps", Gst.Caps.from_string(
+            f"video/x-raw(ANY),width={self.canvas_w},height={self.canvas_h}"))
+
+        self.sink = make_video_sink()
+        if not self.sink:
+            raise RuntimeError("비디오 싱크 생성 실패")
+        _set_props_if_supported(self.sink, force_aspect_ratio=True, handle_events=False)
+
+        chain = [self.mixer, canvas]
+        if not (self._is_gl and self.sink.get_factory().get_name() == "glimagesink"):
+            if self._is_gl:
+                chain.append(_make("gldownload"))
+            chain.append(_make("videoconvert"))
+        chain.append(self.sink)
+
+        for e in chain:
+            self.pipeline.add(e)
+        for a, b in zip(chain, chain[1:]):
+            a.link(b)
+
+        self._sources = {}   # sender_id -> (src, queue, mixer_pad)
+        self._winid = None
+
+    # ========== 수명 주기 ==========
+
+    def start(self, widget):
+        """네이티브 위젯에 싱크를 바인딩하고 재생 시작"""
+        self._winid = int(widget.winId())
+        GstVideo.VideoOverlay.set_window_handle(self.sink, self._winid)
+        ret = self.pipeline.set_state(Gst.State.PLAYING)
+        print(f"[COMP] set_state -> {ret.value_nick} ({self.mixer.get_factory().get_name()}, "
+              f"winId=0x{self._winid:x})")
+
+    def stop(self):
+        try:
+            self.pipeline.set_state(Gst.State.NULL)
+        except Exception:
+            pass
+
+    # ========== 입력 관리 ==========
+
+    def attach(self, sender_id: str):
+        """sender 입력(intervideosrc) 추가. 처음에는 보이지 않게(alpha=0) 둔다."""
+        if sender_id in self._sources:
+            return
+        src = _make("intervideosrc")
+        q = _make("queue")
+        if not src or not q:
+            print(f"[COMP] intervideosrc 생성 실패: {sender_id}")
+            return
+        src.set_property("channel", channel_for(sender_id))
+        _set_props_if_supported(q, leaky=2, max_size_buffers=2, max_size_bytes=0, max_size_time=0)
+
+        self.pipeline.add(src)
+        self.pipeline.add(q)
+        src.link(q)
+
+        pad = self.mixer.get_request_pad("sink_%u")
+        q.get_static_pad("src").link(pad)
+        _set_props_if_supported(pad, alpha=0.0, sizing_policy=1)  # keep-aspect-ratio
+
+        q.sync_state_with_parent()
+        src.sync_state_with_parent()
+        self._sources[sender_id] = (src, q, pad)
+        print(f"[COMP] input attached: {sender_id} → {pad.get_name()}")
+
+    def detach(self, sender_id: str):
+        """sender 입력 제거"""
+        entry = self._sources.pop(sender_id, None)
+        if not entry:
+            return
+        src, q, pad = entry
+        for e in (src, q):
+            e.set_state(Gst.State.NULL)
+        q.get_static_pad("src").unlink(pad)
+        self.mixer.release_request_pad(pad)
+        for e in (src, q):
+            self.pipeline.remove(e)
+        print(f"[COMP] input detached: {sender_id}")
+
+    # ========== 레이아웃 ==========
+
+    def apply_assignments(self, mode: int, assignments: dict, kind: str = AUTO):
+        """{cell_index: sender_id} 배치를 pad 좌표로 반영. 배치되지 않은 입력은 숨긴다.
+        mode = 타일 수, kind = layout_engine 배치 종류"""
+        rects = cell_rects(mode or 1, self.canvas_w, self.canvas_h, kind)
+        placed = {}
+        for idx, sid in assignments.items():
+            if 0 <= idx < len(rects):
+                placed[sid] = rects[idx]
+
+        for sid, (_, _, pad) in self._sources.items():
+            rect = placed.get(sid)
+            if rect:
+                x, y, w, h = rect
+                _set_props_if_supported(pad, xpos=x, ypos=y, width=w, height=h, alpha=1.0)
+            else:
+                _set_props_if_supported(pad, alpha=0.0)
@@ -1,11 +1,19 @@
 # config.py
 # 전역 설정 값들을 관리하는 모듈
 
+import os
 import ssl
 
-# 서버 설정
-SIGNALING_URL = "https://localhost:3001"
-RECEIVER_NAME = "Receiver-1"
+# 서버 설정 (환경변수로 덮어쓰기 가능: 헤드리스 벤치마크 등)
+SIGNALING_URL = os.environ.get("MULTIFLEXER_SIGNALING_URL", "https://localhost:3001")
+RECEIVER_NAME = os.environ.get("MULTIFLEXER_RECEIVER_NAME", "Receiver-1")
+# 이 receiver가 소유하는 방 ID (sender는 https://<host>/share?room=<ROOM_ID>로 입장)
+ROOM_ID = os.environ.get("MULTIFLEXER_ROOM_ID", "default")
+
+# MQTT 브로커 (MULTIFLEXER_MQTT=0이면 연결하지 않음)
+MQTT_ENABLED = os.environ.get("MULTIFLEXER_MQTT", "1") != "0"
+MQTT_HOST = os.environ.get("MULTIFLEXER_MQTT_HOST", "localhost")
+MQTT_PORT = int(os.environ.get("MULTIFLEXER_MQTT_PORT", "1883"))
 
 # SSL 설정
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -15,14 +23,120 @@ WINDOW_TITLE = "WebRTC Receiver"
 DEFAULT_WINDOW_SIZE = (1280, 720)
 INFO_POPUP_MARGIN = 16
 SWITCH_COOLDOWN_MS = 150
+LAYOUT_MAX_TILES = 16           # 분할 화면 최대 타일 수 (layout_engine)
 
 # GStreamer 설정
 STUN_SERVER = "stun://stun.l.google.com:19302"
+
+# ICE 정책 (receiver와 sender(index.js)가 offer에 실린 설정으로 맞춤)
+#   "lan"    : STUN 없이 host 후보만 (외부와 단절된 회의실 네트워크)
+#   "stun"   : LOCAL_STUN_SERVER 사용 (사내/회의실 STUN)
+#   "public" : STUN_SERVER (공용 STUN, 이전 동작)
+ICE_POLICY = os.environ.get("MULTIFLEXER_ICE_POLICY", "public")
+LOCAL_STUN_SERVER = os.environ.get("MULTIFLEXER_STUN_SERVER", "stun://192.168.0.1:3478")
+# 수집 마감: 이 시간이 지나면 묶어 둔 후보를 바로 보내고 이후 후보는 즉시 전송
+ICE_GATHERING_DEADLINE_MS = 1000
+# 렌더링 싱크 강제 지정 (예: GPU 없는 환경의 벤치마크에서 "fakesink"), 비우면 OS별 자동 선택
+VIDEO_SINK = os.environ.get("MULTIFLEXER_VIDEO_SINK", "")
 GST_VIDEO_CAPS = ("application/x-rtp,media=video,encoding-name=H264,clock-rate=90000,"
                   "payload=102,packetization-mode=(string)1,profile-level-id=(string)42e01f")
 ALWAYS_PLAYING = True
 
+# 지연 프로파일: jitterbuffer 지연/초과 패킷 폐기, 디코더 앞 큐 제한, 디코더 저지연 속성
+#   jitter_latency_ms  : webrtcbin(rtpbin) jitterbuffer latency
+#   drop_on_latency    : latency를 넘긴 패킷은 기다리지 않고 폐기
+#   queue_max_time_ms  : 렌더링 앞 queue 최대 길이, queue_leaky면 오래된 프레임부터 버림
+#   decoder_props      : 디코더별 속성 (지원하지 않는 속성은 무시)
+LATENCY_PROFILES = {
+    "ultra-low": {
+        "jitter_latency_ms": 30,
+        "drop_on_latency": True,
+        "queue_max_time_ms": 20,
+        "queue_leaky": True,
+        "decoder_props": {"disable_dpb": True, "enable_max_performance": True,
+                          "low_latency": True, "max_threads": 1},
+    },
+    "balanced": {
+        "jitter_latency_ms": 200,
+        "drop_on_latency": True,
+        "queue_max_time_ms": 100,
+        "queue_leaky": True,
+        "decoder_props": {"enable_max_performance": True, "low_latency": True},
+    },
+    "smooth": {
+        "jitter_latency_ms": 500,
+        "drop_on_latency": False,
+        "queue_max_time_ms": 1000,
+        "queue_leaky": False,
+        "decoder_props": {},
+    },
+}
+DEFAULT_LATENCY_PROFILE = "balanced"
+SENDER_LATENCY_PROFILES = {}  # sender 이름 -> 프로파일 (예: {"발표자": "ultra-low"})
+
+# 컴포지터 모드: 모든 스트림을 하나의 믹서/싱크로 합성 (sender별 오버레이 창 대신)
+COMPOSITOR_MODE = False
+COMPOSITOR_ELEMENTS = ("glvideomixer", "compositor")
+COMPOSITOR_CANVAS = (1920, 1080)
+
+# 디코더 처리량 측정 결과 캐시 (GStreamer 버전/레지스트리가 바뀌면 다시 측정)
+DECODER_PROBE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "multiflexer", "decoder_rank.json")
+DECODER_PROBE_FRAMES = 150
+
+# 웜 풀: 미리 만들어 둘 수신 파이프라인(webrtcbin + 디코딩 체인) 개수, 0이면 비활성
+PEER_POOL_SIZE = 2
+
+# 셀에 배정되지 않은 sender도 디코딩할지 (False면 디코더 앞에서 버림, 연결은 유지)
+DECODE_HIDDEN_SENDERS = False
+# 디코딩 결과를 표시 셀 크기 이하로 축소해 렌더링 (원본보다 크게 키우지는 않음)
+SCALE_TO_CELL = True
+
+# 수신 측 주도 송신 인코딩 제어 (셀 크기/포커스에 맞춰 sender의 RTCRtpSender 상한 조정)
+SENDER_ENCODING_CONTROL = True
+ENCODING_BITS_PER_PIXEL = 0.1          # maxBitrate = 셀 픽셀 수 × fps × bpp
+ENCODING_BITRATE_RANGE = (300_000, 8_000_000)   # bps (최소, 최대)
+ENCODING_FOCUSED_FPS = 30
+ENCODING_UNFOCUSED_FPS = 15
+
+# ICE 후보 묶음 전송: 짧은 구간 동안 모은 후보를 'candidates' 한 메시지로 보냄
+# (상대가 answer/offer의 caps.candidateBatch로 지원을 알린 경우만, 아니면 후보별 'candidate')
+CANDIDATE_BATCHING = True
+CANDIDATE_BATCH_MS = 30
+
+# sender 목록 스냅샷 응답 대기 제한: 그동안 델타는 보류되므로 응답이 없으면 다시 요청
+SENDER_SNAPSHOT_TIMEOUT_MS = 3000
+
+# 협상 스케줄러: 동시에 진행할 새 sender 협상 수, 슬롯 반환 제한 시간
+NEGOTIATION_PARALLELISM = 2
+NEGOTIATION_TIMEOUT_MS = 10000
+
+# 상태 명령 큐: 메인 루프 idle 한 번에 처리할 최대 명령 수 (state_actor.py)
+STATE_QUEUE_BATCH = 64
+
 # 타이머 설정
+GLIB_INTEGRATION = "auto"       # "auto": Qt GLib 디스패처면 이벤트 기반, "poll": 고정 주기 폴링
 GLIB_TIMER_INTERVAL_MS = 5
 UI_OVERLAY_DELAY_MS = 50
-ICE_STATE_CHECK_DELAY_MS = 800
\ No newline at end of file
+# UI/GStreamer 명령 배치 간격 (sender별로 병합해 프레임마다 한 번 실행, ui_scheduler.py)
+UI_FRAME_INTERVAL_MS = 16
+# 배정/전환/재개 시 키프레임 재요청 최소 간격 (연달아 오는 요청은 하나로 합침)
+KEYFRAME_REQUEST_MIN_INTERVAL_MS = 300
+# 키프레임 요청 후 이 시간 안에 키프레임 화면이 없으면 측정 probe 제거 (keyframe/<reason>→timeout)
+CLEAN_FRAME_TIMEOUT_MS = 5000
+ICE_STATE_CHECK_DELAY_MS = 800
+
+# ICE 끊김 복구: 같은 webrtcbin에서 ICE restart offer를 최대 ICE_RESTART_ATTEMPTS번
+# (ICE_RESTART_INTERVAL_MS 간격) 시도하고, ICE_RECOVERY_BUDGET_MS 안에 복구되지 않으면 제거
+ICE_RESTART_ATTEMPTS = 3
+ICE_RESTART_INTERVAL_MS = 4000
+ICE_RECOVERY_BUDGET_MS = 15000
+
+# 정지(프리즈) 감시: RTP 패킷은 오는데(STALL_PACKET_WINDOW_MS 안에 수신 수 증가) 싱크에
+# STALL_TIMEOUT_MS 동안 프레임이 없으면 키프레임 요청을 STALL_KEYFRAME_INTERVAL_MS마다
+# 반복하고, STALL_ESCALATE_MS 뒤에도 그대로면 재협상 (정지 화면 공유는 정지로 보지 않음)
+STALL_WATCHDOG = True
+STALL_CHECK_INTERVAL_MS = 500
+STALL_TIMEOUT_MS = 1500
+STALL_PACKET_WINDOW_MS = 2000   # get-stats 주기(1초)보다 길게
+STALL_KEYFRAME_INTERVAL_MS = 1000
+STALL_ESCALATE_MS = 4000
\ No newline at end of file
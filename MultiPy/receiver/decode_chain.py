@@ -0,0 +1,140 @@
+# decode_chain.py
+# 수신 디코딩 체인
+# (depay → parse → valve → decoder → convert → [videoscale] → capsfilter → queue → fpsdisplaysink)
+
+import gi
+
+gi.require_version('Gst', '1.0')
+
+from gi.repository import Gst, GstVideo
+from gst_utils import (_make, _set_props_if_supported, _reset_props_to_default,
+                       get_decoder_and_converter, make_video_sink)
+from compositor import channel_for
+from config import LATENCY_PROFILES
+
+# 프로파일 중 하나라도 건드리는 디코더 속성 (프로파일 전환 시 먼저 기본값으로 되돌림)
+_PROFILE_DECODER_PROPS = sorted({k for p in LATENCY_PROFILES.values() for k in p["decoder_props"]})
+
+
+class DecodeChain:
+    """webrtcbin src pad 뒤에 붙는 디코딩 체인을 하나의 Gst.Bin으로 묶은 것.
+    미리 만들어 READY 상태로 보관했다가(웜 풀) 나중에 파이프라인에 붙일 수 있다."""
+
+    def __init__(self, name, compositor_mode=False):
+        self.compositor_mode = compositor_mode
+        self.bin = Gst.Bin.new(name)
+
+        self.depay = _make("rtph264depay")
+        self.parse = _make("h264parse")
+        self.valve = _make("valve")          # 화면에 없는 sender는 디코더 앞에서 버림
+        self.decoder, self.conv = get_decoder_and_converter()
+        # 셀 크기로 축소: HW 변환기(nvvidconv/d3d11convert)는 자체 스케일, videoconvert는 videoscale 추가
+        self.scale = _make("videoscale") if self.conv and self.conv.get_factory().get_name() == "videoconvert" else None
+        self.render_caps = _make("capsfilter")
+        self.queue = _make("queue")
+        self.fpssink = _make("fpsdisplaysink")
+
+        # 컴포지터 모드면 공용 믹서로, 아니면 OS별 싱크로 출력
+        if compositor_mode:
+            self.sink = _make("intervideosink")
+            if self.sink:
+                self.sink.set_property("sync", False)
+        else:
+            self.sink = make_video_sink()
+
+        elements = [self.depay, self.parse, self.valve, self.decoder,
+                    self.conv, self.render_caps, self.queue, self.fpssink]
+        if not all(elements):
+            raise RuntimeError("디코딩 체인 요소 부족")
+        if self.scale:
+            elements.insert(elements.index(self.render_caps), self.scale)
+
+        # 다시 열릴 때 디코더가 caps/segment를 잃지 않도록 sticky 이벤트는 통과 (1.22+)
+        _set_props_if_supported(self.valve, drop=False, drop_mode=1)
+        self._render_size = None
+        self.render_caps.set_property("caps", Gst.Caps.from_string("video/x-raw(ANY)"))
+
+        # FPS 측정 싱크 설정
+        self.fpssink.set_property("signal-fps-measurements", True)
+        self.fpssink.set_property("text-overlay", False)
+        self.fpssink.set_property("sync", False)  # 측정만 하고 렌더링은 빠르게
+        if self.sink:
+            self.fpssink.set_property("video-sink", self.sink)
+
+        for e in elements:
+            self.bin.add(e)
+        for a, b in zip(elements, elements[1:]):
+            a.link(b)
+
+        ghost = Gst.GhostPad.new("sink", self.depay.get_static_pad("sink"))
+        self.bin.add_pad(ghost)
+
+    def apply_profile(self, profile):
+        """지연 프로파일의 queue/디코더 설정 적용 (LATENCY_PROFILES 항목)
+        디코더 속성은 기본값으로 되돌린 뒤 프로파일 값을 덮어써서, 이전 프로파일
+        (라이브 전환 / 풀에서 재사용된 체인)의 disable_dpb·max_threads 등이 남지 않게 한다."""
+        _set_props_if_supported(
+            self.queue,
+            leaky=2 if profile["queue_leaky"] else 0,   # 2 = downstream (오래된 버퍼 폐기)
+            max_size_time=profile["queue_max_time_ms"] * Gst.MSECOND,
+            max_size_buffers=0,
+            max_size_bytes=0,
+        )
+        _reset_props_to_default(self.decoder, _PROFILE_DECODER_PROPS)
+        _set_props_if_supported(self.decoder, **profile["decoder_props"])
+
+    def set_dropping(self, drop):
+        """True면 디코더 앞에서 버퍼를 버림 (연결/협상은 유지)"""
+        self.valve.set_property("drop", bool(drop))
+
+    def request_keyframe(self):
+        """상류(webrtcbin → RTCP PLI/FIR)로 키프레임 요청"""
+        ev = GstVideo.video_event_new_upstream_force_key_unit(Gst.CLOCK_TIME_NONE, True, 0)
+        return self.depay.get_static_pad("sink").push_event(ev)
+
+    def source_size(self):
+        """디코더 출력(원본) 해상도 (w, h), 아직 모르면 None"""
+        caps = self.decoder.get_static_pad("src").get_current_caps()
+        if not caps:
+            return None
+        st = caps.get_structure(0)
+        return st.get_value("width"), st.get_value("height")
+
+    def set_render_size(self, cell_w, cell_h):
+        """원본 비율을 유지하며 셀 크기 이하로 축소 (셀이 원본보다 크면 원본 그대로)"""
+        src = self.source_size()
+        target = None
+        if src and cell_w and cell_h:
+            sw, sh = src
+            scale = min(cell_w / sw, cell_h / sh, 1.0)
+            if scale < 1.0:
+                target = (max(2, int(sw * scale) & ~1), max(2, int(sh * scale) & ~1))
+        if target == self._render_size:
+            return
+        self._render_size = target
+        caps = "video/x-raw(ANY)"
+        if target:
+            caps += f",width={target[0]},height={target[1]},pixel-aspect-ratio=1/1"
+        self.render_caps.set_property("caps", Gst.Caps.from_string(caps))
+
+    def bind_sender(self, sender_id):
+        """sender에 맞춰 출력 대상 지정 (컴포지터 채널)"""
+        if self.compositor_mode and self.sink:
+            self.sink.set_property("channel", channel_for(sender_id))
+
+    def attach(self, pipeline, pad):
+        """webrtcbin src pad에 체인 연결"""
+        pipeline.add(self.bin)
+        self.bin.sync_state_with_parent()
+        return pad.link(self.bin.get_static_pad("sink")) == Gst.PadLinkReturn.OK
+
+    def detach(self, pipeline):
+        """파이프라인에서 떼어내 재사용 가능한 READY 상태로 되돌림"""
+        if self.bin.get_parent() is pipeline:
+            sinkpad = self.bin.get_static_pad("sink")
+            peer = sinkpad.get_peer()
+            if peer:
+                peer.unlink(sinkpad)
+            self.bin.set_state(Gst.State.NULL)
+            pipeline.remove(self.bin)
+        self.bin.set_state(Gst.State.READY)
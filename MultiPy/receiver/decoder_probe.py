@@ -0,0 +1,136 @@
+# decoder_probe.py
+# 시작 시 디코더/변환기 조합 처리량 측정 및 디스크 캐시
+#
+# videotestsrc + x264enc로 짧은 H.264 클립을 로컬에서 만들고, 설치된 각
+# (decoder, converter) 조합으로 디코딩해 초당 프레임 수를 잰다. 순위는
+# GStreamer 버전 + 후보 플러그인 레지스트리 지문을 키로 디스크에 저장되며,
+# 키가 같으면 다음 실행부터는 측정 없이 바로 gst_utils에 적용된다.
+# 측정하지 못한 경우(x264enc 없음, 전부 실패/시간 초과)의 고정 우선순위는 저장하지 않아
+# 다음 실행에서 다시 측정한다.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import gi
+
+gi.require_version('Gst', '1.0')
+
+from gi.repository import Gst
+import gst_utils
+from config import DECODER_PROBE_CACHE, DECODER_PROBE_FRAMES
+
+_CLIP_CAPS = "video/x-raw,width=1280,height=720,framerate=30/1"
+_PROBE_TIMEOUT_S = 20
+
+
+def _registry_key():
+    """GStreamer 버전 + 후보 엘리먼트의 플러그인/버전/랭크 지문"""
+    decoders, convs = gst_utils.platform_candidates()
+    parts = [Gst.version_string()]
+    for name in sorted(set(decoders + convs)):
+        f = Gst.ElementFactory.find(name)
+        if f:
+            plugin = f.get_plugin()
+            parts.append(f"{name}:{plugin.get_version() if plugin else '?'}:{f.get_rank()}")
+    digest = hashlib.sha1("|".join(parts[1:]).encode()).hexdigest()[:16]
+    return f"{parts[0]}|{digest}"
+
+
+def _run(description):
+    """파이프라인을 EOS까지 실행하고 걸린 시간(초) 반환, 실패 시 None"""
+    try:
+        pipeline = Gst.parse_launch(description)
+    except Exception as e:
+        print(f"[PROBE] parse 실패 ({description}): {e}")
+        return None
+    bus = pipeline.get_bus()
+    t0 = time.perf_counter()
+    pipeline.set_state(Gst.State.PLAYING)
+    msg = bus.timed_pop_filtered(_PROBE_TIMEOUT_S * Gst.SECOND,
+                                 Gst.MessageType.EOS | Gst.MessageType.ERROR)
+    elapsed = time.perf_counter() - t0
+    pipeline.set_state(Gst.State.NULL)
+    if not msg or msg.type != Gst.MessageType.EOS:
+        return None
+    return elapsed
+
+
+def _make_clip(path):
+    """합성 H.264 클립 생성 (Annex-B byte-stream)"""
+    return _run(
+        f"videotestsrc num-buffers={DECODER_PROBE_FRAMES} pattern=smpte ! {_CLIP_CAPS} ! "
+        "x264enc tune=zerolatency speed-preset=ultrafast key-int-max=30 ! "
+        "video/x-h264,profile=constrained-baseline,stream-format=byte-stream ! "
+        f"filesink location={path}") is not None
+
+
+def probe():
+    """설치된 조합을 모두 측정해 처리량 내림차순 [(decoder, converter, fps), ...] 반환"""
+    pairs = gst_utils.candidate_pairs()
+    if len(pairs) <= 1 or not Gst.ElementFactory.find("x264enc"):
+        return [(d, c, 0.0) for d, c in pairs]
+
+    fd, clip = tempfile.mkstemp(suffix=".h264")
+    os.close(fd)
+    try:
+        if not _make_clip(clip):
+            print("[PROBE] 테스트 클립 생성 실패 → 고정 우선순위 사용")
+            return [(d, c, 0.0) for d, c in pairs]
+        results = []
+        for dec, conv in pairs:
+            elapsed = _run(f"filesrc location={clip} ! h264parse ! {dec} ! {conv} ! "
+                           "fakesink sync=false")
+            fps = DECODER_PROBE_FRAMES / elapsed if elapsed else 0.0
+            print(f"[PROBE] {dec} + {conv}: {fps:.1f} fps")
+            results.append((dec, conv, round(fps, 1)))
+    finally:
+        os.unlink(clip)
+    results.sort(key=lambda r: r[2], reverse=True)
+    return [r for r in results if r[2] > 0] or [(d, c, 0.0) for d, c in pairs]
+
+
+def _load_cache(key):
+    try:
+        with open(DECODER_PROBE_CACHE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("ranking") if data.get("key") == key else None
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(key, ranking):
+    try:
+        os.makedirs(os.path.dirname(DECODER_PROBE_CACHE), exist_ok=True)
+        with open(DECODER_PROBE_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "ranking": ranking}, f, indent=2)
+    except OSError as e:
+        print("[PROBE] 캐시 저장 실패:", e)
+
+
+def load_or_probe():
+    """캐시가 유효하면 즉시 적용, 아니면 측정 후 캐시에 저장하고 적용"""
+    key = _registry_key()
+    ranking = _load_cache(key)
+    if ranking is None:
+        ranking = probe()
+        if any(fps > 0 for _, _, fps in ranking):
+            _save_cache(key, ranking)
+            print(f"[PROBE] decoder ranking 저장 ({key})")
+        else:
+            print("[PROBE] 측정 결과 없음 → 캐시하지 않음 (다음 실행에서 재측정)")
+    gst_utils.set_decoder_ranking([(d, c) for d, c, _ in ranking])
+    best = ranking[0] if ranking else None
+    if best:
+        print(f"[PROBE] decoder 선택: {best[0]} + {best[1]}")
+    return ranking
+
+
+def warm_up_async():
+    """백그라운드에서 load_or_probe 실행 (완료 전에는 고정 우선순위 사용)"""
+    t = threading.Thread(target=load_or_probe, name="decoder-probe", daemon=True)
+    t.start()
+    return t
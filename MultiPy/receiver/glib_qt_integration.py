@@ -1,16 +1,73 @@
 # glib_qt_integration.py
 # GLib와 PyQt5 이벤트 루프 통합
+#
+# Qt가 GLib 기반 이벤트 디스패처(Linux 기본, QEventDispatcherGlib)를 쓰면
+# Qt 메인 루프가 이미 GLib 기본 컨텍스트의 fd를 poll하므로 별도 타이머 없이
+# GLib 콜백이 이벤트 기반으로 즉시 디스패치된다.
+# 그 외 플랫폼(Windows/macOS 등)에서는 타이머로 GLib 컨텍스트를 펌프하되,
+# 처리할 이벤트가 남아 있으면 즉시 다시 돌려 몰린 콜백을 한 번에 비운다.
 
 from PyQt5 import QtCore
 from gi.repository import GLib
-from config import GLIB_TIMER_INTERVAL_MS
+from config import GLIB_INTEGRATION, GLIB_TIMER_INTERVAL_MS
 
+# 펌프 한 번에 처리할 최대 GLib 이터레이션 (UI 멈춤 방지)
+_MAX_ITERATIONS_PER_PUMP = 64
 
-def integrate_glib_into_qt():
-    """GLib 이벤트 루프를 PyQt5에 통합"""
-    ctx = GLib.MainContext.default()
-    timer = QtCore.QTimer()
-    timer.setInterval(GLIB_TIMER_INTERVAL_MS)
-    timer.timeout.connect(lambda: ctx.iteration(False))
-    timer.start()
-    return timer
\ No newline at end of file
+
+def qt_uses_glib_dispatcher() -> bool:
+    """Qt 메인 스레드 디스패처가 GLib 기본 컨텍스트를 돌리는지 확인"""
+    disp = QtCore.QAbstractEventDispatcher.instance()
+    if disp is None:
+        return False
+    return "glib" in disp.metaObject().className().lower()
+
+
+class _GLibPump(QtCore.QObject):
+    """GLib 디스패처가 없을 때 쓰는 타이머 펌프"""
+
+    def __init__(self, interval_ms):
+        super().__init__()
+        self._ctx = GLib.MainContext.default()
+        self._interval = interval_ms
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._pump)
+        self._timer.start(self._interval)
+
+    def _pump(self):
+        n = 0
+        while n < _MAX_ITERATIONS_PER_PUMP and self._ctx.iteration(False):
+            n += 1
+        # 한도까지 처리했다면 아직 남은 일이 있으므로 바로 다시 실행
+        self._timer.start(0 if n >= _MAX_ITERATIONS_PER_PUMP else self._interval)
+
+    def stop(self):
+        self._timer.stop()
+
+
+def integrate_glib_into_qt(mode=GLIB_INTEGRATION):
+    """GLib 이벤트 루프를 PyQt5에 통합
+
+    Args:
+        mode: "auto" (가능하면 이벤트 기반) 또는 "poll" (GLIB_TIMER_INTERVAL_MS 주기 폴링)
+
+    Returns:
+        폴링을 쓰는 경우 참조를 유지해야 하는 객체, 이벤트 기반이면 None
+    """
+    if mode == "auto" and qt_uses_glib_dispatcher():
+        print("[MAIN] GLib integration: event-driven (Qt GLib dispatcher)")
+        return None
+
+    if mode == "poll":
+        # 이전 방식: 고정 주기로 한 번씩 iteration
+        ctx = GLib.MainContext.default()
+        timer = QtCore.QTimer()
+        timer.setInterval(GLIB_TIMER_INTERVAL_MS)
+        timer.timeout.connect(lambda: ctx.iteration(False))
+        timer.start()
+        print(f"[MAIN] GLib integration: poll every {GLIB_TIMER_INTERVAL_MS} ms")
+        return timer
+
+    print(f"[MAIN] GLib integration: pump (idle {GLIB_TIMER_INTERVAL_MS} ms, drains bursts)")
+    return _GLibPump(GLIB_TIMER_INTERVAL_MS)
@@ -2,11 +2,14 @@
 # GStreamer 관련 유틸리티 함수들
 
 import os
+import sys
 import platform
+import functools
 import gi
 
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst
+from config import VIDEO_SINK, ICE_POLICY, STUN_SERVER, LOCAL_STUN_SERVER
 
 def _make(name):
     """GStreamer 엘리먼트 생성 헬퍼"""
@@ -31,41 +34,95 @@ def _set_props_if_supported(element, **kwargs):
         except Exception:
             pass
 
-def get_decoder_and_sink():
-    """플랫폼별 HW 디코더와 비디오 싱크 선택"""
-    sysname = platform.system().lower()
-    decoder, conv, sink = None, None, None
+def _reset_props_to_default(element, names):
+    """엘리먼트 속성들을 기본값으로 되돌림 (없는 속성은 무시)"""
+    if not element:
+        return
+    for name in names:
+        pspec = element.find_property(name.replace("_", "-"))
+        if pspec is None:
+            continue
+        try:
+            element.set_property(pspec.name, pspec.default_value)
+        except Exception:
+            pass
+
+@functools.lru_cache(maxsize=None)
+def _has_factory(name):
+    """엘리먼트 팩토리 존재 여부 (레지스트리 조회 결과 캐시)"""
+    return Gst.ElementFactory.find(name) is not None
 
-    # 디코더 선택
+@functools.lru_cache(maxsize=1)
+def platform_candidates():
+    """플랫폼별 (디코더 후보, 변환기 후보) 고정 우선순위 - 시작 시 한 번만 판별"""
+    sysname = platform.system().lower()
     if "linux" in sysname:
         if os.path.isfile("/etc/nv_tegra_release"):
             # NVIDIA Jetson
-            decoder = _first_available("nvv4l2decoder", "omxh264dec")
-            conv = _first_available("nvvidconv", "videoconvert")
-        else:
-            # 일반 Linux
-            decoder = _first_available("vaapih264dec", "v4l2h264dec", "avdec_h264")
-            conv = _first_available("videoconvert")
-    elif "windows" in sysname:
-        decoder = _first_available("d3d11h264dec", "avdec_h264")
-        conv = _first_available("d3d11convert", "videoconvert")
-    elif "darwin" in sysname:
-        decoder = _first_available("vtdec", "avdec_h264")
-        conv = _first_available("videoconvert")
-    else:
-        decoder = _first_available("avdec_h264")
-        conv = _first_available("videoconvert")
-
-    # 싱크 선택
+            return ("nvv4l2decoder", "omxh264dec"), ("nvvidconv", "videoconvert")
+        # 일반 Linux
+        return ("vaapih264dec", "v4l2h264dec", "avdec_h264"), ("videoconvert",)
     if "windows" in sysname:
-        sink = _first_available("d3d11videosink", "autovideosink")
-    elif "darwin" in sysname:
-        sink = _first_available("avfvideosink", "autovideosink")
-    else:
-        sink = _first_available("glimagesink", "xvimagesink", "autovideosink")
-    
-    if sink:
-        print(f"[INFO] 비디오 싱크 사용: {sink.get_name()}")
-        _set_props_if_supported(sink, force_aspect_ratio=True, fullscreen=False, handle_events=False)
+        return ("d3d11h264dec", "avdec_h264"), ("d3d11convert", "videoconvert")
+    if "darwin" in sysname:
+        return ("vtdec", "avdec_h264"), ("videoconvert",)
+    return ("avdec_h264",), ("videoconvert",)
 
-    return decoder, conv, sink
\ No newline at end of file
+def candidate_pairs():
+    """고정 우선순위 순서의 (decoder, converter) 조합 중 설치된 것"""
+    decoders, convs = platform_candidates()
+    return [(d, c) for d in decoders for c in convs if _has_factory(d) and _has_factory(c)]
+
+# decoder_probe가 측정한 처리량 순위 [(decoder, converter), ...] (없으면 고정 우선순위)
+_decoder_ranking = None
+
+def set_decoder_ranking(pairs):
+    global _decoder_ranking
+    _decoder_ranking = [tuple(p) for p in pairs] if pairs else None
+
+def get_decoder_and_converter():
+    """측정 순위(없으면 고정 우선순위)에서 첫 번째로 생성 가능한 디코더/변환기"""
+    for dec_name, conv_name in (_decoder_ranking or candidate_pairs()):
+        decoder = _make(dec_name) if _has_factory(dec_name) else None
+        conv = _make(conv_name) if decoder and _has_factory(conv_name) else None
+        if decoder and conv:
+            return decoder, conv
+    return None, None
+
+def stun_for_policy(policy=ICE_POLICY):
+    """ICE 정책 → stun://host:port (lan이면 None)"""
+    if policy == "lan":
+        return None
+    if policy == "stun":
+        return LOCAL_STUN_SERVER
+    return STUN_SERVER
+
+def apply_ice_policy(webrtc, policy=ICE_POLICY):
+    """webrtcbin에 ICE 정책 적용 (lan: STUN 없음 + TCP 후보 생략)"""
+    stun = stun_for_policy(policy)
+    if stun:
+        webrtc.set_property('stun-server', stun)
+    if policy == "lan" and webrtc.find_property('ice-agent'):
+        _set_props_if_supported(webrtc.get_property('ice-agent'), ice_tcp=False)
+
+def browser_ice_servers(policy=ICE_POLICY):
+    """같은 정책의 RTCPeerConnection iceServers (stun://host → stun:host)"""
+    stun = stun_for_policy(policy)
+    return [{"urls": stun.replace("stun://", "stun:", 1)}] if stun else []
+
+def make_video_sink():
+    """OS별 렌더링 싱크 생성 (오버레이 바인딩 대상)"""
+    sink = None
+    if VIDEO_SINK:
+        sink = _make(VIDEO_SINK)
+    elif sys.platform.startswith("linux"):
+        # Jetson / 일반 Linux
+        sink = _make("nv3dsink") or _make("glimagesink")
+    elif sys.platform == "win32":
+        sink = _make("d3d11videosink")
+    elif sys.platform == "darwin":
+        sink = _make("glimagesink")
+
+    if sink:
+        sink.set_property("sync", False)  # 지연 방지
+    return sink
@@ -0,0 +1,149 @@
+# latency_metrics.py
+# 단계별 지연 측정 (체크포인트 타임스탬프 → 단계별 히스토그램)
+#
+# 사용 예:
+#   metrics.mark(sid, "share-request")            # 시작 체크포인트
+#   metrics.mark(sid, "first-sink-buffer")        # 이후 체크포인트
+#   metrics.span(sid, "ttff", "share-request", "first-sink-buffer")
+# 어느 스레드(socket.io / GLib / Qt / GStreamer 스트리밍)에서 호출해도 안전하다.
+
+import json
+import threading
+import time
+
+# 히스토그램 버킷 상한 (ms), 마지막은 그 이상
+_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS_MS) + 1)
+        self.samples = []  # 최근 샘플 (백분위 계산용)
+        self.total = 0.0
+        self.n = 0
+        self.max = 0.0
+
+    def add(self, ms, keep=512):
+        i = 0
+        while i < len(_BUCKETS_MS) and ms > _BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.n += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.samples.append(ms)
+        if len(self.samples) > keep:
+            del self.samples[0]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        def _pct(q):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 1) if ordered else 0.0
+        labels = [f"<={b}" for b in _BUCKETS_MS] + [f">{_BUCKETS_MS[-1]}"]
+        return {
+            "n": self.n,
+            "avg_ms": round(self.total / self.n, 1) if self.n else 0.0,
+            "p50_ms": _pct(0.50),
+            "p90_ms": _pct(0.90),
+            "p99_ms": _pct(0.99),
+            "max_ms": round(self.max, 1),
+            "buckets": {l: c for l, c in zip(labels, self.counts) if c},
+        }
+
+
+class LatencyMetrics:
+    """키(보통 sender_id 또는 'layout')별 체크포인트와 단계별 히스토그램"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._marks = {}      # key -> {checkpoint: monotonic ts}
+        self._hist = {}       # phase -> _Histogram
+        self._groups = {}     # phase -> (start ts, 남은 member 집합)
+
+    def mark(self, key, checkpoint, ts=None):
+        """체크포인트 기록 (이미 기록된 체크포인트는 첫 값 유지)"""
+        ts = time.monotonic() if ts is None else ts
+        with self._lock:
+            self._marks.setdefault(key, {}).setdefault(checkpoint, ts)
+
+    def reset(self, key, *checkpoints):
+        """키의 체크포인트 초기화 (지정하지 않으면 전부)"""
+        with self._lock:
+            marks = self._marks.get(key)
+            if marks is None:
+                return
+            if checkpoints:
+                for c in checkpoints:
+                    marks.pop(c, None)
+            else:
+                self._marks.pop(key, None)
+
+    def has(self, key, checkpoint):
+        with self._lock:
+            return checkpoint in self._marks.get(key, {})
+
+    def span(self, key, phase, start, end):
+        """두 체크포인트가 모두 있으면 간격(ms)을 phase 히스토그램에 기록하고 반환"""
+        with self._lock:
+            marks = self._marks.get(key, {})
+            if start not in marks or end not in marks:
+                return None
+            ms = (marks[end] - marks[start]) * 1000.0
+            self._hist.setdefault(phase, _Histogram()).add(ms)
+        return ms
+
+    def record(self, phase, ms):
+        """이미 계산된 간격을 직접 기록"""
+        with self._lock:
+            self._hist.setdefault(phase, _Histogram()).add(ms)
+
+    def begin_group(self, phase, members):
+        """여러 member가 모두 complete될 때까지의 시간을 phase로 기록 (이전 그룹은 폐기)"""
+        members = set(members)
+        now = time.monotonic()
+        with self._lock:
+            if members:
+                self._groups[phase] = (now, members)
+                return
+            self._groups.pop(phase, None)
+            self._hist.setdefault(phase, _Histogram()).add(0.0)
+
+    def complete(self, phase, member):
+        """그룹 member 완료 표시. 마지막 member면 전체 소요(ms)를 기록하고 반환"""
+        with self._lock:
+            group = self._groups.get(phase)
+            if not group or member not in group[1]:
+                return None
+            group[1].discard(member)
+            if group[1]:
+                return None
+            del self._groups[phase]
+            ms = (time.monotonic() - group[0]) * 1000.0
+            self._hist.setdefault(phase, _Histogram()).add(ms)
+        return ms
+
+    def query(self, phase=None):
+        """{phase: summary} (phase를 주면 해당 단계만)"""
+        with self._lock:
+            if phase is not None:
+                h = self._hist.get(phase)
+                return {phase: h.summary()} if h else {}
+            return {p: h.summary() for p, h in sorted(self._hist.items())}
+
+    def dump(self):
+        """전체 요약을 로그로 출력 (종료 시)"""
+        summary = self.query()
+        if not summary:
+            print("[METRICS] (no samples)")
+            return
+        for phase, s in summary.items():
+            print(f"[METRICS] {phase:<28} n={s['n']:<4} avg={s['avg_ms']:>8} "
+                  f"p50={s['p50_ms']:>8} p90={s['p90_ms']:>8} p99={s['p99_ms']:>8} "
+                  f"max={s['max_ms']:>8} ms")
+
+    def to_json(self):
+        return json.dumps(self.query())
+
+
+# 프로세스 전역 인스턴스
+metrics = LatencyMetrics()
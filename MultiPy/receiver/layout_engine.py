@@ -0,0 +1,88 @@
+# layout_engine.py
+# N개 타일 화면 배치 계산 (Qt 그리드 / 컴포지터 pad 좌표 공용)
+#
+# 배치는 그리드 칸 단위 (row, col, rowspan, colspan) 목록으로 계산하고,
+# ReceiverWindow.apply_layout은 QGridLayout에, compositor는 픽셀 사각형으로 옮긴다.
+#   grid  : 화면 비율과 16:9 영상 기준으로 영상이 가장 크게 보이는 행×열을 고른다.
+#           마지막 행이 덜 찼으면 열 수를 lcm(열 수, 마지막 행 타일 수)로 잡아
+#           마지막 행 타일도 정수 colspan으로 가로를 꽉 채운다.
+#   focus : 포커스 타일 하나 + 나머지 타일 띠 (3개 이하면 오른쪽 세로 띠, 그 이상은 아래 가로 띠)
+# 기존 1~4분할은 auto 배치로 화면 비율과 무관하게 그대로 나온다
+# (2분할 = 좌우, 3분할 = 왼쪽 큰 화면 + 오른쪽 2개, 4분할 = 2×2).
+
+from math import ceil, gcd
+
+GRID = "grid"
+FOCUS = "focus"
+AUTO = "auto"
+
+TILE_ASPECT = 16 / 9
+
+# auto 2·4분할: 16:10 등 16:9보다 좁은 화면에서도 면적 계산 대신 이전 배치 유지
+_LEGACY_DIMS = {2: (1, 2), 4: (2, 2)}
+
+
+def resolve_kind(count: int, kind: str = AUTO) -> str:
+    if kind in (GRID, FOCUS):
+        return kind
+    return FOCUS if count == 3 else GRID
+
+
+def grid_dims(count: int, aspect: float = TILE_ASPECT):
+    """(rows, cols): 타일에 맞춘 16:9 영상 면적이 가장 큰 조합 (같으면 열이 많은 쪽)"""
+    best, best_area = (1, 1), -1.0
+    for cols in range(1, count + 1):
+        rows = ceil(count / cols)
+        tw, th = aspect / cols, 1.0 / rows          # 화면 높이 = 1
+        vw = min(tw, th * TILE_ASPECT)
+        area = vw * vw / TILE_ASPECT
+        if area > best_area + 1e-9 or (abs(area - best_area) <= 1e-9 and cols > best[1]):
+            best, best_area = (rows, cols), area
+    return best
+
+
+def _grid_placements(count, aspect, dims=None):
+    rows, cols = dims or grid_dims(count, aspect)
+    last = count - cols * (rows - 1)
+    span_cols = cols * last // gcd(cols, last)      # lcm
+    out = []
+    for i in range(count):
+        r, c = divmod(i, cols)
+        span = span_cols // (last if r == rows - 1 else cols)
+        out.append((r, c * span, 1, span))
+    return rows, span_cols, out
+
+
+def _focus_placements(count):
+    strip = count - 1
+    if strip <= 3:
+        # 오른쪽 세로 띠: 포커스 타일이 (cols-1)/cols 너비
+        cols = max(2, strip)
+        out = [(0, 0, strip, cols - 1)] + [(i, cols - 1, 1, 1) for i in range(strip)]
+        return strip, cols, out
+    # 아래 가로 띠: 포커스 타일이 3/4 높이
+    out = [(0, 0, 3, strip)] + [(3, i, 1, 1) for i in range(strip)]
+    return 4, strip, out
+
+
+def placements(count: int, aspect: float = TILE_ASPECT, kind: str = AUTO):
+    """(rows, cols, [(row, col, rowspan, colspan), ...]) — 타일 순서 = 셀 인덱스"""
+    if count <= 0:
+        return 1, 1, []
+    if count == 1:
+        return 1, 1, [(0, 0, 1, 1)]
+    if resolve_kind(count, kind) == FOCUS:
+        return _focus_placements(count)
+    dims = _LEGACY_DIMS.get(count) if kind == AUTO else None
+    return _grid_placements(count, aspect, dims)
+
+
+def cell_rects(count: int, width: int, height: int, kind: str = AUTO):
+    """픽셀 사각형 목록 [(x, y, w, h), ...]"""
+    rows, cols, cells = placements(count, width / height if height else TILE_ASPECT, kind)
+    rects = []
+    for r, c, rs, cs in cells:
+        x0, x1 = c * width // cols, (c + cs) * width // cols
+        y0, y1 = r * height // rows, (r + rs) * height // rows
+        rects.append((x0, y0, x1 - x0, y1 - y0))
+    return rects
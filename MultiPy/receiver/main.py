@@ -21,10 +21,17 @@ from receiver_manager import MultiReceiverManager
 from glib_qt_integration import integrate_glib_into_qt
 from view_mode_manager import ViewModeManager 
 from mqtt_manager import MqttManager
+import decoder_probe
+from latency_metrics import metrics
+from ui_scheduler import ui_commands
+from config import MQTT_ENABLED, MQTT_HOST, MQTT_PORT
 
 # GStreamer 초기화
 Gst.init(None)
 
+# 디코더 순위: 캐시가 있으면 즉시, 없으면 백그라운드에서 측정 (그동안은 고정 우선순위)
+decoder_probe.warm_up_async()
+
 def main():
     """메인 함수"""
     # PyQt5 애플리케이션 초기화
@@ -39,7 +46,7 @@ def main():
     ui.setFocus()
     
     # GLib와 PyQt5 이벤트 루프 통합
-    _glib_timer = integrate_glib_into_qt()
+    _glib_pump = integrate_glib_into_qt()  # 이벤트 기반이면 None
     
     view_manager = ViewModeManager(ui)   
 
@@ -48,8 +55,10 @@ def main():
     manager.start()
     
     # Mqtt - MultiReceiverManager 양방향 연결
-    mqtt_manager = MqttManager(receiver_manager=manager, view_mode_manager=view_manager)
-    manager.mqtt_publisher = mqtt_manager  # MQTT 클라이언트 설정
+    if MQTT_ENABLED:
+        mqtt_manager = MqttManager(receiver_manager=manager, view_mode_manager=view_manager,
+                                   ip=MQTT_HOST, port=MQTT_PORT)
+        manager.mqtt_publisher = mqtt_manager  # MQTT 클라이언트 설정
     
     # 종료 핸들러 정의 및 연결
     def _quit(*_):
@@ -61,6 +70,8 @@ def main():
     
     ui.quitRequested.connect(_quit)
     app.aboutToQuit.connect(manager.stop)
+    app.aboutToQuit.connect(metrics.dump)  # 단계별 지연 요약 출력
+    app.aboutToQuit.connect(ui_commands.dump)  # UI 명령 병합 통계 출력
     signal.signal(signal.SIGINT, _quit)
     signal.signal(signal.SIGTERM, _quit)
     
@@ -1,5 +1,7 @@
 import json, paho.mqtt.client as mqtt
 from PyQt5 import QtCore
+from latency_metrics import metrics
+from state_actor import Query
 
 # 전역 변수로 receiver_manager 저장
 receiver_manager = None
@@ -35,6 +37,14 @@ class MqttManager:
         self.publish("participant/update", json.dumps(user_list))
         print(f"[MQTT] Broadcasted participant update: {user_list}")
 
+    def _reply_from_state(self, topic, fn):
+        """수신기 상태는 메인 루프에서 읽어 응답 (MQTT 스레드에서 직접 읽지 않음)"""
+        publish = lambda result: self.publish(topic, json.dumps(result))
+        if self.receiver_manager:
+            self.receiver_manager.actor.send(Query(fn, publish))
+        else:
+            publish(fn())
+
     def publish(self, topic, payload):
         """MQTT 메시지 발행"""
         self.client.publish(topic, payload)
@@ -44,6 +54,9 @@ class MqttManager:
         client.subscribe("participant/request") # "participant/request" 토픽으로 구독, 참여자 목록 요청 
         client.subscribe("screen/request") # "screen/request" 토픽으로 구독, 화면 상태 요청
         client.subscribe("screen/update") # "screen/update" 토픽으로 구독, 관리자의 화면 배치 정보 수신
+        client.subscribe("metrics/request") # "metrics/request" 토픽으로 구독, 지연 측정 요약 요청
+        client.subscribe("stream/profile") # "stream/profile" 토픽으로 구독, sender별 지연 프로파일 변경
+        client.subscribe("negotiation/request") # "negotiation/request" 토픽으로 구독, 협상 대기열 상태 요청
 
     def _on_message(self, client, userdata, msg):
         print(f"Topic: {msg.topic}")        # 토픽 확인
@@ -53,13 +66,30 @@ class MqttManager:
             print(f"관리자가 사용자 목록을 요청합니다.")
 
             # 리스트를 JSON 문자열로 변환해서 전송
-            self.publish("participant/response", json.dumps(self._get_user_list_for_mqtt()))
+            self._reply_from_state("participant/response", self._get_user_list_for_mqtt)
         
         elif msg.topic == "screen/request":
             print(f"관리자가 공유 화면 정보를 요청합니다.")        
-            current_screen_info = self._get_current_screen_info()
-            self.publish("screen/response", json.dumps(current_screen_info))
+            self._reply_from_state("screen/response", self._get_current_screen_info)
         
+        elif msg.topic == "metrics/request":
+            print(f"관리자가 지연 측정 요약을 요청합니다.")
+            self.publish("metrics/response", metrics.to_json())
+
+        elif msg.topic == "negotiation/request":
+            if self.receiver_manager:
+                self._reply_from_state("negotiation/response",
+                                       self.receiver_manager.negotiation_status)
+
+        elif msg.topic == "stream/profile":
+            # {"id": sender_id, "profile": "ultra-low" | "balanced" | "smooth"}
+            try:
+                data = json.loads(msg.payload.decode())
+                if self.receiver_manager:
+                    self.receiver_manager.set_latency_profile(data.get("id"), data.get("profile"))
+            except Exception as e:
+                print(f"[ERROR] stream/profile 처리 중 오류: {e}")
+
         elif msg.topic == "screen/update":
             print(f"관리자로부터 화면 배치 변경 요청을 받았습니다.")
             try:
@@ -113,6 +143,7 @@ class MqttManager:
         
             return {
                 "layout": current_layout,
+                "kind": getattr(self.view_mode_manager, 'kind', 'auto'),
                 "participants": participants
             }
 
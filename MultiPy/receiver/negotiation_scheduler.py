@@ -0,0 +1,155 @@
+# negotiation_scheduler.py
+# 새 sender 협상 스케줄러 (동시 협상 수 제한 + 우선순위)
+#
+# sender가 한꺼번에 들어오면 PeerReceiver 생성(파이프라인 구성)과 offer 생성이
+# 동시에 몰려 UI가 멈춘다. 스케줄러는 새 sender를 대기열에 넣고, 동시에
+# NEGOTIATION_PARALLELISM개까지만 메인 루프에서 한 idle에 하나씩 시작한다.
+# 셀에 배정된 sender는 앞으로 당겨진다(bump). 협상이 끝나거나(ICE 연결)
+# 실패/취소되거나 NEGOTIATION_TIMEOUT_MS가 지나면 슬롯이 비워진다.
+
+import heapq
+import itertools
+import threading
+import time
+
+from gi.repository import GLib
+from latency_metrics import metrics
+
+PRIORITY_ASSIGNED = 0   # 셀에 배정된 sender
+PRIORITY_NORMAL = 1
+
+
+class NegotiationScheduler:
+    def __init__(self, start_fn, parallelism=2, timeout_ms=10000):
+        """
+        Args:
+            start_fn: start_fn(sender_id, name) — 메인 루프에서 호출, 협상 시작
+            parallelism: 동시에 진행할 최대 협상 수
+            timeout_ms: 이 시간 안에 finish()가 없으면 슬롯 반환 (피어는 유지)
+        """
+        self._start_fn = start_fn
+        self.parallelism = max(1, int(parallelism))
+        self.timeout_ms = int(timeout_ms)
+        self._lock = threading.Lock()
+        self._heap = []                 # (priority, order, sender_id)
+        self._queued = {}               # sender_id -> {name, priority, t_enqueue}
+        self._active = {}               # sender_id -> (t_start, timeout source id)
+        self._order = itertools.count()
+        self._pump_pending = False
+
+    # ----- 상태 -----
+    def is_pending(self, sender_id):
+        """대기 중이거나 진행 중이면 True"""
+        with self._lock:
+            return sender_id in self._queued or sender_id in self._active
+
+    def queued_names(self):
+        with self._lock:
+            return [(sid, q["name"]) for sid, q in self._queued.items()]
+
+    def status(self):
+        """대기열 깊이, 진행 중 수, sender별 현재 대기 시간(ms)"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "queue_depth": len(self._queued),
+                "active": len(self._active),
+                "parallelism": self.parallelism,
+                "waiting_ms": {sid: round((now - q["t_enqueue"]) * 1000.0, 1)
+                               for sid, q in self._queued.items()},
+                "active_ms": {sid: round((now - a[0]) * 1000.0, 1)
+                              for sid, a in self._active.items()},
+            }
+
+    # ----- 대기열 조작 (어느 스레드에서든 호출 가능) -----
+    def submit(self, sender_id, name, priority=PRIORITY_NORMAL):
+        with self._lock:
+            if sender_id in self._queued or sender_id in self._active:
+                return False
+            self._queued[sender_id] = {"name": name, "priority": priority,
+                                       "t_enqueue": time.monotonic()}
+            heapq.heappush(self._heap, (priority, next(self._order), sender_id))
+            depth = len(self._queued)
+        print(f"[NEGO] queued {name} (depth={depth})")
+        self._schedule_pump()
+        return True
+
+    def bump(self, sender_id, priority=PRIORITY_ASSIGNED):
+        """대기 중인 sender 우선순위 올리기 (이전 힙 항목은 꺼낼 때 무시)"""
+        with self._lock:
+            q = self._queued.get(sender_id)
+            if not q or q["priority"] <= priority:
+                return
+            q["priority"] = priority
+            heapq.heappush(self._heap, (priority, next(self._order), sender_id))
+
+    def cancel(self, sender_id):
+        """sender 제거: 대기열에서 빼거나 진행 중 슬롯 반환"""
+        with self._lock:
+            self._queued.pop(sender_id, None)
+            active = self._active.pop(sender_id, None)
+        if active:
+            GLib.source_remove(active[1])
+            self._schedule_pump()
+
+    def finish(self, sender_id, ok=True):
+        """협상 완료(ICE 연결) 또는 실패 → 슬롯 반환"""
+        with self._lock:
+            active = self._active.pop(sender_id, None)
+        if not active:
+            return
+        GLib.source_remove(active[1])
+        ms = (time.monotonic() - active[0]) * 1000.0
+        metrics.record("negotiation/scheduled→done" if ok else "negotiation/scheduled→failed", ms)
+        self._schedule_pump()
+
+    # ----- 메인 루프 -----
+    def _schedule_pump(self):
+        with self._lock:
+            if self._pump_pending:
+                return
+            self._pump_pending = True
+        GLib.idle_add(self._pump)
+
+    def _pop_next(self):
+        """우선순위가 가장 높은 유효 항목 (lock 보유 상태에서 호출)"""
+        while self._heap:
+            priority, _, sid = heapq.heappop(self._heap)
+            q = self._queued.get(sid)
+            if q and q["priority"] == priority:
+                del self._queued[sid]
+                return sid, q
+        return None, None
+
+    def _pump(self):
+        """슬롯이 비어 있으면 한 idle에 하나씩 협상 시작"""
+        with self._lock:
+            if len(self._active) >= self.parallelism:
+                self._pump_pending = False
+                return False
+            sid, q = self._pop_next()
+            if sid is None:
+                self._pump_pending = False
+                return False
+            timeout_id = GLib.timeout_add(self.timeout_ms, self._on_timeout, sid)
+            self._active[sid] = (time.monotonic(), timeout_id)
+            depth = len(self._queued)
+
+        wait_ms = (time.monotonic() - q["t_enqueue"]) * 1000.0
+        metrics.record("negotiation/queue-wait", wait_ms)
+        print(f"[NEGO] start {q['name']} (waited {wait_ms:.0f} ms, depth={depth})")
+        try:
+            self._start_fn(sid, q["name"])
+        except Exception as e:
+            print(f"[NEGO] start 실패 {q['name']}:", e)
+            self.finish(sid, ok=False)
+        return True   # 다음 idle에 이어서
+
+    def _on_timeout(self, sender_id):
+        with self._lock:
+            active = self._active.pop(sender_id, None)
+        if active:
+            print(f"[NEGO] timeout {sender_id} ({self.timeout_ms} ms) → 슬롯 반환")
+            metrics.record("negotiation/scheduled→timeout", self.timeout_ms)
+            self._schedule_pump()
+        return False
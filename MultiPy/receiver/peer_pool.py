@@ -0,0 +1,92 @@
+# peer_pool.py
+# 미리 만들어 둔 수신 파이프라인 웜 풀 (join 경로의 셋업 비용 제거)
+
+import threading
+
+import gi
+
+gi.require_version('Gst', '1.0')
+
+from gi.repository import Gst, GLib
+from gst_utils import _make, apply_ice_policy
+from decode_chain import DecodeChain
+
+
+class PipelineSlot:
+    """대기 중인 파이프라인 한 벌: pipeline + webrtcbin + 디코딩 체인(READY)"""
+
+    def __init__(self, index, compositor_mode=False):
+        self.index = index
+        self.pipeline = Gst.Pipeline.new(f"webrtc-pipeline-pool{index}")
+        self.webrtc = None
+        self.chain = DecodeChain(f"decode-pool{index}", compositor_mode)
+        self.chain.bin.set_state(Gst.State.READY)  # 디코더 장치 미리 열기
+        self.renew_webrtc()
+
+    def renew_webrtc(self):
+        """사용한 webrtcbin은 재협상이 불가하므로 새 것으로 교체"""
+        if self.webrtc is not None:
+            self.webrtc.set_state(Gst.State.NULL)
+            self.pipeline.remove(self.webrtc)
+        self.webrtc = _make("webrtcbin")
+        if not self.webrtc:
+            raise RuntimeError("webrtcbin 생성 실패")
+        apply_ice_policy(self.webrtc)
+        self.pipeline.add(self.webrtc)
+
+
+class PeerPool:
+    """PipelineSlot 대기열. acquire()로 꺼내 쓰고 release()로 되돌린다."""
+
+    def __init__(self, size, compositor_mode=False):
+        self.size = max(0, int(size))
+        self.compositor_mode = compositor_mode
+        self._idle = []
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def fill(self):
+        """메인 루프에서 한 idle마다 슬롯 하나씩 채움 (UI 멈춤 방지)"""
+        def _one():
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    return False
+                self._created += 1
+                index = self._created
+            try:
+                slot = PipelineSlot(index, self.compositor_mode)
+            except Exception as e:
+                print("[POOL] slot 생성 실패:", e)
+                return False
+            with self._lock:
+                self._idle.append(slot)
+                idle = len(self._idle)
+            print(f"[POOL] slot{index} ready ({idle}/{self.size})")
+            return True
+        if self.size:
+            GLib.idle_add(_one)
+
+    def acquire(self):
+        """대기 슬롯 반환 (없으면 None → 기존처럼 새로 생성)"""
+        with self._lock:
+            slot = self._idle.pop() if self._idle else None
+        if slot:
+            self.fill()
+        return slot
+
+    def release(self, peer):
+        """정지된 피어의 파이프라인과 디코딩 체인을 회수해 풀에 반납 (메인 루프에서 호출)"""
+        slot = getattr(peer, "slot", None)
+        if not slot or not self.size:
+            return
+        try:
+            peer.detach()
+            slot.chain.detach(slot.pipeline)
+            slot.renew_webrtc()
+        except Exception as e:
+            print(f"[POOL] slot{slot.index} 회수 실패:", e)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(slot)
+                print(f"[POOL] slot{slot.index} returned ({len(self._idle)}/{self.size})")
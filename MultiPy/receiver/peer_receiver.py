@@ -1,7 +1,7 @@
 # peer_receiver.py
 # WebRTC 피어 수신기 클래스
 
-import gi, json
+import gi, json, threading, time
 
 gi.require_version('Gst', '1.0')
 gi.require_version('GstWebRTC', '1.0')
@@ -10,34 +10,54 @@ gi.require_version('GstVideo', '1.0')
 
 from gi.repository import Gst, GstWebRTC, GstSdp, GLib, GstVideo
 from PyQt5 import QtCore
-from gst_utils import _make, get_decoder_and_sink
-from config import STUN_SERVER, GST_VIDEO_CAPS, UI_OVERLAY_DELAY_MS, ICE_STATE_CHECK_DELAY_MS
-import time, sys
+from gst_utils import _make, _set_props_if_supported, apply_ice_policy, browser_ice_servers
+from decode_chain import DecodeChain
+from stats_collector import RtpStatsCollector
+from stall_watchdog import StallWatchdog
+from latency_metrics import metrics
+from ui_scheduler import ui_commands, OP_OVERLAY
+from config import (ICE_POLICY, ICE_GATHERING_DEADLINE_MS, GST_VIDEO_CAPS, UI_OVERLAY_DELAY_MS, ICE_STATE_CHECK_DELAY_MS,
+                    LATENCY_PROFILES, DEFAULT_LATENCY_PROFILE,
+                    CANDIDATE_BATCHING, CANDIDATE_BATCH_MS,
+                    ICE_RESTART_ATTEMPTS, ICE_RESTART_INTERVAL_MS, ICE_RECOVERY_BUDGET_MS,
+                    STALL_WATCHDOG, KEYFRAME_REQUEST_MIN_INTERVAL_MS,
+                    CLEAN_FRAME_TIMEOUT_MS)
 
 class PeerReceiver:
     """WebRTC 피어 연결을 관리하는 수신기 클래스"""
     
     def __init__(self, sio, sender_id, sender_name, ui_window,
-                 on_ready=None, on_down=None):
+                 on_ready=None, on_down=None, compositor=None,
+                 slot=None, latency_profile=DEFAULT_LATENCY_PROFILE):
         """
         Args:
             sio: Socket.IO 클라이언트 인스턴스
             sender_id: Sender의 고유 ID
             sender_name: Sender의 표시 이름
             ui_window: UI 윈도우 인스턴스
-            on_ready: (더 이상 사용하지 않음) 전환 완료 콜백
-            on_down: 연결 종료 콜백 함수 (sender_id, reason)
+            on_ready: 협상 완료(첫 ICE 연결) 콜백 on_ready(sender_id)
+            on_down: 연결 종료 콜백 함수 (sender_id, reason, rebuild=False)
+                     rebuild면 피어를 정리한 뒤 새 파이프라인으로 다시 협상
+            compositor: CompositorPipeline (컴포지터 모드일 때만, 없으면 오버레이 모드)
+            slot: PeerPool에서 꺼낸 PipelineSlot (없으면 파이프라인을 새로 생성)
+            latency_profile: config.LATENCY_PROFILES 이름
         """
         self.sio = sio
         self.sender_id = sender_id
         self.sender_name = sender_name
         self.ui = ui_window
+        self.compositor = compositor
+        self.slot = slot
+        self.latency_profile = (latency_profile if latency_profile in LATENCY_PROFILES
+                                else DEFAULT_LATENCY_PROFILE)
+        metrics.reset(sender_id)
+        metrics.mark(sender_id, "peer-created")
         self.current_fps = 0.0
         self.drop_rate = 0.0
         self.avg_fps = 0.0
 
         # 콜백
-        self._on_ready = on_ready  # 현재는 호출하지 않음
+        self._on_ready = on_ready
         self._on_down = on_down
         
         # WebRTC 연결 상태 플래그들
@@ -49,55 +69,194 @@ class PeerReceiver:
         self._transceivers_added = False
 
         # 렌더링 관련
+        self._chain = None
         self._display_bin = None
+        self._frame_waiters = []   # 다음 프레임 도착 시 호출할 콜백 (체인 연결 전 대기분)
         self._visible = True
+        self._cell_size = None     # 표시 셀 픽셀 크기 (w, h)
+        self._encoding = None      # 마지막으로 sender에 요청한 인코딩 상한
         self._winid = None
+        self._clean_lock = threading.Lock()
+        # 키프레임 요청 → 첫 온전한 프레임 대기
+        #   {"reasons": {reason: 요청 시각}, "last_request", "probe": (pad, id), "timeout_id"}
+        self._clean_wait = None
+        self._frame_probes = {}    # 프레임 도착 one-shot probe id -> pad (detach 시 제거, _clean_lock)
         
         # 공유 상태 플래그 (sender-share-started/stopped로 갱신)
         self.share_active = True
 
-        # 통계 관련 상태
-        self._byte_accum = 0
-        self._last_ts = time.time()
+        # 통계 관련 상태 (바이트/패킷 카운터는 get-stats로 수집)
+        self._stats = None
         self._bitrate_mbps = 0.0
         self._width = None
         self._height = None
 
+        # GStreamer 시그널/버스 핸들러 (풀 반납 시 해제)
+        self._webrtc_handlers = []
+        self._bus_handlers = []
+        self._fps_handler = None
+
+        # 로컬 ICE 후보 묶음 (webrtcbin 스레드에서 추가, 메인 루프에서 전송)
+        self._peer_caps = {}          # sender가 answer로 알린 기능
+        self._cand_lock = threading.Lock()
+        self._cand_batch = []
+        self._cand_flush_id = None
+        self._gathering_deadline_id = None
+        self._gathering_deadline_passed = False
+
+        # ICE 끊김 복구 상태 (메인 루프에서만 변경)
+        self._recovery = None         # {"t0", "attempts", "step_id", "budget_id"}
+        self._last_ice_ufrag = None
+        self._watchdog = None         # StallWatchdog (첫 프레임 이후 시작)
+
         # GStreamer 파이프라인 초기화
         self._setup_pipeline()
+        self._stats = RtpStatsCollector(self.webrtc)
 
         # 1초 주기 통계 tick
-        GLib.timeout_add(1000, self._stats_tick)
+        self._stats_timer = GLib.timeout_add(1000, self._stats_tick)
 
     def _stats_tick(self):
+        """통계 주기 tick: webrtcbin get-stats 요청 (결과는 _on_stats에서 출력)"""
         try:
-            # 해상도 가져오기
-            if self._display_bin:
-                sink = self._display_bin.get_property("video-sink")
-                if sink:
-                    pad = sink.get_static_pad("sink")
-                    if pad:
-                        caps = pad.get_current_caps()
-                        if caps:
-                            s = caps.get_structure(0)
-                            self.width = s.get_value("width")
-                            self.height = s.get_value("height")
-
-            # Mbps 계산 (bitrate는 on_incoming_stream에서 identity나 rtpjitterbuffer 활용 가능)
-            mbps = self.bitrate / 1e6 if hasattr(self, "bitrate") else 0.0
-
-            print(f"[STATS][{self.sender_name}] "
-                f"FPS={self.current_fps:.2f}, "
-                f"drop={self.drop_rate:.2f}, "
-                f"avg={self.avg_fps:.2f}, "
-                f"Mbps={mbps:.2f}, "
-                f"res={getattr(self, 'width', '?')}x{getattr(self, 'height', '?')}")
+            self._update_resolution()
+            self._stats.request(self._on_stats)
         except Exception as e:
             print(f"[STATS][{self.sender_name}] stats_tick error:", e)
 
         return True  # 타이머 계속 반복
 
+    def _on_stats(self, stats):
+        """get-stats 결과 반영 (webrtcbin 스레드에서 1초에 한 번)"""
+        self._bitrate_mbps = stats.bitrate_mbps
+        res_str = f"{self._width}x{self._height}" if self._width and self._height else "?"
+        print(f"[STATS][{self.sender_name}] "
+            f"FPS={self.current_fps:.2f}, drop={self.drop_rate:.2f}, avg={self.avg_fps:.2f}, "
+            f"Mbps={self._bitrate_mbps:.2f}, res={res_str}, "
+            f"pkts={stats.packets_received}, lost={stats.packets_lost}, "
+            f"jitter={stats.jitter_ms:.1f}ms")
+
+    def _update_resolution(self):
+        """디코더 출력 caps에서 원본 해상도 읽기 (바뀌면 셀 크기 축소 다시 계산)"""
+        if not self._chain:
+            return
+        size = self._chain.source_size()
+        if size and size != (self._width, self._height):
+            self._width, self._height = size
+            if self._cell_size:
+                self._chain.set_render_size(*self._cell_size)
+
+    # ========== 표시 여부 / 셀 크기 ==========
+
+    def set_visible(self, visible):
+        """셀에 배정되지 않은 sender는 디코더 앞에서 버퍼를 버림 (연결은 유지).
+        다시 보이게 되면 다음 IDR을 기다리지 않도록 키프레임 요청."""
+        visible = bool(visible)
+        if visible == self._visible:
+            return False
+        self._visible = visible
+        if self._chain:
+            self._chain.set_dropping(not visible)
+            if visible:
+                self.request_clean_frame("visible")
+        print(f"[GST][{self.sender_name}] decode {'resumed' if visible else 'suspended (hidden)'}")
+        return False
+
+    def set_render_size(self, width, height):
+        """표시 셀의 실제 픽셀 크기 (이 이하로 축소해 렌더링)"""
+        self._cell_size = (int(width), int(height)) if width and height else None
+        if self._chain:
+            self._chain.set_render_size(*(self._cell_size or (0, 0)))
+        return False
+
+    def request_keyframe(self):
+        """상류로 force-key-unit 전송 → webrtcbin이 sender에 PLI 요청"""
+        if not self._chain:
+            return False
+        ok = self._chain.request_keyframe()
+        print(f"[RTC][{self.sender_name}] keyframe request {'sent' if ok else 'failed'}")
+        return False
+
+    def request_clean_frame(self, reason):
+        """(메인 루프) 배정/전환/재개 직후 키프레임 요청, 요청 → 첫 키프레임 화면까지 시간을
+        reason별로 각 요청 시각부터 기록. KEYFRAME_REQUEST_MIN_INTERVAL_MS 안의 중복 요청은
+        측정만 추가하고 키프레임은 다시 요청하지 않음. CLEAN_FRAME_TIMEOUT_MS 안에
+        키프레임 화면이 없으면 probe를 걷고 keyframe/<reason>→timeout으로 기록"""
+        if not self._chain:
+            return False
+        now = time.monotonic()
+        with self._clean_lock:
+            wait = self._clean_wait
+            if not wait:
+                pad = self._chain.decoder.get_static_pad("sink")
+                self._clean_wait = wait = {"reasons": {}, "last_request": None,
+                                           "probe": None, "timeout_id": None}
+                wait["probe"] = (pad, pad.add_probe(Gst.PadProbeType.BUFFER, self._on_keyframe_in))
+            wait["reasons"][reason] = now
+            if wait["timeout_id"]:
+                GLib.source_remove(wait["timeout_id"])
+            wait["timeout_id"] = GLib.timeout_add(CLEAN_FRAME_TIMEOUT_MS, self._on_clean_frame_timeout)
+            last, wait["last_request"] = wait["last_request"], now
+            if last and (now - last) * 1000.0 < KEYFRAME_REQUEST_MIN_INTERVAL_MS:
+                return False
+        self.request_keyframe()
+        return False
+
+    def _on_keyframe_in(self, _pad, info):
+        """디코더 입력에 키프레임이 올 때까지 (델타 프레임은 통과)"""
+        buf = info.get_buffer()
+        if buf is None or buf.has_flags(Gst.BufferFlags.DELTA_UNIT):
+            return Gst.PadProbeReturn.OK
+        with self._clean_lock:
+            wait = self._clean_wait
+            if wait:
+                pad = self._chain.fpssink.get_static_pad("sink")
+                wait["probe"] = (pad, pad.add_probe(Gst.PadProbeType.BUFFER, self._on_clean_frame))
+        return Gst.PadProbeReturn.REMOVE
+
+    def _on_clean_frame(self, _pad, _info):
+        with self._clean_lock:
+            wait, self._clean_wait = self._clean_wait, None
+        if wait:
+            if wait["timeout_id"]:
+                GLib.source_remove(wait["timeout_id"])
+            now = time.monotonic()
+            for reason, t0 in wait["reasons"].items():
+                ms = (now - t0) * 1000.0
+                metrics.record(f"keyframe/{reason}→clean-frame", ms)
+                print(f"[RTC][{self.sender_name}] clean frame {ms:.0f} ms after {reason}")
+        return Gst.PadProbeReturn.REMOVE
+
+    def _on_clean_frame_timeout(self):
+        """키프레임 화면이 오지 않음 → probe 제거 (다음 요청은 새로 측정)"""
+        with self._clean_lock:
+            wait = self._clean_wait
+            if wait:
+                wait["timeout_id"] = None
+        if not wait:
+            return False
+        now = time.monotonic()
+        for reason, t0 in wait["reasons"].items():
+            metrics.record(f"keyframe/{reason}→timeout", (now - t0) * 1000.0)
+        print(f"[RTC][{self.sender_name}] no clean frame within {CLEAN_FRAME_TIMEOUT_MS} ms "
+              f"({', '.join(wait['reasons'])})")
+        self._cancel_clean_frame()
+        return False
+
+    def _cancel_clean_frame(self):
+        with self._clean_lock:
+            wait, self._clean_wait = self._clean_wait, None
+        if not wait:
+            return
+        if wait["timeout_id"]:
+            GLib.source_remove(wait["timeout_id"])
+        if wait["probe"]:
+            pad, probe_id = wait["probe"]
+            pad.remove_probe(probe_id)
+
     def update_window_from_widget(self, w):
+        if self.compositor:
+            return
         try:
             if not w:
                 return
@@ -110,28 +269,62 @@ class PeerReceiver:
             print(f"[UI][{self.sender_name}] update_window_from_widget failed:", e)
 
     def _setup_pipeline(self):
-        """GStreamer 파이프라인 초기화"""
-        self.pipeline = Gst.Pipeline.new(f"webrtc-pipeline-{self.sender_id}")
-        self.webrtc = _make("webrtcbin")
-        
-        if not self.webrtc:
-            raise RuntimeError("webrtcbin 생성 실패")
-
-        self.pipeline.add(self.webrtc)
-        self.webrtc.set_property('stun-server', STUN_SERVER)
+        """GStreamer 파이프라인 초기화 (풀 슬롯이 있으면 그대로 사용)"""
+        if self.slot:
+            self.pipeline = self.slot.pipeline
+            self.webrtc = self.slot.webrtc
+            self._chain = self.slot.chain
+            self._chain.bind_sender(self.sender_id)
+        else:
+            self.pipeline = Gst.Pipeline.new(f"webrtc-pipeline-{self.sender_id}")
+            self.webrtc = _make("webrtcbin")
+
+            if not self.webrtc:
+                raise RuntimeError("webrtcbin 생성 실패")
+
+            self.pipeline.add(self.webrtc)
+            apply_ice_policy(self.webrtc)
 
         # WebRTC 이벤트 연결
         self._connect_webrtc_signals()
         
+        # 지연 프로파일 (jitterbuffer는 협상 전에 설정해야 새 스트림에 반영됨)
+        self._apply_jitter_profile()
+
         # 버스 설정
         self._setup_bus()
 
+    def _apply_jitter_profile(self):
+        """webrtcbin/rtpbin jitterbuffer 설정 (latency 변경은 기존 스트림에도 전파됨)"""
+        profile = LATENCY_PROFILES[self.latency_profile]
+        self.webrtc.set_property("latency", profile["jitter_latency_ms"])
+        rtpbin = self.webrtc.get_by_name("rtpbin")
+        if rtpbin:
+            _set_props_if_supported(rtpbin,
+                                    latency=profile["jitter_latency_ms"],
+                                    drop_on_latency=profile["drop_on_latency"])
+
+    def set_latency_profile(self, name):
+        """실행 중 프로파일 변경 (메인 루프에서 호출)"""
+        if name not in LATENCY_PROFILES:
+            print(f"[GST][{self.sender_name}] unknown latency profile: {name}")
+            return False
+        self.latency_profile = name
+        self._apply_jitter_profile()
+        if self._chain:
+            self._chain.apply_profile(LATENCY_PROFILES[name])
+        print(f"[GST][{self.sender_name}] latency profile → {name}")
+        return False
+
     def _connect_webrtc_signals(self):
         """WebRTC 관련 시그널 연결"""
-        self.webrtc.connect('notify::ice-connection-state', self._on_ice_conn_change)
-        self.webrtc.connect('on-ice-candidate', self.on_ice_candidate)
-        self.webrtc.connect('pad-added', self.on_incoming_stream)
-        self.webrtc.connect('on-negotiation-needed', self._on_negotiation_needed)
+        self._webrtc_handlers = [
+            self.webrtc.connect('notify::ice-connection-state', self._on_ice_conn_change),
+            self.webrtc.connect('on-ice-candidate', self.on_ice_candidate),
+            self.webrtc.connect('notify::ice-gathering-state', self._on_ice_gathering_change),
+            self.webrtc.connect('pad-added', self.on_incoming_stream),
+            self.webrtc.connect('on-negotiation-needed', self._on_negotiation_needed),
+        ]
 
     def _setup_bus(self):
         """GStreamer 버스 설정"""
@@ -146,12 +339,14 @@ class PeerReceiver:
         ]
         
         for message_type, handler in message_handlers:
-            bus.connect(message_type, handler)
+            self._bus_handlers.append(bus.connect(message_type, handler))
 
     # ========== UI 임베드 관련 ==========
     
     def prepare_window_handle(self):
         """윈도우 핸들 준비"""
+        if self.compositor:
+            return False
         try:
             w = self.ui.ensure_widget(self.sender_id, self.sender_name)
             w.setAttribute(QtCore.Qt.WA_NativeWindow, True)
@@ -192,13 +387,45 @@ class PeerReceiver:
         ret = self.pipeline.set_state(Gst.State.PLAYING)
         print(f"[GST][{self.sender_name}] set_state ->", ret.value_nick)
 
+    def cancel_timers(self):
+        """타이머/감시/probe 해제 (막히지 않으므로 제거 이벤트 즉시 호출)"""
+        if self._stats_timer:
+            GLib.source_remove(self._stats_timer)
+            self._stats_timer = None
+        if self._gathering_deadline_id is not None:
+            GLib.source_remove(self._gathering_deadline_id)
+            self._gathering_deadline_id = None
+        self._end_recovery()
+        self._stop_watchdog()
+        self._cancel_clean_frame()
+
     def stop(self):
-        """파이프라인 완전 정지"""
+        """파이프라인 완전 정지 (NULL 전환은 수백 ms 막힐 수 있음 → TeardownWorker)"""
+        self.cancel_timers()
         try:
             self.pipeline.set_state(Gst.State.NULL)
         except:
             pass
 
+    def detach(self):
+        """풀 반납 전 이 피어가 연결한 시그널/버스 핸들러 해제"""
+        for hid in self._webrtc_handlers:
+            self.webrtc.disconnect(hid)
+        self._webrtc_handlers = []
+        bus = self.pipeline.get_bus()
+        for hid in self._bus_handlers:
+            bus.disconnect(hid)
+        self._bus_handlers = []
+        bus.remove_signal_watch()
+        bus.set_sync_handler(None)
+        # 풀 체인에 남은 probe가 다음 sender에서 불리지 않도록
+        self._cancel_clean_frame()
+        self._remove_frame_probes()
+        if self._fps_handler and self._chain:
+            self._chain.fpssink.disconnect(self._fps_handler)
+            self._fps_handler = None
+        self._display_bin = None
+
     def pause_pipeline(self):
         """공유 중지 시 파이프라인 일시정지"""
         # NOTE: ALWAYS_PLAYING 옵션은 외부 config에 둘 수 있음
@@ -208,13 +435,15 @@ class PeerReceiver:
         except Exception as e:
             print(f"[GST][{self.sender_name}] pause err:", e)
 
-    def resume_pipeline(self):
-        """공유 재개 시 파이프라인 재생"""
+    def resume_pipeline(self, reason="resume"):
+        """공유 재개/셀 배정 시 파이프라인 재생 + 키프레임 요청 (다음 IDR을 기다리지 않음)"""
         self.share_active = True
         try:
             self.pipeline.set_state(Gst.State.PLAYING)
-            print(f"[GST][{self.sender_name}] → PLAYING (share started)")
-            GLib.timeout_add(UI_OVERLAY_DELAY_MS, lambda: (self._force_overlay_handle() or False))
+            print(f"[GST][{self.sender_name}] → PLAYING ({reason})")
+            ui_commands.post(self.sender_id, OP_OVERLAY, self._force_overlay_handle,
+                             delay_ms=UI_OVERLAY_DELAY_MS)
+            self.request_clean_frame(reason)
         except Exception as e:
             print(f"[GST][{self.sender_name}] resume err:", e)
 
@@ -244,19 +473,141 @@ class PeerReceiver:
             print(f"[RTC][{self.sender_name}] ICE state read error:", e); return
             
         print(f"[RTC][{self.sender_name}] ICE state:", state)
-        
-        if state in (4, 5, 6):
-            def _maybe_remove():
-                try:
-                    st2 = int(self.webrtc.get_property('ice-connection-state'))
-                    if st2 in (4, 6) or st2 == 5:
-                        if self._on_down:
-                            self._on_down(self.sender_id, reason=f"ice-{st2}")
-                except Exception:
-                    if self._on_down:
-                        self._on_down(self.sender_id, reason="ice-unknown")
-                return False
-            GLib.timeout_add(ICE_STATE_CHECK_DELAY_MS, _maybe_remove)
+
+        if state in (2, 3) and not metrics.has(self.sender_id, "ice-connected"):
+            metrics.mark(self.sender_id, "ice-connected")
+            metrics.span(self.sender_id, "negotiation/answer→ice", "answer-applied", "ice-connected")
+            if self._on_ready:
+                self._on_ready(self.sender_id)
+
+        # 복구 상태 머신은 메인 루프에서 진행
+        GLib.idle_add(self._on_ice_state_main, state)
+
+    # ========== ICE 끊김 복구 ==========
+    #
+    # connected/completed ──(disconnected/failed)──▶ 복구 중
+    #   복구 중: ICE_STATE_CHECK_DELAY_MS 뒤에도 끊겨 있으면 ICE restart offer,
+    #           ICE_RESTART_INTERVAL_MS마다 최대 ICE_RESTART_ATTEMPTS번 재시도
+    #   복구 중 ──(connected/completed)──▶ 정상 (ice-recovery 기록)
+    #   복구 중 ──(ICE_RECOVERY_BUDGET_MS 초과)──▶ on_down (제거)
+    #   복구 중 ──(restart offer의 ufrag가 그대로 = webrtcbin이 ice-restart 무시)──▶
+    #           on_down(rebuild=True): 새 파이프라인/webrtcbin으로 다시 협상 (ice-recovery/rebuild)
+    # closed(6)는 복구하지 않고 바로 on_down.
+    # 디코딩 체인/위젯/셀 배정은 복구 중에도 그대로 유지된다.
+
+    def _ice_state(self):
+        try:
+            return int(self.webrtc.get_property('ice-connection-state'))
+        except Exception:
+            return -1
+
+    def _on_ice_state_main(self, state):
+        if state in (2, 3):
+            if self._recovery:
+                ms = (time.monotonic() - self._recovery["t0"]) * 1000.0
+                metrics.record("ice-recovery", ms)
+                print(f"[RTC][{self.sender_name}] ICE recovered in {ms:.0f} ms "
+                      f"(restarts={self._recovery['attempts']})")
+                self._end_recovery()
+        elif state == 6:
+            self._end_recovery()
+            if self._on_down:
+                self._on_down(self.sender_id, reason="ice-6")
+        elif state in (4, 5) and not self._recovery:
+            print(f"[RTC][{self.sender_name}] ICE lost (state {state}) → recovery")
+            self._recovery = {
+                "t0": time.monotonic(),
+                "attempts": 0,
+                "step_id": GLib.timeout_add(ICE_STATE_CHECK_DELAY_MS, self._recovery_step),
+                "budget_id": GLib.timeout_add(ICE_RECOVERY_BUDGET_MS, self._recovery_expired),
+            }
+        return False
+
+    def _recovery_step(self):
+        rec = self._recovery
+        if not rec:
+            return False
+        rec["step_id"] = None
+        if self._ice_state() in (2, 3):
+            return False
+        if rec["attempts"] < ICE_RESTART_ATTEMPTS:
+            rec["attempts"] += 1
+            print(f"[RTC][{self.sender_name}] ICE restart {rec['attempts']}/{ICE_RESTART_ATTEMPTS}")
+            self._negotiating = False   # 이전 협상이 멈춰 있어도 새 offer 허용
+            self._maybe_create_offer(ice_restart=True)
+            rec["step_id"] = GLib.timeout_add(ICE_RESTART_INTERVAL_MS, self._recovery_step)
+        return False
+
+    def _recovery_expired(self):
+        rec = self._recovery
+        if not rec:
+            return False
+        rec["budget_id"] = None
+        if self._ice_state() in (2, 3):
+            return False
+        metrics.record("ice-recovery/failed", ICE_RECOVERY_BUDGET_MS)
+        print(f"[RTC][{self.sender_name}] ICE recovery budget exhausted "
+              f"({ICE_RECOVERY_BUDGET_MS} ms, restarts={rec['attempts']})")
+        self._end_recovery()
+        if self._on_down:
+            self._on_down(self.sender_id, reason="ice-recovery-timeout")
+        return False
+
+    def _recovery_rebuild(self):
+        """ICE restart가 무시됨 → 복구 종료 후 새 파이프라인으로 재협상 요청"""
+        rec = self._recovery
+        if not rec:
+            return False
+        ms = (time.monotonic() - rec["t0"]) * 1000.0
+        metrics.record("ice-recovery/rebuild", ms)
+        print(f"[RTC][{self.sender_name}] ICE restart ignored after {ms:.0f} ms "
+              f"(restarts={rec['attempts']}) → rebuild pipeline")
+        self._end_recovery()
+        if self._on_down:
+            self._on_down(self.sender_id, reason="ice-restart-ignored", rebuild=True)
+        return False
+
+    def _end_recovery(self):
+        rec, self._recovery = self._recovery, None
+        if not rec:
+            return
+        for key in ("step_id", "budget_id"):
+            if rec[key]:
+                GLib.source_remove(rec[key])
+
+    # ========== 정지 감시 ==========
+
+    def _start_watchdog(self):
+        """첫 프레임 이후 메인 루프에서 시작 (probe는 디코더/싱크 입력 pad)"""
+        if not STALL_WATCHDOG or self._watchdog or not self._chain:
+            return False
+        if not self._stats_timer:   # 이미 stop()된 피어
+            return False
+        self._watchdog = StallWatchdog(
+            self.sender_name,
+            self._chain.decoder.get_static_pad("sink"),
+            self._chain.fpssink.get_static_pad("sink"),
+            packets_received=lambda: self._stats.packets_received,
+            is_active=self._watchdog_active,
+            request_keyframe=self.request_keyframe,
+            renegotiate=self._renegotiate_stalled,
+        )
+        return False
+
+    def _stop_watchdog(self):
+        if self._watchdog:
+            self._watchdog.stop()
+            self._watchdog = None
+
+    def _watchdog_active(self):
+        """표시 중이고 공유 중이며 재생 중이고 ICE 복구 중이 아닐 때만 감시"""
+        return (self._visible and self.share_active and self._gst_playing
+                and not self._recovery)
+
+    def _renegotiate_stalled(self):
+        """키프레임 요청으로 풀리지 않은 정지 → 새 offer로 재협상"""
+        self._negotiating = False
+        self._maybe_create_offer()
 
     # ========== WebRTC Negotiation ==========
     
@@ -283,13 +634,15 @@ class PeerReceiver:
             return
         GLib.idle_add(lambda: self._maybe_create_offer())
 
-    def _maybe_create_offer(self):
-        """Offer 생성 (중복 방지)"""
+    def _maybe_create_offer(self, ice_restart=False):
+        """Offer 생성 (중복 방지). ice_restart면 새 ICE 자격 증명으로 재협상"""
         if self._negotiating: return False
         self._negotiating = True
         def _do():
+            options = (Gst.Structure.new_from_string("offer-options, ice-restart=(boolean)true")
+                       if ice_restart else None)
             p = Gst.Promise.new_with_change_func(self._on_offer_created, self.webrtc)
-            self.webrtc.emit('create-offer', None, p)
+            self.webrtc.emit('create-offer', options, p)
             return False
         GLib.idle_add(_do)
         return False 
@@ -301,12 +654,23 @@ class PeerReceiver:
         offer = reply.get_value('offer')
         if not offer: self._negotiating=False; return
         self._pending_offer_sdp = offer.sdp.as_text()
+        ufrag = next((l.split(":", 1)[1].strip() for l in self._pending_offer_sdp.splitlines()
+                      if l.startswith("a=ice-ufrag:")), None)
+        if self._recovery and ufrag == self._last_ice_ufrag:
+            # 같은 자격 증명으로는 복구되지 않음 → 이 offer는 버리고 파이프라인 재구성
+            print(f"[RTC][{self.sender_name}] ICE restart: ufrag unchanged (webrtcbin ignored ice-restart)")
+            self._pending_offer_sdp = None
+            self._negotiating = False
+            GLib.idle_add(self._recovery_rebuild)
+            return
+        self._last_ice_ufrag = ufrag
         p2 = Gst.Promise.new_with_change_func(self._on_local_desc_set, element)
         element.emit('set-local-description', offer, p2)
 
     def _on_local_desc_set(self, promise, element):
         """로컬 SDP 설정 완료 핸들러"""
         print(f"[RTC][{self.sender_name}] Local description set (offer)")
+        self._start_gathering_deadline()
         if self._gst_playing and self.sender_id:
             self._send_offer()
         self._negotiating = False
@@ -319,30 +683,115 @@ class PeerReceiver:
             'to': self.sender_id,
             'from': self.sio.sid,
             'type': 'offer',
-            'payload': {'type': 'offer', 'sdp': self._pending_offer_sdp}
+            'payload': {'type': 'offer', 'sdp': self._pending_offer_sdp},
+            'caps': {'candidateBatch': CANDIDATE_BATCHING},
+            'ice': {'policy': ICE_POLICY,
+                    'iceServers': browser_ice_servers(),
+                    'gatheringDeadlineMs': ICE_GATHERING_DEADLINE_MS}
         })
         print(f'[SIO][{self.sender_name}] offer 전송 → {self.sender_id}')
+        metrics.mark(self.sender_id, "offer-sent")
+        metrics.span(self.sender_id, "negotiation/peer→offer", "peer-created", "offer-sent")
 
-    def apply_remote_answer(self, sdp_text: str):
-        """원격 Answer SDP 적용"""
+    def apply_remote_answer(self, sdp_text: str, caps=None):
+        """원격 Answer SDP 적용 (caps: answer signal에 실린 sender 기능)"""
+        self._peer_caps = dict(caps or {})
         ok, sdpmsg = GstSdp.SDPMessage.new()
         if ok != GstSdp.SDPResult.OK: return False
         GstSdp.sdp_message_parse_buffer(sdp_text.encode('utf-8'), sdpmsg)
         answer = GstWebRTC.WebRTCSessionDescription.new(GstWebRTC.WebRTCSDPType.ANSWER, sdpmsg)
         self.webrtc.emit('set-remote-description', answer, None)
         print(f"[RTC][{self.sender_name}] Remote ANSWER 적용 완료")
+        metrics.mark(self.sender_id, "answer-applied")
+        metrics.span(self.sender_id, "negotiation/offer→answer", "offer-sent", "answer-applied")
         return False   
 
-    def on_ice_candidate(self, element, mlineindex, candidate):
-        """ICE 후보 수신 시 시그널링 서버로 전송"""
+    def set_encoding(self, params: dict):
+        """sender 인코딩 상한(maxBitrate/maxFramerate/maxWidth/maxHeight/active) 요청.
+        이전과 같은 값이면 보내지 않음."""
+        if params == self._encoding:
+            return False
+        self._encoding = dict(params)
         self.sio.emit('signal', {
             'to': self.sender_id,
             'from': self.sio.sid,
-            'type': 'candidate',
-            'payload': {'candidate': candidate,
-                        'sdpMid': f"video{mlineindex}",
-                        'sdpMLineIndex': int(mlineindex)}
+            'type': 'encoding',
+            'payload': params
         })
+        print(f"[SIO][{self.sender_name}] encoding → {params}")
+        return False
+
+    @staticmethod
+    def _candidate_payload(mlineindex, candidate):
+        return {'candidate': candidate,
+                'sdpMid': f"video{mlineindex}",
+                'sdpMLineIndex': int(mlineindex)}
+
+    def on_ice_candidate(self, element, mlineindex, candidate):
+        """ICE 후보 수신 시 시그널링 서버로 전송 (묶음 모드면 CANDIDATE_BATCH_MS 동안 모음)"""
+        if not CANDIDATE_BATCHING or self._gathering_deadline_passed:
+            self._send_candidates([self._candidate_payload(mlineindex, candidate)])
+            return
+        with self._cand_lock:
+            self._cand_batch.append(self._candidate_payload(mlineindex, candidate))
+            if self._cand_flush_id is None:
+                self._cand_flush_id = GLib.timeout_add(CANDIDATE_BATCH_MS, self._flush_candidates)
+
+    def _on_ice_gathering_change(self, element, _pspec):
+        """수집 완료(end-of-candidates) → 남은 후보 즉시 전송"""
+        if element.get_property('ice-gathering-state') == GstWebRTC.WebRTCICEGatheringState.COMPLETE:
+            GLib.idle_add(self._flush_candidates)
+
+    def _start_gathering_deadline(self):
+        """offer 로컬 설정 후 수집 마감 타이머 (늦게 오는 STUN 후보를 기다리지 않음)"""
+        with self._cand_lock:
+            self._gathering_deadline_passed = False
+            if self._gathering_deadline_id is None:
+                self._gathering_deadline_id = GLib.timeout_add(ICE_GATHERING_DEADLINE_MS,
+                                                               self._on_gathering_deadline)
+
+    def _on_gathering_deadline(self):
+        with self._cand_lock:
+            self._gathering_deadline_id = None
+            self._gathering_deadline_passed = True
+        self._flush_candidates()
+        return False
+
+    def _flush_candidates(self):
+        with self._cand_lock:
+            batch, self._cand_batch = self._cand_batch, []
+            if self._cand_flush_id is not None:
+                GLib.source_remove(self._cand_flush_id)
+                self._cand_flush_id = None
+        if batch:
+            self._send_candidates(batch)
+        return False
+
+    def _send_candidates(self, batch):
+        """sender가 묶음을 지원하면 'candidates' 한 번, 아니면 후보별 'candidate'"""
+        if len(batch) > 1 and self._peer_caps.get('candidateBatch'):
+            self.sio.emit('signal', {
+                'to': self.sender_id,
+                'from': self.sio.sid,
+                'type': 'candidates',
+                'payload': {'candidates': batch}
+            })
+            return
+        for c in batch:
+            self.sio.emit('signal', {
+                'to': self.sender_id,
+                'from': self.sio.sid,
+                'type': 'candidate',
+                'payload': c
+            })
+
+    def add_remote_candidates(self, candidates):
+        """sender의 'candidates' 묶음을 메인 루프 한 번에 적용"""
+        for c in candidates:
+            cand = c.get('candidate')
+            if cand:
+                self.webrtc.emit('add-ice-candidate', int(c.get('sdpMLineIndex') or 0), cand)
+        return False
         
     # ========== 미디어 스트림 처리 ==========
     
@@ -355,77 +804,85 @@ class PeerReceiver:
         if not caps_str.startswith("application/x-rtp"):
             return
 
-        depay = _make("rtph264depay")
-        parse = _make("h264parse")
-        decoder, conv, _ = get_decoder_and_sink()
-
-        q = _make("queue")
-        fpssink = _make("fpsdisplaysink")
-
-        # 여기서 OS별 싱크 생성
-        sink = None
-        if sys.platform.startswith("linux"):
-            # Jetson / 일반 Linux
-            sink = _make("nv3dsink") or _make("glimagesink")
-        elif sys.platform == "win32":
-            sink = _make("d3d11videosink")
-        elif sys.platform == "darwin":
-            sink = _make("glimagesink")
-
-        if sink:
-            sink.set_property("sync", False)              # 지연 방지
-            fpssink.set_property("video-sink", sink)      # fpsdisplaysink → 실제 싱크 연결
-
-
-        # FPS 측정 싱크 설정
-        if fpssink:
-            fpssink.set_property("signal-fps-measurements", True)
-            fpssink.set_property("text-overlay", False)
-            fpssink.set_property("sync", False)  # [MODIFIED] 측정만 하고 렌더링은 빠르게
-            if sink:
-                fpssink.set_property("video-sink", sink)  # [MODIFIED] 강제 지정
-            fpssink.connect("fps-measurements", self._on_fps_measurements)
-
-        if not all([depay, parse, decoder, conv, q, fpssink]):
-            print(f"[RTC][{self.sender_name}] 요소 부족으로 링크 실패")
-            return
-
-        # 파이프라인 구성
-        for e in (depay, parse, decoder, conv, q, fpssink):
-            self.pipeline.add(e)
-            e.sync_state_with_parent()
-
-        identity = _make("identity")
-        if identity:
-            identity.set_property("signal-handoffs", True)
-            identity.connect("handoff", self._on_rtp_handoff)
-
-        # 요소 추가
-        for e in (depay, identity, parse, decoder, conv, q, fpssink):
-            self.pipeline.add(e)
-            e.sync_state_with_parent()
+        # 풀에서 받은 체인이 있으면 재사용, 없으면 새로 생성
+        pooled = self._chain is not None
+        if not pooled:
+            try:
+                self._chain = DecodeChain(f"decode-{self.sender_id}", bool(self.compositor))
+            except Exception as e:
+                print(f"[RTC][{self.sender_name}] 요소 부족으로 링크 실패:", e)
+                return
+            self._chain.bind_sender(self.sender_id)
+        chain = self._chain
+        chain.apply_profile(LATENCY_PROFILES[self.latency_profile])
+        chain.set_dropping(not self._visible)
+
+        self._fps_handler = chain.fpssink.connect("fps-measurements", self._on_fps_measurements)
+
+        # 첫 디코딩/렌더링 버퍼 시점 측정 (각각 한 번만 실행 후 probe 제거)
+        sid = self.sender_id
+        def _first_decoded(_pad, _info):
+            metrics.mark(sid, "first-decoded-buffer")
+            metrics.span(sid, "media/ice→first-decoded", "ice-connected", "first-decoded-buffer")
+            return Gst.PadProbeReturn.REMOVE
+
+        def _first_sink(_pad, _info):
+            metrics.mark(sid, "first-sink-buffer")
+            metrics.span(sid, "media/decoded→sink", "first-decoded-buffer", "first-sink-buffer")
+            metrics.span(sid, "ttff/share-request→frame", "share-request", "first-sink-buffer")
+            ms = metrics.span(sid, f"ttff/join→frame ({'pooled' if self.slot else 'cold'})",
+                              "peer-created", "first-sink-buffer")
+            print(f"[RTC][{self.sender_name}] first frame {ms or 0:.0f} ms "
+                  f"({'pooled' if self.slot else 'cold'})")
+            waiters, self._frame_waiters = self._frame_waiters, []
+            for cb in waiters:
+                cb(sid)
+            GLib.idle_add(self._start_watchdog)
+            return Gst.PadProbeReturn.REMOVE
+
+        self._add_frame_probe(chain.decoder.get_static_pad("src"), _first_decoded)
+        self._add_frame_probe(chain.fpssink.get_static_pad("sink"), _first_sink)
 
         # pad 링크
-        if pad.link(depay.get_static_pad("sink")) != Gst.PadLinkReturn.OK:
+        if not chain.attach(self.pipeline, pad):
             print(f"[RTC][{self.sender_name}] pad link 실패")
             return
 
-        # 링크
-        depay.link(identity)
-        identity.link(parse)
-        parse.link(decoder)
-        decoder.link(conv)
-        conv.link(q)
-        q.link(fpssink)
+        self._display_bin = chain.fpssink
+        print(f"[OK][{self.sender_name}] Incoming video linked → {chain.decoder.name}"
+              f"{' (pooled)' if pooled else ''}")
 
-        # FPS 콜백 연결
-        fpssink.connect("fps-measurements", self._on_fps_measurements)
-
-        self._display_bin = fpssink
-        print(f"[OK][{self.sender_name}] Incoming video linked → {decoder.name}")
+    def notify_next_frame(self, cb):
+        """다음 프레임이 싱크에 도착하면 cb(sender_id)를 한 번 호출 (one-shot probe)"""
+        if not self._display_bin:
+            self._frame_waiters.append(cb)
+            return
+        def _probe(_pad, _info):
+            cb(self.sender_id)
+            return Gst.PadProbeReturn.REMOVE
+        self._add_frame_probe(self._display_bin.get_static_pad("sink"), _probe)
+
+    def _add_frame_probe(self, pad, fn):
+        """one-shot BUFFER probe (불리면 목록에서 빠지고, 안 불린 것은 detach()에서 제거)"""
+        def _once(p, info):
+            with self._clean_lock:
+                self._frame_probes.pop(info.id, None)
+            return fn(p, info)
+        with self._clean_lock:
+            probe_id = pad.add_probe(Gst.PadProbeType.BUFFER, _once)
+            if probe_id:
+                self._frame_probes[probe_id] = pad
+
+    def _remove_frame_probes(self):
+        with self._clean_lock:
+            probes, self._frame_probes = self._frame_probes, {}
+            self._frame_waiters = []
+        for probe_id, pad in probes.items():
+            pad.remove_probe(probe_id)
 
     # ========== FPS 콜백 ==========
     def _on_fps_measurements(self, element, fps, drop, avg):
+        """fpsdisplaysink 측정값 저장 (fps-update-interval마다 호출, 출력은 _on_stats)"""
         self.current_fps = fps
         self.drop_rate = drop
         self.avg_fps = avg
@@ -433,33 +890,6 @@ class PeerReceiver:
         # 해상도
         if self._width is None or self._height is None:
             try:
-                sink = self._display_bin.get_property("video-sink")
-                if sink:
-                    pad = sink.get_static_pad("sink")
-                    if pad:
-                        caps = pad.get_current_caps()
-                        if caps:
-                            s = caps.get_structure(0)
-                            self._width = s.get_value("width")
-                            self._height = s.get_value("height")
+                self._update_resolution()
             except Exception:
                 self._width, self._height = None, None
-
-        res_str = f"{self._width}x{self._height}" if self._width and self._height else "?"
-
-        print(f"[STATS][{self.sender_name}] "
-            f"FPS={fps:.2f}, drop={drop:.2f}, avg={avg:.2f}, "
-            f"Mbps={self._bitrate_mbps:.2f}, res={res_str}")
-
-
-    # ========== 비트레이트 계산 ==========
-    def _on_rtp_handoff(self, identity, buffer):
-        size = buffer.get_size()
-        self._byte_accum += size
-        now = time.time()
-        elapsed = now - self._last_ts
-        if elapsed >= 1.0:
-            # Mbps로 변환
-            self._bitrate_mbps = (self._byte_accum * 8) / (elapsed * 1_000_000)
-            self._byte_accum = 0
-            self._last_ts = now
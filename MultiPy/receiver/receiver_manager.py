@@ -7,8 +7,31 @@ import socketio
 from gi.repository import GLib
 from PyQt5 import QtCore
 
-from config import SIGNALING_URL, RECEIVER_NAME, UI_OVERLAY_DELAY_MS
+from config import (SIGNALING_URL, RECEIVER_NAME, ROOM_ID, UI_OVERLAY_DELAY_MS, COMPOSITOR_MODE,
+                    PEER_POOL_SIZE, SENDER_LATENCY_PROFILES, DEFAULT_LATENCY_PROFILE,
+                    DECODE_HIDDEN_SENDERS, SCALE_TO_CELL, COMPOSITOR_CANVAS,
+                    SENDER_ENCODING_CONTROL, ENCODING_BITS_PER_PIXEL, ENCODING_BITRATE_RANGE,
+                    ENCODING_FOCUSED_FPS, ENCODING_UNFOCUSED_FPS,
+                    NEGOTIATION_PARALLELISM, NEGOTIATION_TIMEOUT_MS,
+                    STATE_QUEUE_BATCH, SENDER_SNAPSHOT_TIMEOUT_MS)
 from peer_receiver import PeerReceiver
+from peer_pool import PeerPool
+from compositor import CompositorPipeline
+from layout_engine import AUTO, cell_rects
+from latency_metrics import metrics
+from negotiation_scheduler import NegotiationScheduler, PRIORITY_ASSIGNED, PRIORITY_NORMAL
+from teardown_worker import TeardownWorker
+from state_actor import (StateActor, Connected, SenderList, Snapshot, SenderDelta, ShareStarted,
+                         ShareStopped, Signal, NegotiationDone, RemoveSender, RemoveAll,
+                         SetLatencyProfile)
+from ui_scheduler import (ui_commands, OP_WINDOW, OP_PLAY, OP_VISIBLE,
+                          OP_RENDER_SIZE, OP_ENCODING)
+
+
+def _qt(callable_):
+    """Qt 메인 스레드에서 실행"""
+    QtCore.QTimer.singleShot(0, callable_)
+
 
 class MultiReceiverManager:
     def __init__(self, ui_window, view_manager=None):
@@ -25,6 +48,42 @@ class MultiReceiverManager:
 
         # 현재 레이아웃에서 어떤 셀에 어떤 sender가 들어가 있는지
         self._cell_assign: dict[int, str] = {}   # cell_index -> sender_id
+        self._visibility_pending = False
+        self.mqtt_publisher = None   # main.py에서 MqttManager 연결 (없으면 알림 생략)
+
+        # sender 목록 델타 순번 (None: 아직 스냅샷을 받지 못함 → 델타는 보류)
+        self._sender_seq = None
+        self._pending_deltas = []
+        self._snapshot_timer = None   # 스냅샷 응답 대기 제한 (메인 루프)
+
+        # 다른 스레드(socket.io / MQTT / GStreamer)의 상태 변경은 명령으로 받아 메인 루프에서 처리
+        self.actor = StateActor({
+            Connected: self._on_connected,
+            SenderList: lambda cmd: self._reconcile_senders(cmd.senders),
+            Snapshot: lambda cmd: self._apply_snapshot(cmd.snapshot),
+            SenderDelta: lambda cmd: self._on_sender_delta(cmd.kind, cmd.data),
+            ShareStarted: self._on_share_started,
+            ShareStopped: self._on_share_stopped,
+            Signal: self._on_signal,
+            NegotiationDone: self._on_negotiation_done,
+            RemoveSender: self._on_remove_sender,
+            RemoveAll: self._on_remove_all,
+            SetLatencyProfile: lambda cmd: self._set_latency_profile(cmd.sender_id, cmd.profile),
+        }, STATE_QUEUE_BATCH)
+
+        # 컴포지터 모드: 모든 sender를 하나의 믹서/싱크로 합성
+        self.compositor = CompositorPipeline() if COMPOSITOR_MODE else None
+
+        # 미리 만든 수신 파이프라인 웜 풀 (PEER_POOL_SIZE=0이면 비활성)
+        self.pool = PeerPool(PEER_POOL_SIZE, compositor_mode=bool(self.compositor))
+
+        # 새 sender 협상 대기열 (동시 협상 수 제한, 셀 배정 sender 우선)
+        self.negotiations = NegotiationScheduler(self._start_negotiation,
+                                                 NEGOTIATION_PARALLELISM, NEGOTIATION_TIMEOUT_MS)
+        self._deferred_assign: dict[str, int] = {}   # 협상 대기 중 배정 요청: sender_id -> cell_index
+
+        # 제거된 피어의 파이프라인 정리 (NULL 전환/풀 반납은 작업 스레드에서)
+        self.teardown = TeardownWorker()
 
         self._bind_socket_events()
 
@@ -32,11 +91,11 @@ class MultiReceiverManager:
             self.view_manager.bind_manager(self)
             self.view_manager.set_senders_provider(self.list_active_senders)
 
-    def _qt(callable_):
-        QtCore.QTimer.singleShot(0, callable_)
-
     def start(self):
         """매니저 시작"""
+        if self.compositor:
+            self.compositor.start(self.ui.ensure_compositor_surface())
+        self.pool.fill()
         threading.Thread(target=self._sio_connect, daemon=True).start()
 
     def stop(self):
@@ -46,6 +105,9 @@ class MultiReceiverManager:
                 peer.stop()
         except:
             pass
+        self.teardown.drain()
+        if self.compositor:
+            self.compositor.stop()
         try:
             if self.sio.connected:
                 self.sio.disconnect()
@@ -57,34 +119,146 @@ class MultiReceiverManager:
         return [sid for sid, p in self.peers.items() if p.share_active]
 
     def list_active_senders(self):
-        return [(sid, p.sender_name) for sid, p in self.peers.items()]
+        return ([(sid, p.sender_name) for sid, p in self.peers.items()]
+                + self.negotiations.queued_names())
+
+    def negotiation_status(self):
+        """협상 대기열 상태 (MQTT negotiation/request)"""
+        return self.negotiations.status()
 
     # ----- 모드 전환/셀 배정 보조 -----
-    def pause_all_streams(self):
-        """(더 이상 사용하지 않음)"""
-        self._cell_assign.clear()
+    def on_layout_changed(self, cell_count: int):
+        """분할 모드 변경: 없어진 셀의 배정만 해제 (남은 셀의 배정/위젯은 유지)"""
+        for idx in [i for i in self._cell_assign if i >= cell_count]:
+            self._cell_assign.pop(idx, None)
+        self._sync_compositor()
+        self._schedule_visibility_refresh()
+
+    def release_cell(self, cell_index: int):
+        """셀 배정 해제 → 빈 셀은 placeholder 표시"""
+        if self._cell_assign.pop(cell_index, None) is None:
+            return
+        if self.view_manager:
+            _qt(lambda: self.view_manager.clear_cell(cell_index))
+        self._sync_compositor()
+        self._schedule_visibility_refresh()
 
-    def assign_sender_to_cell(self, cell_index: int, sender_id: str):
-        """특정 셀에 sender 배정"""
-        if sender_id not in self.peers or not (0 <= cell_index):
+    def _sync_compositor(self):
+        """컴포지터 모드: 현재 셀 배정을 믹서 pad 좌표로 반영"""
+        if not self.compositor:
+            return
+        mode, kind = self._layout()
+        assignments = dict(self._cell_assign)
+        GLib.idle_add(lambda: self.compositor.apply_assignments(mode, assignments, kind) or False)
+
+    def _layout(self):
+        """현재 (타일 수, 배치 종류)"""
+        if not self.view_manager:
+            return 1, AUTO
+        return self.view_manager.mode or 1, self.view_manager.kind
+
+    def _schedule_visibility_refresh(self):
+        """셀 배정이 바뀌면 한 idle에 모아 sender별 디코딩 여부/렌더 크기 갱신"""
+        if self._visibility_pending:
+            return
+        self._visibility_pending = True
+        _qt(self._refresh_visibility)
+
+    def _cell_pixel_size(self, idx, mode):
+        """셀의 실제 픽셀 크기 (HiDPI 반영), 알 수 없으면 None"""
+        if self.compositor:
+            rects = cell_rects(mode, *COMPOSITOR_CANVAS, self._layout()[1])
+            return rects[idx][2:] if idx < len(rects) else None
+        cells = self.view_manager.cells if self.view_manager else []
+        if not (0 <= idx < len(cells)):
+            return None
+        cell = cells[idx]
+        ratio = cell.devicePixelRatioF()
+        return int(cell.width() * ratio), int(cell.height() * ratio)
+
+    def on_cells_resized(self):
+        """셀 크기 변경 (창 크기/배치 변경) → 렌더 크기/인코딩 상한 다시 계산"""
+        self._schedule_visibility_refresh()
+
+    def on_focus_changed(self):
+        """포커스 셀 변경 (ViewModeManager) → 인코딩 상한 다시 계산"""
+        self._schedule_visibility_refresh()
+
+    def _encoding_for(self, visible, size, focused):
+        """셀 크기/포커스 → sender 인코딩 상한"""
+        if not visible:
+            return {"active": False}
+        if not size:
+            # 셀 크기를 모르면 상한 해제 (첫 표시 전 등)
+            return {"active": True}
+        w, h = size
+        fps = ENCODING_FOCUSED_FPS if focused else ENCODING_UNFOCUSED_FPS
+        lo, hi = ENCODING_BITRATE_RANGE
+        bitrate = int(min(hi, max(lo, w * h * fps * ENCODING_BITS_PER_PIXEL)))
+        # 10만 bps 단위로 반올림 (셀 크기 미세 변화로 매번 재전송하지 않도록)
+        bitrate = round(bitrate, -5)
+        return {"active": True, "maxBitrate": bitrate, "maxFramerate": fps,
+                "maxWidth": w, "maxHeight": h}
+
+    def _refresh_visibility(self):
+        """Qt 스레드: 셀에 없는 sender는 디코딩 중단, 보이는 sender는 셀 크기로 축소"""
+        self._visibility_pending = False
+        mode = (self.view_manager.mode if self.view_manager else None) or 1
+        focus = self.view_manager.focus_index if self.view_manager else 0
+        shown = {sid: idx for idx, sid in self._cell_assign.items()}
+        for sid, peer in list(self.peers.items()):
+            # 아직 아무 셀 배정이 없으면(첫 sender 표시 전) 모두 디코딩
+            visible = DECODE_HIDDEN_SENDERS or not self._cell_assign or sid in shown
+            cell_size = self._cell_pixel_size(shown[sid], mode) if sid in shown else None
+            size = cell_size if SCALE_TO_CELL else None
+            ui_commands.post(sid, OP_VISIBLE, peer.set_visible, visible)
+            ui_commands.post(sid, OP_RENDER_SIZE, peer.set_render_size, *(size or (0, 0)))
+            if SENDER_ENCODING_CONTROL:
+                enc = self._encoding_for(visible, cell_size,
+                                         shown.get(sid) == focus or len(shown) <= 1)
+                ui_commands.post(sid, OP_ENCODING, peer.set_encoding, enc)
+
+    def sender_in_cell(self, cell_index: int):
+        return self._cell_assign.get(cell_index)
+
+    def assign_sender_to_cell(self, cell_index: int, sender_id: str, reason: str = "assign"):
+        """특정 셀에 sender 배정 (reason: 키프레임 → 첫 화면 지연 기록용 "assign"/"switch")"""
+        if not (0 <= cell_index):
+            return
+        if sender_id not in self.peers:
+            # 아직 협상 대기 중 → 앞으로 당기고 PeerReceiver 생성 후 배정
+            if self.negotiations.is_pending(sender_id):
+                for sid, idx in list(self._deferred_assign.items()):
+                    if idx == cell_index:
+                        self._deferred_assign.pop(sid)
+                self._deferred_assign[sender_id] = cell_index
+                self.negotiations.bump(sender_id, PRIORITY_ASSIGNED)
             return
         target = self.peers[sender_id]
 
+        # 이미 같은 셀에 표시 중이면 위젯/오버레이를 건드리지 않음 (깜빡임 방지)
+        if self._cell_assign.get(cell_index) == sender_id:
+            return
+
         # 동일 sender가 다른 셀에 있으면 제거
         for idx, sid in list(self._cell_assign.items()):
             if sid == sender_id and idx != cell_index:
-                try:
-                    if self.view_manager and 0 <= idx < len(self.view_manager.cells):
-                        self.view_manager.cells[idx].clear()
-                except Exception:
-                    pass
-                self._cell_assign.pop(idx, None)
+                self.release_cell(idx)
 
         # 해당 셀의 이전 매핑 제거
         prev_sid = self._cell_assign.get(cell_index)
         if prev_sid and prev_sid != sender_id:
             self._cell_assign.pop(cell_index, None)
 
+        # 컴포지터 모드: 위젯 재배치 없이 pad 좌표만 갱신
+        if self.compositor:
+            self._cell_assign[cell_index] = sender_id
+            self._sync_compositor()
+            self._schedule_visibility_refresh()
+            target.notify_next_frame(self._on_cell_frame)
+            GLib.idle_add(target.request_clean_frame, reason)
+            return
+
         # UI 스레드에서 위젯 배치
         def _ensure_and_put():
             w = self.ui.ensure_widget(sender_id, target.sender_name)
@@ -98,19 +272,26 @@ class MultiReceiverManager:
                 if not w.isVisible():
                     w.show()
 
-                GLib.idle_add(target.update_window_from_widget, w)
+                # 창 핸들 갱신 → (UI_OVERLAY_DELAY_MS 뒤) 재생 + 키프레임 요청.
+                # 오버레이 재연결은 resume_pipeline이 예약, 같은 sender의 중복 명령은 병합됨
+                ui_commands.post(sender_id, OP_WINDOW, target.update_window_from_widget, w)
 
-                from config import UI_OVERLAY_DELAY_MS
                 def _rebind():
-                    target.resume_pipeline()       # 항상 재생
-                    target._force_overlay_handle()
-                    return False
-                GLib.timeout_add(UI_OVERLAY_DELAY_MS, _rebind)
+                    target.resume_pipeline(reason)
+                    target.notify_next_frame(self._on_cell_frame)
+                ui_commands.post(sender_id, OP_PLAY, _rebind, delay_ms=UI_OVERLAY_DELAY_MS)
             return False
         GLib.idle_add(_ensure_and_put)
 
         # 매핑 갱신
         self._cell_assign[cell_index] = sender_id
+        self._schedule_visibility_refresh()
+
+    def _on_cell_frame(self, sender_id: str):
+        """배정 후 첫 프레임 도착 (스트리밍 스레드) → 레이아웃 전환 완료 집계"""
+        ms = metrics.complete("layout/switch→all-cells-video", sender_id)
+        if ms is not None:
+            print(f"[METRICS] layout switch complete: {ms:.0f} ms")
 
     # ----- 소켓 연결 -----
     def _sio_connect(self):
@@ -121,199 +302,390 @@ class MultiReceiverManager:
             print("[SIO] connect error:", e)
 
     def _bind_socket_events(self):
+        """socket.io 스레드: 이벤트는 명령으로만 넣고 상태 변경은 메인 루프에서"""
+        send = self.actor.send
+
+        def _sid(data):
+            return data.get('id') or data.get('senderId') or data.get('from')
+
         @self.sio.event
         def connect():
             print("[SIO] connected:", self.sio.sid)
+            send(Connected())
             self.sio.emit('join-room',
-                          {'role':'receiver', 'name':RECEIVER_NAME},
-                          callback=lambda ack: print("[SIO] join-room ack:", ack))
+                          {'role':'receiver', 'name':RECEIVER_NAME, 'room':ROOM_ID,
+                           'caps': {'senderDeltas': True}},
+                          callback=self._on_join_ack)
 
         @self.sio.on('sender-list')
         def on_sender_list(sender_arr):
+            # 델타를 지원하지 않는 서버: 매번 전체 목록
             print("[SIO] sender-list:", sender_arr)
-            if not sender_arr:
-                return
-
-            if not self.ui._first_sender_connected:
-                self.ui._first_sender_connected = True
-                QtCore.QTimer.singleShot(0, self.ui.enter_sender_mode)
-
-            for s in sender_arr:
-                sid = s.get('id')
-                name = s.get('name', sid)
-                if sid in self.peers:
-                    if sid not in self._order:
-                        self._order.append(sid)
-                    continue
-
-                GLib.idle_add(self.ui.ensure_widget, sid, name)
-
-                peer = PeerReceiver(
-                    self.sio, sid, name, self.ui,
-                    on_ready=None,
-                    on_down=lambda x, reason="ice", **_: self._remove_sender(x, reason=reason)
-                )
-                self.peers[sid] = peer
-                if sid not in self._order:
-                    self._order.append(sid)
+            send(SenderList(sender_arr or []))
 
-                GLib.idle_add(peer.prepare_window_handle)
+        @self.sio.on('sender-added')
+        def on_sender_added(data):
+            send(SenderDelta('added', data))
 
-                peer.start()
-                GLib.idle_add(lambda p=peer: (p._ensure_transceivers(), p._maybe_create_offer()))
+        @self.sio.on('sender-removed')
+        def on_sender_removed(data):
+            send(SenderDelta('removed', data))
 
-                self.sio.emit('share-request', {'to': sid})
-                print(f"[SIO] share-request → {sid} ({name})")
-                
-                self._notify_mqtt_change()  
+        @self.sio.on('sender-renamed')
+        def on_sender_renamed(data):
+            send(SenderDelta('renamed', data))
 
         @self.sio.on('sender-share-started')
         def on_sender_share_started(data):
-            sid  = data.get('id') or data.get('senderId') or data.get('from')
-            name = data.get('name')
-            if not sid:
-                return
-
-            if sid not in self.peers:
-                _qt(lambda: self.ui.ensure_widget(sid, name or sid))
-                peer = PeerReceiver(
-                    self.sio, sid, name or sid, self.ui,
-                    on_ready=None,
-                    on_down=lambda x, reason="ice", **_: self._remove_sender(x, reason=reason)
-                )
-                self.peers[sid] = peer
-                if sid not in self._order:
-                    self._order.append(sid)
-                _qt(peer.prepare_window_handle)
-                peer.start()
-                _qt(lambda p=peer: (p._ensure_transceivers(), p._maybe_create_offer()))
-
-            peer = self.peers[sid]
-
-            if not self._cell_assign:
-                def _show_now():
-                    w = self.ui.ensure_widget(sid, name or peer.sender_name)
-                    if w and not w.isVisible():
-                        w.show()
-                    self.ui.set_active_sender_name(sid, name or peer.sender_name)
-                    peer.update_window_from_widget(w)
-                    peer.resume_pipeline()  # 항상 PLAYING
-                _qt(_show_now)
-
-                def _enter_single_mode_and_assign():
-                    if self.view_manager and self.view_manager.mode != 1:
-                        self.view_manager.set_mode(1)
-                    def _try_assign():
-                        if not self.view_manager or not self.view_manager.cells:
-                            QtCore.QTimer.singleShot(0, _try_assign)
-                            return
-                        self.assign_sender_to_cell(0, sid)
-                    QtCore.QTimer.singleShot(0, _try_assign)
-
-                QtCore.QTimer.singleShot(50, _enter_single_mode_and_assign)
-            else:
-                peer.resume_pipeline()  # 항상 재생
-
-            print(f"[SIO] sender-share-started: {peer.sender_name}")
+            sid = _sid(data)
+            if sid:
+                send(ShareStarted(sid, data.get('name')))
 
         @self.sio.on('sender-share-stopped')
         def on_sender_share_stopped(data):
-            sid = data.get('id') or data.get('senderId') or data.get('from')
-            if not sid: 
-                return
-            peer = self.peers.get(sid)
-            if not peer:
-                return
-
-            # 더 이상 pause하지 않음
-
-            for idx, s in list(self._cell_assign.items()):
-                if s == sid:
-                    try:
-                        if self.view_manager and 0 <= idx < len(self.view_manager.cells):
-                            self.view_manager.cells[idx].clear()
-                    except Exception:
-                        pass
-                    self._cell_assign.pop(idx, None)
-
-            GLib.idle_add(self.ui.remove_sender_widget, sid)
-            print(f"[SIO] sender-share-stopped: {peer.sender_name}")
+            sid = _sid(data)
+            if sid:
+                send(ShareStopped(sid))
 
         @self.sio.on('signal')
         def on_signal(data):
-            typ, frm, payload = data.get('type'), data.get('from'), data.get('payload')
-            print("[SIO] signal recv:", typ, "from", frm)
-            if typ in ('bye', 'hangup', 'close'):
-                if frm:
-                    self._remove_sender(frm, reason=typ)
-                return
-
-            if not frm or frm not in self.peers:
-                print("[SIO] unknown sender in signal:", frm); return
-            peer = self.peers[frm]
-
-            if typ == 'answer' and payload:
-                sdp_text = payload['sdp'] if isinstance(payload, dict) else payload
-                GLib.idle_add(peer.apply_remote_answer, sdp_text)
-            elif typ == 'candidate' and payload:
-                cand  = payload.get('candidate')
-                mline = int(payload.get('sdpMLineIndex') or 0)
-                if cand is not None:
-                    GLib.idle_add(peer.webrtc.emit, 'add-ice-candidate', mline, cand)
+            print("[SIO] signal recv:", data.get('type'), "from", data.get('from'))
+            send(Signal(data))
 
         @self.sio.on('remove-sender')
         def on_remove_sender(sid):
-            if not sid: return
-            self._remove_sender(sid, reason="server-remove")
+            if sid:
+                send(RemoveSender(sid, "server-remove"))
 
         @self.sio.on('sender-disconnected')
         def on_sender_disconnected(data):
-            sid = data.get('id') or data.get('senderId') or data.get('from')
+            sid = _sid(data)
             if sid:
-                self._remove_sender(sid, reason="disconnected")
+                send(RemoveSender(sid, "disconnected"))
 
         @self.sio.on('sender-left')
         def on_sender_left(data):
-            sid = data.get('id') or data.get('senderId') or data.get('from')
+            sid = _sid(data)
             if sid:
-                self._remove_sender(sid, reason="left")
+                send(RemoveSender(sid, "left"))
 
         @self.sio.on('room-deleted')
         def on_room_deleted(_=None):
             print("[SIO] room-deleted → all cleanup")
-            for sid in list(self.peers.keys()):
-                self._remove_sender(sid, reason="room-deleted")
+            send(RemoveAll("room-deleted"))
 
-    def _remove_sender(self, sid: str, reason: str = ""):
-        if sid not in self.peers:
+    # ----- 상태 명령 처리 (메인 루프) -----
+    def _on_connected(self, _cmd):
+        self._sender_seq = None   # (재)접속: 스냅샷부터 다시
+        self._pending_deltas.clear()
+
+    def _on_share_started(self, cmd):
+        sid, name = cmd.sender_id, cmd.name
+        if sid not in self.peers and not self.negotiations.is_pending(sid):
+            self._create_peer(sid, name or sid)
+
+        peer = self.peers.get(sid)   # 협상 대기 중이면 None
+        name = name or (peer.sender_name if peer else sid)
+
+        if not self._cell_assign:
+            if not self.compositor:
+                w = self.ui.ensure_widget(sid, name)
+                if w and not w.isVisible():
+                    w.show()
+                self.ui.set_active_sender_name(sid, name)
+                if peer:
+                    ui_commands.post(sid, OP_WINDOW, peer.update_window_from_widget, w)
+                    ui_commands.post(sid, OP_PLAY, peer.resume_pipeline)  # 항상 PLAYING
+
+            def _enter_single_mode_and_assign():
+                if self.view_manager and self.view_manager.mode != 1:
+                    self.view_manager.set_mode(1)
+                def _try_assign():
+                    if not self.view_manager or not self.view_manager.cells:
+                        QtCore.QTimer.singleShot(0, _try_assign)
+                        return
+                    self.assign_sender_to_cell(0, sid)
+                QtCore.QTimer.singleShot(0, _try_assign)
+
+            QtCore.QTimer.singleShot(50, _enter_single_mode_and_assign)
+        elif peer:
+            ui_commands.post(sid, OP_PLAY, peer.resume_pipeline)  # 항상 재생
+
+        print(f"[SIO] sender-share-started: {name}")
+
+    def _on_share_stopped(self, cmd):
+        sid = cmd.sender_id
+        peer = self.peers.get(sid)
+        if not peer:
             return
-        name = self.peers[sid].sender_name
-        print(f"[CLEANUP] remove sender {name} ({reason})")
-        peer = self.peers.pop(sid, None)
+
+        # 더 이상 pause하지 않음 (정지 감시만 멈춤)
+        peer.share_active = False
+
+        for idx, s in list(self._cell_assign.items()):
+            if s == sid:
+                self.release_cell(idx)
+        self._sync_compositor()
+        self._schedule_visibility_refresh()
+
+        self.ui.remove_sender_widget(sid)
+        print(f"[SIO] sender-share-stopped: {peer.sender_name}")
+
+    def _on_signal(self, cmd):
+        data = cmd.data
+        typ, frm, payload = data.get('type'), data.get('from'), data.get('payload')
+        if typ in ('bye', 'hangup', 'close'):
+            if frm:
+                self._remove_sender(frm, reason=typ)
+            return
+
+        if not frm or frm not in self.peers:
+            print("[SIO] unknown sender in signal:", frm); return
+        peer = self.peers[frm]
+
+        if typ == 'answer' and payload:
+            sdp_text = payload['sdp'] if isinstance(payload, dict) else payload
+            peer.apply_remote_answer(sdp_text, data.get('caps'))
+        elif typ == 'candidate' and payload:
+            cand  = payload.get('candidate')
+            mline = int(payload.get('sdpMLineIndex') or 0)
+            if cand is not None:
+                peer.webrtc.emit('add-ice-candidate', mline, cand)
+        elif typ == 'candidates' and payload:
+            peer.add_remote_candidates(payload.get('candidates') or [])
+
+    def _on_remove_all(self, cmd):
+        for sid in list(self.peers.keys()):
+            self._remove_sender(sid, reason=cmd.reason)
+
+    # ----- sender 목록 동기화 -----
+    def _on_join_ack(self, ack):
+        print("[SIO] join-room ack:", {k: v for k, v in (ack or {}).items() if k != 'snapshot'})
+        snapshot = (ack or {}).get('snapshot')
+        if snapshot is not None:
+            self.actor.send(Snapshot(snapshot))
+
+    def _request_snapshot(self, reason="delta gap"):
+        """순번 누락 → 서버에 전체 목록 재요청 (응답이 없으면 SENDER_SNAPSHOT_TIMEOUT_MS 뒤 재시도)"""
+        print(f"[SIO] sender {reason} → snapshot 요청")
+        self._arm_snapshot_timeout()
         try:
-            if peer:
-                peer.stop()
-        except:
-            pass
+            self.sio.emit('sender-snapshot', {},
+                          callback=lambda snapshot: self.actor.send(Snapshot(snapshot)))
+        except Exception as e:
+            print("[SIO] snapshot 요청 실패:", e)
+
+    def _arm_snapshot_timeout(self):
+        if self._snapshot_timer is None:
+            self._snapshot_timer = GLib.timeout_add(SENDER_SNAPSHOT_TIMEOUT_MS,
+                                                    self._on_snapshot_timeout)
+
+    def _cancel_snapshot_timeout(self):
+        if self._snapshot_timer is not None:
+            GLib.source_remove(self._snapshot_timer)
+            self._snapshot_timer = None
+
+    def _on_snapshot_timeout(self):
+        """스냅샷(join ack / sender-snapshot 응답)이 오지 않아 델타가 계속 보류됨 → 재요청"""
+        self._snapshot_timer = None
+        if self._sender_seq is None and self.sio.connected:
+            self._request_snapshot(f"snapshot timeout ({len(self._pending_deltas)} deltas held)")
+        return False
+
+    def _apply_snapshot(self, snapshot):
+        """스냅샷으로 전체 동기화 후, 스냅샷 이후 순번의 보류 델타 적용"""
+        if not snapshot:
+            return
+        self._cancel_snapshot_timeout()
+        self._reconcile_senders(snapshot.get('senders') or [])
+        self._sender_seq = int(snapshot.get('seq') or 0)
+        pending = sorted(self._pending_deltas, key=lambda d: d[1].get('seq', 0))
+        self._pending_deltas.clear()
+        for kind, data in pending:
+            if int(data.get('seq') or 0) > self._sender_seq:
+                self._on_sender_delta(kind, data)
+
+    def _on_sender_delta(self, kind: str, data: dict):
+        """순번이 이어지는 델타만 적용 (O(변경 수)), 누락이 있으면 스냅샷으로 복구"""
+        seq = int(data.get('seq') or 0)
+        if self._sender_seq is None:
+            # 스냅샷 대기 중 → 보류 (스냅샷이 오지 않으면 타이머가 재요청)
+            self._pending_deltas.append((kind, data))
+            self._arm_snapshot_timeout()
+            return
+        if seq <= self._sender_seq:
+            return   # 이미 반영됨 (스냅샷에 포함)
+        if seq != self._sender_seq + 1:
+            self._sender_seq = None
+            self._pending_deltas.append((kind, data))
+            self._request_snapshot()
+            return
+        self._sender_seq = seq
+
+        sid, name = data.get('id'), data.get('name')
+        if not sid:
+            return
+        print(f"[SIO] sender-{kind} #{seq}: {sid} {name or ''}")
+        if kind == 'added':
+            self._add_sender(sid, name or sid)
+        elif kind == 'removed':
+            self._remove_sender(sid, reason="removed")
+        elif kind == 'renamed':
+            self._rename_sender(sid, name)
+
+    def _reconcile_senders(self, sender_arr):
+        """전체 목록 기준 동기화: 새 sender 추가, 목록에 없는 피어 정리"""
+        listed = {s.get('id'): s.get('name', s.get('id')) for s in sender_arr if s.get('id')}
+        known = list(self.peers) + [sid for sid, _ in self.negotiations.queued_names()]
+        for sid in [sid for sid in known if sid not in listed]:
+            self._remove_sender(sid, reason="stale")
+        for sid, name in listed.items():
+            if sid in self.peers:
+                if sid not in self._order:
+                    self._order.append(sid)
+                if name and self.peers[sid].sender_name != name:
+                    self._rename_sender(sid, name)
+                continue
+            self._add_sender(sid, name)
+
+    def _add_sender(self, sid: str, name: str):
+        if sid in self.peers or self.negotiations.is_pending(sid):
+            return
+        if not self.ui._first_sender_connected:
+            self.ui._first_sender_connected = True
+            QtCore.QTimer.singleShot(0, self.ui.enter_sender_mode)
+
+        self._create_peer(sid, name)
+
+        self.sio.emit('share-request', {'to': sid})
+        metrics.mark(sid, "share-request")
+        print(f"[SIO] share-request → {sid} ({name})")
+
+        self._notify_mqtt_change()
+
+    def _rename_sender(self, sid: str, name: str):
+        peer = self.peers.get(sid)
+        if not peer or not name or peer.sender_name == name:
+            return
+        peer.sender_name = name
+        _qt(lambda: self.ui.set_sender_name(sid, name))
+        self._notify_mqtt_change()
+
+    def _create_peer(self, sid: str, name: str):
+        """sender 위젯을 준비하고 협상 대기열에 추가 (PeerReceiver는 차례가 되면 생성)"""
+        GLib.idle_add(self.ui.ensure_widget, sid, name)
+        if sid not in self._order:
+            self._order.append(sid)
+        priority = PRIORITY_ASSIGNED if sid in self._deferred_assign else PRIORITY_NORMAL
+        self.negotiations.submit(sid, name, priority)
+
+    def _start_negotiation(self, sid: str, name: str):
+        """(스케줄러, 메인 루프) PeerReceiver 생성 후 협상 시작 (풀에 대기 슬롯이 있으면 재사용)"""
+        # 콜백은 자기 피어를 함께 보냄 (같은 sid로 재구성된 뒤 옛 피어의 알림은 _is_stale로 무시)
+        peer = PeerReceiver(
+            self.sio, sid, name, self.ui,
+            on_ready=lambda x: self.actor.send(NegotiationDone(x, peer=peer)),
+            on_down=lambda x, reason="ice", rebuild=False, **_:
+                self.actor.send(RemoveSender(x, reason, rebuild, peer=peer)),
+            compositor=self.compositor,
+            slot=self.pool.acquire(),
+            latency_profile=SENDER_LATENCY_PROFILES.get(name, DEFAULT_LATENCY_PROFILE)
+        )
+        self.peers[sid] = peer
+        if sid not in self._order:
+            self._order.append(sid)
+        if self.compositor:
+            GLib.idle_add(lambda: self.compositor.attach(sid) or False)
+
+        GLib.idle_add(peer.prepare_window_handle)
+
+        peer.start()
+        GLib.idle_add(lambda p=peer: (p._ensure_transceivers(), p._maybe_create_offer()))
+
+        # 대기 중에 들어온 셀 배정 반영
+        idx = self._deferred_assign.pop(sid, None)
+        if idx is not None:
+            self.assign_sender_to_cell(idx, sid)
+        else:
+            self._schedule_visibility_refresh()
+        return peer
+
+    def set_latency_profile(self, sid: str, profile: str):
+        """sender별 지연 프로파일 변경 (MQTT stream/profile 등 외부 요청, 어느 스레드에서든)"""
+        self.actor.send(SetLatencyProfile(sid, profile))
+
+    def _set_latency_profile(self, sid: str, profile: str):
+        peer = self.peers.get(sid)
+        if peer:
+            peer.set_latency_profile(profile)
+
+    def _is_stale(self, cmd):
+        """정리 중인(이미 교체된) 피어가 보낸 명령인지: 재구성 직후 옛 webrtcbin의
+        ICE closed 알림이 같은 sid의 새 피어를 지우지 않도록"""
+        if cmd.peer is not None and self.peers.get(cmd.sender_id) is not cmd.peer:
+            print(f"[ACTOR] ignore {type(cmd).__name__} from stale peer {cmd.sender_id}")
+            return True
+        return False
+
+    def _on_negotiation_done(self, cmd):
+        if not self._is_stale(cmd):
+            self.negotiations.finish(cmd.sender_id, cmd.ok)
+
+    def _on_remove_sender(self, cmd):
+        if self._is_stale(cmd):
+            return
+        if cmd.rebuild:
+            self._rebuild_sender(cmd.sender_id, cmd.reason)
+        else:
+            self._remove_sender(cmd.sender_id, reason=cmd.reason)
+
+    def _rebuild_sender(self, sid: str, reason: str):
+        """같은 webrtcbin으로 복구할 수 없을 때: 피어를 정리하고 새 파이프라인으로 다시 협상
+        (표시 중이던 셀은 협상 후 다시 배정)"""
+        peer = self.peers.get(sid)
+        if not peer:
+            return
+        name = peer.sender_name
+        cells = [idx for idx, s in self._cell_assign.items() if s == sid]
+        self._remove_sender(sid, reason=reason, rebuilding=True)
+        if cells:
+            self._deferred_assign[sid] = cells[0]
+        self._add_sender(sid, name)
+
+    def _remove_sender(self, sid: str, reason: str = "", rebuilding: bool = False):
+        pending = self.negotiations.is_pending(sid)
+        if sid not in self.peers and not pending:
+            return
+        self.negotiations.cancel(sid)
+        self._deferred_assign.pop(sid, None)
+        peer = self.peers.pop(sid, None)
+        name = peer.sender_name if peer else sid
+        print(f"[CLEANUP] remove sender {name} ({reason})")
+        ui_commands.cancel(sid)   # 정리 중인 피어에 대기 명령이 실행되지 않도록
+        if peer:
+            peer.cancel_timers()
+            self.teardown.submit(name, lambda: self._teardown_peer(peer))
 
         for idx, s in list(self._cell_assign.items()):
             if s == sid:
-                try:
-                    if self.view_manager and 0 <= idx < len(self.view_manager.cells):
-                        self.view_manager.cells[idx].clear()
-                except Exception:
-                    pass
-                self._cell_assign.pop(idx, None)
+                self.release_cell(idx)
 
         try:
             self._order.remove(sid)
         except ValueError:
             pass
+        self._schedule_visibility_refresh()
+
+        if self.compositor:
+            self._sync_compositor()
+            GLib.idle_add(lambda: self.compositor.detach(sid) or False)
 
         GLib.idle_add(self.ui.remove_sender_widget, sid)
+        if rebuilding:
+            return
         self._notify_mqtt_change()     
 
-        if not self.peers:
+        if not self.peers and not self.negotiations.queued_names():
             def _reset_to_landing():
                 self.ui._main.setCurrentIndex(0)
                 self.ui._stack.setCurrentWidget(self.ui._landing)
@@ -322,6 +694,12 @@ class MultiReceiverManager:
             QtCore.QTimer.singleShot(0, _reset_to_landing)
 
 
+    def _teardown_peer(self, peer):
+        """작업 스레드: 파이프라인 NULL 전환만 (막히는 부분), 핸들러 해제/풀 반납은 메인 루프에서"""
+        peer.stop()
+        GLib.idle_add(lambda: self.pool.release(peer) or False)
+
+
 # ---------- 상태 조회 메서드들 ----------
     
     def _notify_mqtt_change(self):
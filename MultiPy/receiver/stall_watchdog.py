@@ -0,0 +1,158 @@
+# stall_watchdog.py
+# 수신 스트림 정지(프리즈) 감시
+#
+# 디코더 입력과 싱크 입력 pad에 one-shot BUFFER probe를 걸어 두고, 메인 루프
+# tick마다 probe가 불렸으면 그 시각을 기록하고 다시 건다. 버퍼마다 Python이
+# 실행되지 않고 pad당 tick 한 번이면 충분하다.
+#
+# 화면 공유 sender는 화면이 그대로면 프레임(RTP)을 보내지 않으므로, 싱크에 버퍼가 없는
+# 것만으로는 정지가 아니다. RTP 수신 수(webrtcbin get-stats)가 STALL_PACKET_WINDOW_MS 안에
+# 늘었는데 싱크에 STALL_TIMEOUT_MS 동안 버퍼가 없을 때만 정지로 판단:
+#   1) force-key-unit(→ PLI) 요청, STALL_KEYFRAME_INTERVAL_MS마다 반복
+#   2) STALL_ESCALATE_MS가 지나도 그대로면 재협상(offer) 한 번
+# 정지 중에 패킷도 멈추면 sender가 쉬는 것으로 보고 에스컬레이션 없이 정지 상태를 푼다.
+# 다시 버퍼가 도착하면 복구 시간을 stall/recovered(keyframe|renegotiate)로 기록한다.
+# 패킷은 오는데 디코더 입력이 없으면 "no-frames"(프레임 조립 실패),
+# 디코더 입력은 있는데 출력이 없으면 "decoder"로 구분한다.
+
+import threading
+import time
+
+from gi.repository import Gst, GLib
+from latency_metrics import metrics
+from config import (STALL_CHECK_INTERVAL_MS, STALL_TIMEOUT_MS, STALL_PACKET_WINDOW_MS,
+                    STALL_KEYFRAME_INTERVAL_MS, STALL_ESCALATE_MS)
+
+
+class _PadWatch:
+    """pad 하나의 마지막 버퍼 시각 (one-shot probe를 tick마다 다시 건다)"""
+
+    def __init__(self, pad):
+        self.pad = pad
+        self.last = time.monotonic()
+        self._hit = None
+        self._probe_id = None
+        self._lock = threading.Lock()
+
+    def _on_buffer(self, _pad, _info):
+        with self._lock:
+            self._hit = time.monotonic()
+            self._probe_id = None
+        return Gst.PadProbeReturn.REMOVE
+
+    def poll(self):
+        """probe가 불렸으면 시각 반영 후 다시 건다 → 마지막 버퍼 시각"""
+        with self._lock:
+            if self._hit is not None:
+                self.last, self._hit = self._hit, None
+            if self._probe_id is None:
+                self._probe_id = self.pad.add_probe(Gst.PadProbeType.BUFFER, self._on_buffer)
+        return self.last
+
+    def touch(self):
+        """감시 재개 시 유예 (지금 버퍼를 받은 것으로 간주)"""
+        self.last = time.monotonic()
+
+    def remove(self):
+        with self._lock:
+            if self._probe_id is not None:
+                self.pad.remove_probe(self._probe_id)
+                self._probe_id = None
+
+
+class StallWatchdog:
+    def __init__(self, name, decoder_pad, sink_pad, packets_received, is_active,
+                 request_keyframe, renegotiate):
+        """
+        Args:
+            name: 로그용 sender 이름
+            decoder_pad: 디코더 sink pad (패킷이 디코더까지 오는지)
+            sink_pad: 렌더링 싱크 sink pad (디코딩된 프레임이 나오는지)
+            packets_received: 누적 RTP 수신 패킷 수 (패킷이 오는 중인지)
+            is_active: 감시할 상태인지 (표시 중, 재생 중, ICE 복구 중 아님)
+            request_keyframe / renegotiate: 단계별 복구 동작 (메인 루프에서 호출)
+        """
+        self.name = name
+        self._decoder = _PadWatch(decoder_pad)
+        self._sink = _PadWatch(sink_pad)
+        self._packets_received = packets_received
+        self._packet_count = packets_received()
+        self._last_packet = time.monotonic()
+        self._is_active = is_active
+        self._request_keyframe = request_keyframe
+        self._renegotiate = renegotiate
+        self._stall = None       # {"t0", "reason", "last_kf", "escalated"}
+        self.stall_count = 0
+        self._timer = GLib.timeout_add(STALL_CHECK_INTERVAL_MS, self._tick)
+
+    def stop(self):
+        if self._timer:
+            GLib.source_remove(self._timer)
+            self._timer = None
+        self._decoder.remove()
+        self._sink.remove()
+        self._stall = None
+
+    def _tick(self):
+        now = time.monotonic()
+        last_in = self._decoder.poll()
+        last_out = self._sink.poll()
+        packets_flowing = self._poll_packets(now)
+
+        if not self._is_active():
+            # 숨김/일시정지/ICE 복구 중에는 판단하지 않고 재개 시점부터 다시 셈
+            self._decoder.touch()
+            self._sink.touch()
+            self._stall = None
+            return True
+
+        st = self._stall
+        if st:
+            if last_out > st["t0"]:
+                self._recovered(now)
+            elif not packets_flowing:
+                # 패킷도 멈춤 → 정지 화면 공유(sender 유휴), 재협상하지 않음
+                self._stall = None
+                print(f"[STALL][{self.name}] packets stopped → sender idle, stall cleared")
+            else:
+                self._escalate(now)
+            return True
+
+        if packets_flowing and (now - last_out) * 1000.0 >= STALL_TIMEOUT_MS:
+            reason = "no-frames" if (now - last_in) * 1000.0 >= STALL_TIMEOUT_MS else "decoder"
+            self.stall_count += 1
+            self._stall = {"t0": now, "reason": reason, "last_kf": now, "escalated": False}
+            print(f"[STALL][{self.name}] no frame for {(now - last_out) * 1000.0:.0f} ms "
+                  f"({reason}, #{self.stall_count}) → keyframe request")
+            self._request_keyframe()
+        return True
+
+    def _poll_packets(self, now):
+        """RTP 수신 수가 STALL_PACKET_WINDOW_MS 안에 늘었는지"""
+        try:
+            count = self._packets_received()
+        except Exception:
+            count = self._packet_count
+        if count != self._packet_count:
+            self._packet_count = count
+            self._last_packet = now
+        return (now - self._last_packet) * 1000.0 < STALL_PACKET_WINDOW_MS
+
+    def _escalate(self, now):
+        st = self._stall
+        elapsed_ms = (now - st["t0"]) * 1000.0
+        if not st["escalated"] and elapsed_ms >= STALL_ESCALATE_MS:
+            st["escalated"] = True
+            print(f"[STALL][{self.name}] still frozen after {elapsed_ms:.0f} ms → renegotiate")
+            self._renegotiate()
+        elif (now - st["last_kf"]) * 1000.0 >= STALL_KEYFRAME_INTERVAL_MS:
+            st["last_kf"] = now
+            self._request_keyframe()
+
+    def _recovered(self, now):
+        st, self._stall = self._stall, None
+        ms = (now - st["t0"]) * 1000.0
+        how = "renegotiate" if st["escalated"] else "keyframe"
+        metrics.record(f"stall/recovered ({how})", ms)
+        metrics.record(f"stall/{st['reason']}", ms)
+        print(f"[STALL][{self.name}] recovered in {ms:.0f} ms via {how} ({st['reason']})")
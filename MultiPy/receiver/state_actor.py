@@ -0,0 +1,147 @@
+# state_actor.py
+# 수신기 상태 변경 명령 큐 (메인 루프 단일 스레드 처리)
+#
+# MultiReceiverManager의 peers / _order / _cell_assign은 socket.io 클라이언트 스레드,
+# paho MQTT 스레드, GStreamer/GLib 콜백에서 동시에 바뀌거나 읽혀 join/leave가 몰리면
+# 가끔 충돌했다. 다른 스레드는 상태를 직접 건드리지 않고 타입이 있는 명령을 send()로
+# 넣기만 하고, 명령은 메인 루프(GLib 기본 컨텍스트 = Qt 메인 스레드) idle에서
+# 들어온 순서대로 처리한다. 한 idle에 STATE_QUEUE_BATCH개까지 처리하고 남으면 다음 idle로.
+# 큐 대기 시간은 actor/queue-wait, 명령별 처리 시간은 actor/<명령 이름>으로 기록한다.
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from gi.repository import GLib
+from latency_metrics import metrics
+
+
+# ----- 명령 -----
+@dataclass(frozen=True)
+class Connected:
+    """시그널링 서버 (재)접속 → 스냅샷부터 다시"""
+
+
+@dataclass(frozen=True)
+class SenderList:
+    """델타 미지원 서버의 전체 sender 목록"""
+    senders: list
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """join-room ack / sender-snapshot 응답"""
+    snapshot: dict
+
+
+@dataclass(frozen=True)
+class SenderDelta:
+    kind: str           # "added" / "removed" / "renamed"
+    data: dict
+
+
+@dataclass(frozen=True)
+class ShareStarted:
+    sender_id: str
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ShareStopped:
+    sender_id: str
+
+
+@dataclass(frozen=True)
+class Signal:
+    """sender → receiver 시그널 (answer / candidate(s) / bye)"""
+    data: dict
+
+
+@dataclass(frozen=True)
+class NegotiationDone:
+    """협상 완료(첫 ICE 연결) → 스케줄러 슬롯 반환, 다음 협상 시작"""
+    sender_id: str
+    ok: bool = True
+    peer: Any = None        # 보낸 PeerReceiver (이미 교체된 피어의 늦은 알림이면 무시)
+
+
+@dataclass(frozen=True)
+class RemoveSender:
+    sender_id: str
+    reason: str = ""
+    rebuild: bool = False   # 정리 후 새 파이프라인으로 다시 협상 (같은 셀 유지)
+    peer: Any = None        # PeerReceiver 콜백에서 보낸 경우 그 피어 (NegotiationDone과 같음)
+
+
+@dataclass(frozen=True)
+class RemoveAll:
+    reason: str = ""
+
+
+@dataclass(frozen=True)
+class SetLatencyProfile:
+    sender_id: str
+    profile: str
+
+
+@dataclass(frozen=True)
+class Query:
+    """메인 루프에서 fn()으로 상태를 읽고 reply(결과) 호출 (다른 스레드의 조회용)"""
+    fn: Callable[[], Any]
+    reply: Callable[[Any], None] = field(default=lambda _result: None)
+
+
+# ----- 큐 -----
+class StateActor:
+    def __init__(self, handlers, batch=64):
+        """
+        Args:
+            handlers: {명령 타입: handler(cmd)} — 메인 루프에서 호출
+            batch: 한 idle에 처리할 최대 명령 수
+        """
+        self._handlers = dict(handlers)
+        self._handlers.setdefault(Query, lambda cmd: cmd.reply(cmd.fn()))
+        self.batch = max(1, int(batch))
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._drain_pending = False
+        self._max_depth = 0
+
+    def send(self, cmd):
+        """명령 추가 (어느 스레드에서든 호출 가능)"""
+        if type(cmd) not in self._handlers:
+            raise TypeError(f"unknown state command: {type(cmd).__name__}")
+        self._queue.put((cmd, time.monotonic()))
+        with self._lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        GLib.idle_add(self._drain)
+
+    def status(self):
+        with self._lock:
+            return {"queue_depth": self._queue.qsize(), "max_depth": self._max_depth}
+
+    def _drain(self):
+        for _ in range(self.batch):
+            try:
+                cmd, t_enqueue = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            name = type(cmd).__name__
+            t0 = time.monotonic()
+            metrics.record("actor/queue-wait", (t0 - t_enqueue) * 1000.0)
+            try:
+                self._handlers[type(cmd)](cmd)
+            except Exception as e:
+                print(f"[ACTOR] {name} 처리 실패:", e)
+            metrics.record(f"actor/{name}", (time.monotonic() - t0) * 1000.0)
+
+        with self._lock:
+            if self._queue.empty():
+                self._drain_pending = False
+                return False
+        return True   # 남은 명령은 다음 idle에
@@ -0,0 +1,74 @@
+# stats_collector.py
+# webrtcbin get-stats 기반 수신 통계 수집 (버퍼 단위 Python 콜백 없음)
+
+import time
+
+import gi
+
+gi.require_version('Gst', '1.0')
+
+from gi.repository import Gst
+
+_INBOUND = "rtp-inbound-stream-stats"
+_JITTERBUFFER = "gst-rtpjitterbuffer-stats"
+
+
+def _field(s, name, default=0):
+    return s.get_value(name) if s.has_field(name) else default
+
+
+class RtpStatsCollector:
+    """타이머에서 get-stats promise를 요청해 바이트/패킷 카운터를 델타로 계산"""
+
+    def __init__(self, webrtc):
+        self.webrtc = webrtc
+        self.bitrate_mbps = 0.0
+        self.packets_received = 0
+        self.packets_lost = 0
+        self.jitter_ms = 0.0
+        self.jb_lost = 0
+        self.jb_late = 0
+        self._last_bytes = None
+        self._last_ts = None
+
+    def request(self, on_done=None):
+        """get-stats 요청. 결과가 오면 on_done(self) 호출 (webrtcbin 스레드)"""
+        def _on_reply(promise, _):
+            reply = promise.get_reply()
+            if reply:
+                self._parse(reply)
+            if on_done:
+                on_done(self)
+        p = Gst.Promise.new_with_change_func(_on_reply, None)
+        self.webrtc.emit('get-stats', None, p)
+
+    def _parse(self, reply):
+        """application/x-webrtc-stats 구조체에서 inbound-rtp 항목 합산"""
+        totals = {"bytes": 0, "packets": 0, "lost": 0, "jitter": 0.0, "jb_lost": 0, "jb_late": 0}
+
+        def _each(_field_id, value, _):
+            if not isinstance(value, Gst.Structure) or value.get_name() != _INBOUND:
+                return True
+            totals["bytes"] += _field(value, "bytes-received")
+            totals["packets"] += _field(value, "packets-received")
+            totals["lost"] += _field(value, "packets-lost")
+            totals["jitter"] = max(totals["jitter"], _field(value, "jitter", 0.0))
+            jb = _field(value, _JITTERBUFFER, None)
+            if isinstance(jb, Gst.Structure):
+                totals["jb_lost"] += _field(jb, "num-lost")
+                totals["jb_late"] += _field(jb, "num-late")
+            return True
+
+        reply.foreach(_each, None)
+
+        now = time.monotonic()
+        if self._last_bytes is not None and now > self._last_ts:
+            delta = max(0, totals["bytes"] - self._last_bytes)
+            self.bitrate_mbps = (delta * 8) / ((now - self._last_ts) * 1_000_000)
+        self._last_bytes, self._last_ts = totals["bytes"], now
+
+        self.packets_received = totals["packets"]
+        self.packets_lost = totals["lost"]
+        self.jitter_ms = totals["jitter"] * 1000.0
+        self.jb_lost = totals["jb_lost"]
+        self.jb_late = totals["jb_late"]
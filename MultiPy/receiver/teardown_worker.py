@@ -0,0 +1,57 @@
+# teardown_worker.py
+# 피어 파이프라인 정리 전용 작업 스레드
+#
+# pipeline.set_state(NULL)은 디코더/GL 싱크 해제 때문에 피어 하나에 수백 ms까지
+# 막힐 수 있다. 제거 이벤트를 받은 스레드(socket.io / Qt / GLib)는 위젯·셀·매핑만
+# 바로 정리하고, 파이프라인 정리는 이 스레드의 큐에 넣는다.
+# 큐는 크기 제한이 없다: 정리 작업을 버리면 파이프라인이 새고, 기다리게 하면 호출한
+# 스레드(보통 메인 루프)가 막히므로. 밀린 정도는 teardown/queue-wait에 드러난다.
+# 정리 시간은 teardown/async, 큐 대기는 teardown/queue-wait로 기록한다.
+
+import queue
+import threading
+import time
+
+from latency_metrics import metrics
+
+_STOP = object()
+
+
+class TeardownWorker:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="teardown", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, fn):
+        """fn()을 작업 스레드에서 실행 (호출한 스레드는 막히지 않음)"""
+        self._queue.put((name, fn, time.monotonic()))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def drain(self, timeout=5.0):
+        """남은 정리 작업 완료 대기 후 스레드 종료 (앱 종료 시)"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            name, fn, t_enqueue = item
+            metrics.record("teardown/queue-wait", (time.monotonic() - t_enqueue) * 1000.0)
+            self._execute(name, fn)
+
+    @staticmethod
+    def _execute(name, fn):
+        t0 = time.monotonic()
+        try:
+            fn()
+        except Exception as e:
+            print(f"[TEARDOWN] {name} 정리 실패:", e)
+        ms = (time.monotonic() - t0) * 1000.0
+        metrics.record("teardown/async", ms)
+        print(f"[TEARDOWN] {name} done in {ms:.0f} ms")
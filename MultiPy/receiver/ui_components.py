@@ -3,6 +3,35 @@ from PyQt5 import QtCore, QtWidgets, QtGui
 from config import DEFAULT_WINDOW_SIZE, WINDOW_TITLE
 
 from cell import Cell 
+from layout_engine import AUTO, TILE_ASPECT, placements
+
+
+class VideoSurface(QtWidgets.QWidget):
+    """컴포지터 모드에서 grid 위를 덮는 단일 네이티브 렌더링 창.
+    클릭은 아래에 있는 셀로 전달한다."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setObjectName("compositor-surface")
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.setAttribute(QtCore.Qt.WA_NativeWindow, True)
+        self._cells: list[Cell] = []
+        parent.installEventFilter(self)
+
+    def set_cells(self, cells: list[Cell]):
+        self._cells = list(cells)
+        self.raise_()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QtCore.QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return super().eventFilter(obj, event)
+
+    def mousePressEvent(self, e):
+        for cell in self._cells:
+            if cell.geometry().contains(e.pos()):
+                cell.clicked.emit()
+                return
 
 
 class ReceiverWindow(QtWidgets.QMainWindow):
@@ -57,6 +86,7 @@ class ReceiverWindow(QtWidgets.QMainWindow):
         self._main.addWidget(self._grid_container)
         self._main.setCurrentIndex(0)  # 기본: 단일 모드
 
+        self._surface = None  # 컴포지터 모드 전용 렌더링 창
 
         self._setup_shortcuts()
 
@@ -204,8 +234,20 @@ class ReceiverWindow(QtWidgets.QMainWindow):
         """stack <-> grid 전환 (레이아웃 파괴 금지)"""
         self._main.setCurrentIndex(1 if use_grid else 0)
 
-    def apply_layout(self, mode: int, cells: list[Cell]):
+    def ensure_compositor_surface(self):
+        """컴포지터 싱크가 그릴 단일 네이티브 창 (grid 전체를 덮음)"""
+        if self._surface is None:
+            self._surface = VideoSurface(self._grid_container)
+            self._surface.setGeometry(self._grid_container.rect())
+            _ = self._surface.winId()  # 핸들 실체화
+            self._surface.show()
+        return self._surface
+
+    def apply_layout(self, mode: int, cells: list[Cell], kind: str = AUTO):
+        """layout_engine 배치대로 셀을 그리드에 배치 (mode = 타일 수)"""
         self.set_mode(True)
+        if self._surface is not None:
+            self._surface.set_cells(cells)
 
         # 레이아웃만 비우기 (부모/위젯 파괴 금지)
         while self._grid.count():
@@ -214,29 +256,18 @@ class ReceiverWindow(QtWidgets.QMainWindow):
             if w:
                 self._grid.removeWidget(w)
 
-        # 보기 좋게 늘리기
-        self._grid.setRowStretch(0, 1)
-        self._grid.setRowStretch(1, 1)
-        self._grid.setColumnStretch(0, 1)
-        self._grid.setColumnStretch(1, 1)
-
-        if mode == 1 and cells:
-            self._grid.addWidget(cells[0], 0, 0, 2, 2)  # 창 꽉 채움
-        elif mode == 2 and len(cells) >= 2:
-            self._grid.addWidget(cells[0], 0, 0, 2, 1)
-            self._grid.addWidget(cells[1], 0, 1, 2, 1)
-        elif mode == 3 and len(cells) >= 3:
-            self._grid.addWidget(cells[0], 0, 0, 2, 1)
-            self._grid.addWidget(cells[1], 0, 1, 1, 1)
-            self._grid.addWidget(cells[2], 1, 1, 1, 1)
-            self._grid.setColumnStretch(0, 1)
-            self._grid.setColumnStretch(1, 1)
-            self._grid.setRowStretch(0, 1)
-            self._grid.setRowStretch(1, 1)
-        elif mode == 4:
-            for i, cell in enumerate(cells[:4]):
-                r, c = divmod(i, 2)
-                self._grid.addWidget(cell, r, c)
+        size = self._central.size()   # grid 컨테이너는 방금 표시됐을 수 있어 중앙 위젯 크기 기준
+        aspect = size.width() / size.height() if size.height() > 0 else TILE_ASPECT
+        rows, cols, tiles = placements(len(cells), aspect, kind)
+
+        # 이번 배치의 행/열만 균등하게 늘리고, 이전 배치에서 남은 행/열은 0
+        for r in range(max(rows, self._grid.rowCount())):
+            self._grid.setRowStretch(r, 1 if r < rows else 0)
+        for c in range(max(cols, self._grid.columnCount())):
+            self._grid.setColumnStretch(c, 1 if c < cols else 0)
+
+        for cell, (r, c, rs, cs) in zip(cells, tiles):
+            self._grid.addWidget(cell, r, c, rs, cs)
 
     def _setup_shortcuts(self):
         shortcuts = [
@@ -296,6 +327,11 @@ class ReceiverWindow(QtWidgets.QMainWindow):
             self._names[sender_id] = sender_name
         self.set_active_sender(sender_id)
 
+    def set_sender_name(self, sender_id: str, sender_name: str):
+        """sender 이름 변경 (표시 중인 위젯이 있을 때만 기록)"""
+        if sender_id in self._names:
+            self._names[sender_id] = sender_name
+
     def remove_sender_widget(self, sender_id: str):
         w = self._widgets.pop(sender_id, None)
         self._names.pop(sender_id, None)
@@ -0,0 +1,116 @@
+# ui_scheduler.py
+# sender별 UI/GStreamer 명령 병합 스케줄러 (프레임 단위 배치)
+#
+# 레이아웃 변경 한 번에 셀마다 창 핸들 갱신(idle) → UI_OVERLAY_DELAY_MS 뒤 재생 +
+# 오버레이 재연결(timeout)이 따로 쌓이고, resume_pipeline이 오버레이 재연결을 또 예약해
+# 같은 sender에 같은 작업이 여러 번, GLib 펌프 타이머 사이사이에 흩어져 실행됐다.
+# 명령은 (sender_id, 작업) 키로 받아 아직 실행 전인 같은 키는 마지막 것만 남기고
+# (last-write-wins), UI_FRAME_INTERVAL_MS 프레임 경계에서 한 배치로 실행한다.
+# 배치 안에서는 작업 종류 순서(창 핸들 → 재생 → 오버레이 → 표시/크기/인코딩)를 지킨다.
+# 병합으로 생략된 명령 수는 stats()["coalesced"], 배치 실행 시간은 ui/batch로 기록한다.
+
+import itertools
+import math
+import threading
+import time
+
+from gi.repository import GLib
+from latency_metrics import metrics
+from config import UI_FRAME_INTERVAL_MS
+
+OP_WINDOW = "window"            # update_window_from_widget (winId 갱신 + 오버레이)
+OP_PLAY = "play"                # resume_pipeline (재생 + 키프레임 요청)
+OP_OVERLAY = "overlay"          # _force_overlay_handle
+OP_VISIBLE = "visible"          # set_visible
+OP_RENDER_SIZE = "render-size"  # set_render_size
+OP_ENCODING = "encoding"        # set_encoding
+
+_OP_ORDER = {op: i for i, op in enumerate(
+    (OP_WINDOW, OP_PLAY, OP_OVERLAY, OP_VISIBLE, OP_RENDER_SIZE, OP_ENCODING))}
+
+
+class UiCommandScheduler:
+    def __init__(self, interval_ms=UI_FRAME_INTERVAL_MS):
+        self.interval_ms = max(1, int(interval_ms))
+        self._lock = threading.Lock()
+        self._pending = {}          # (key, op) -> (due, seq, fn, args)
+        self._seq = itertools.count()
+        self._timer = None
+        self._timer_due = None
+        self._counts = {"posted": 0, "executed": 0, "coalesced": 0, "batches": 0}
+
+    # ----- 예약 (어느 스레드에서든 호출 가능) -----
+    def post(self, key, op, fn, *args, delay_ms=0):
+        """key(보통 sender_id)의 op 명령 예약, 실행 전인 같은 (key, op) 명령은 대체"""
+        due = time.monotonic() + max(0, delay_ms) / 1000.0
+        with self._lock:
+            self._counts["posted"] += 1
+            if (key, op) in self._pending:
+                self._counts["coalesced"] += 1
+            self._pending[(key, op)] = (due, next(self._seq), fn, args)
+            self._arm(due)
+
+    def cancel(self, key):
+        """key의 대기 명령 모두 취소 (sender 제거 시)"""
+        with self._lock:
+            for k in [k for k in self._pending if k[0] == key]:
+                del self._pending[k]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, pending=len(self._pending))
+
+    def dump(self):
+        """병합 통계 로그 (종료 시)"""
+        s = self.stats()
+        saved = 100.0 * s["coalesced"] / s["posted"] if s["posted"] else 0.0
+        print(f"[UI] commands posted={s['posted']} executed={s['executed']} "
+              f"coalesced={s['coalesced']} ({saved:.0f}% saved) batches={s['batches']}")
+
+    # ----- 메인 루프 -----
+    def _frame_boundary(self, t):
+        """t 이후 첫 프레임 경계 (monotonic 초)"""
+        frame = self.interval_ms / 1000.0
+        return math.ceil(t / frame) * frame
+
+    def _arm(self, due):
+        """due가 속한 프레임 경계에 배치 타이머 설정 (lock 보유 상태에서 호출)"""
+        tick = self._frame_boundary(due)
+        if self._timer is not None:
+            if self._timer_due <= tick:
+                return
+            GLib.source_remove(self._timer)
+        delay = max(0, int(round((tick - time.monotonic()) * 1000.0)))
+        self._timer = GLib.timeout_add(delay, self._flush)
+        self._timer_due = tick
+
+    def _flush(self):
+        """이번 프레임까지 도래한 명령을 작업 순서대로 한 번에 실행"""
+        slack = 0.001
+        with self._lock:
+            self._timer = None
+            now = time.monotonic()
+            ready = [(k, v) for k, v in self._pending.items() if v[0] <= now + slack]
+            for k, _ in ready:
+                del self._pending[k]
+            if self._pending:
+                self._arm(min(v[0] for v in self._pending.values()))
+        if not ready:
+            return False
+
+        ready.sort(key=lambda kv: (_OP_ORDER.get(kv[0][1], len(_OP_ORDER)), kv[1][1]))
+        t0 = time.monotonic()
+        for (key, op), (_, _, fn, args) in ready:
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[UI] {op} 명령 실패 ({key}):", e)
+        metrics.record("ui/batch", (time.monotonic() - t0) * 1000.0)
+        with self._lock:
+            self._counts["executed"] += len(ready)
+            self._counts["batches"] += 1
+        return False
+
+
+# 프로세스 전역 인스턴스
+ui_commands = UiCommandScheduler()
@@ -1,21 +1,41 @@
 # view_mode_manager.py
 # 화면 분할 모드를 관리하는 매니저 클래스
 
+import time
+
 from PyQt5 import QtCore, QtWidgets, QtGui
 from ui_components import ReceiverWindow, Cell
+from latency_metrics import metrics
+from config import SWITCH_COOLDOWN_MS, LAYOUT_MAX_TILES
+from layout_engine import AUTO, GRID, FOCUS, resolve_kind
+
+# 숫자 키 → 타일 수 (0 = 10)
+_DIGIT_KEYS = {getattr(QtCore.Qt, f"Key_{d}"): (d or 10) for d in range(10)}
+
+_PERSON_PIXMAP = None
+
+
+def _person_pixmap():
+    """대기 화면 아이콘 (디스크 읽기/스케일링은 처음 한 번만)"""
+    global _PERSON_PIXMAP
+    if _PERSON_PIXMAP is None:
+        _PERSON_PIXMAP = QtGui.QPixmap("icons/person.png").scaled(
+            90, 90, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    return _PERSON_PIXMAP
 
 
 class ViewModeManager(QtCore.QObject):
     """ReceiverWindow의 화면 분할 모드를 관리"""
 
-    # 시그널: 모드 전환 시 전체 pause, 특정 셀에 sender 할당 요청
-    requestPauseAll = QtCore.pyqtSignal()
+    # 시그널: 모드 전환 시 셀 수 변경 알림(남는 인덱스 배정 해제), 특정 셀에 sender 할당 요청
+    layoutChanged = QtCore.pyqtSignal(int)       # 새 셀 수
     requestAssign = QtCore.pyqtSignal(int, str)  # (cell_index, sender_id)
 
     def __init__(self, ui: ReceiverWindow):
         super().__init__()
         self.ui = ui
-        self.mode: int | None = None    # 분할 모드 (1-4)
+        self.mode: int | None = None    # 분할 모드 = 타일 수 (1-LAYOUT_MAX_TILES)
+        self.kind: str = AUTO           # 배치 종류 (layout_engine: auto/grid/focus)
         self.cells: list[Cell] = []     # 셀 목록
         self.focus_index: int = 0       # 현재 포커스된 셀
         self.cell_assignments: dict[int, str] = {}  # {cell_index: sender_id, ... ,cell_index: sender_id}
@@ -24,15 +44,18 @@ class ViewModeManager(QtCore.QObject):
         self._shortcuts: list[QtWidgets.QShortcut] = []
         self._senders_provider = None  # callable -> list[(sid, name)]
         self._manager = None           # MultiReceiverManager 참조
+        self._last_switch = 0.0        # Left/Right 전환 시각 (SWITCH_COOLDOWN_MS)
+        self._placeholder_pool: list[QtWidgets.QWidget] = []  # 제거된 셀에서 회수한 대기 화면
+        _person_pixmap()  # 대기 화면 아이콘 미리 로드
 
         self._setup_shortcuts()
-        QtWidgets.QApplication.instance().installEventFilter(self)
 
     # 외부에서 매니저 바인딩
     def bind_manager(self, manager):
         self._manager = manager
-        self.requestPauseAll.connect(self._manager.pause_all_streams)
+        self.layoutChanged.connect(self._manager.on_layout_changed)
         self.requestAssign.connect(self._manager.assign_sender_to_cell)
+        self.ui.switchRequested.connect(self._switch_focused)
 
     def set_senders_provider(self, provider_fn):
         """provider_fn() -> list[(sender_id, sender_name)]"""
@@ -45,7 +68,8 @@ class ViewModeManager(QtCore.QObject):
         """
         외부 배치 데이터를 받아서 화면 분할 모드를 설정
         layout_data = {
-            'layout': 1,
+            'layout': 1,               # 타일 수 (1-LAYOUT_MAX_TILES)
+            'kind': 'auto',            # (선택) auto / grid / focus
             'participants': [
                 {'id': 'tOQnjQ1l63p98Nc0AAAJ', 'name': '은비'},
                 ...
@@ -56,145 +80,188 @@ class ViewModeManager(QtCore.QObject):
         
         try:
             # 레이아웃 모드와 참가자 정보 추출
-            layout_mode = layout_data.get('layout', 1)
+            layout_mode = max(1, min(LAYOUT_MAX_TILES, int(layout_data.get('layout', 1))))
+            layout_kind = layout_data.get('kind', AUTO)
             participants = layout_data.get('participants', [])
             
             print(f"[DEBUG] 레이아웃 모드: {layout_mode}, 참가자 수: {len(participants)}")
-            
-            # 기존 상태 정리
-            self.cell_assignments.clear()
-            self.active_senders.clear()
 
-            # 모드 설정
-            self.set_mode(layout_mode)
+            if len(participants) > layout_mode:
+                print(f"[WARNING] 참가자가 셀 수보다 많습니다. {layout_mode}명까지만 배치합니다")
+            desired = {idx: p.get('id') for idx, p in enumerate(participants[:layout_mode])
+                       if p.get('id')}
+
+            # 현재 배정과 비교해 바뀐 셀만 다시 배정 (그대로인 셀은 위젯/오버레이 유지)
+            current = self._current_assignments()
+            changed = {idx: sid for idx, sid in desired.items() if current.get(idx) != sid}
+
+            # 전환 지연 측정: 새로 배정된 셀에 영상이 나올 때까지
+            metrics.begin_group("layout/switch→all-cells-video", changed.values())
 
-            # 참가자들을 각 셀에 할당
-            self._assign_participants(participants)
+            # 모드 설정 (셀 재사용)
+            self.set_mode(layout_mode, layout_kind)
+
+            self._apply_assignment_diff(desired, changed, current)
             
         except Exception as e:
             print(f"[ERROR] apply_layout_data 처리 중 오류: {e}")
             # 오류 시 기본 모드로 설정
             self.set_mode(1)
 
-    def _assign_participants(self, participants: list):
-        """참가자들을 생성된 셀들에 순서대로 할당"""
-        print(f"[DEBUG] _assign_participants 호출: {participants}")
-        
+    def _current_assignments(self) -> dict[int, str]:
+        """셀 인덱스 -> 현재 표시 중인 sender (매니저의 실제 배정 기준)"""
+        if not self._manager:
+            return dict(self.cell_assignments)
+        return {idx: sid for idx in range(len(self.cells))
+                if (sid := self._manager.sender_in_cell(idx))}
+
+    def _apply_assignment_diff(self, desired: dict, changed: dict, current: dict):
+        """바뀐 셀만 배정 요청, 비게 된 셀은 배정 해제 (placeholder 표시)"""
         if not self.cells:
             print("[WARNING] 셀이 생성되지 않았습니다")
             return
-        
-        # 각 참가자를 셀에 할당
-        for idx, participant in enumerate(participants):
-            if idx >= len(self.cells):
-                print(f"[WARNING] 참가자가 셀 수보다 많습니다. 인덱스 {idx}는 건너뜁니다")
-                break
-                
-            sender_id = participant.get('id')
-            sender_name = participant.get('name')
-            
-            if sender_id:
-                print(f"[DEBUG] 셀 {idx}에 {sender_name}({sender_id}) 할당")
-                
-                # 상태 정보 업데이트
-                self.cell_assignments[idx] = sender_id
-                self.active_senders.append(sender_id)
-                
-                # 실제 할당 요청
-                self.requestAssign.emit(idx, sender_id)
+
+        for idx, sender_id in changed.items():
+            print(f"[DEBUG] 셀 {idx}: {current.get(idx)} → {sender_id}")
+            self.requestAssign.emit(idx, sender_id)
+
+        cleared = [idx for idx in current if idx < len(self.cells) and idx not in desired]
+        for idx in cleared:
+            if self._manager:
+                self._manager.release_cell(idx)
+
+        self.cell_assignments = dict(desired)
+        self.active_senders = list(desired.values())
+        print(f"[DEBUG] layout diff: changed={len(changed)}, "
+              f"kept={len(desired) - len(changed)}, cleared={len(cleared)}")
 
     def _setup_shortcuts(self):
         # ✅ 메인 윈도우(self.ui)를 부모로 해야 전역 단축키처럼 동작
-        for num in (1, 2, 3, 4):
-            sc = QtWidgets.QShortcut(QtGui.QKeySequence(str(num)), self.ui)
+        for key, num in _DIGIT_KEYS.items():
+            sc = QtWidgets.QShortcut(QtGui.QKeySequence(key), self.ui)
             sc.setContext(QtCore.Qt.ApplicationShortcut)
             sc.activated.connect(lambda n=num: self.set_mode(n))
             self._shortcuts.append(sc)
 
+        # +/- : 타일 하나 추가/제거, F : 그리드 ↔ 포커스+띠 배치
+        for seq, cb in (("+", lambda: self._step_tiles(+1)), ("=", lambda: self._step_tiles(+1)),
+                        ("-", lambda: self._step_tiles(-1)), ("F", self._toggle_focus_layout)):
+            sc = QtWidgets.QShortcut(QtGui.QKeySequence(seq), self.ui)
+            sc.setContext(QtCore.Qt.ApplicationShortcut)
+            sc.activated.connect(cb)
+            self._shortcuts.append(sc)
+
         # 🔑 S 키: sender 선택 메뉴
         sc_s = QtWidgets.QShortcut(QtGui.QKeySequence("S"), self.ui)
         sc_s.setContext(QtCore.Qt.ApplicationShortcut)
         sc_s.activated.connect(self._open_sender_picker)
         self._shortcuts.append(sc_s)
 
-    def eventFilter(self, obj, event):
-        if event.type() == QtCore.QEvent.KeyPress:
-            k = event.key()
-            if k in (QtCore.Qt.Key_1, QtCore.Qt.Key_2, QtCore.Qt.Key_3, QtCore.Qt.Key_4):
-                self.set_mode({QtCore.Qt.Key_1: 1, QtCore.Qt.Key_2: 2,
-                               QtCore.Qt.Key_3: 3, QtCore.Qt.Key_4: 4}[k])
-                return True
-            if k == QtCore.Qt.Key_S:
-                self._open_sender_picker()
-                return True
-        return super().eventFilter(obj, event)
-
-    def set_mode(self, mode: int):
-        print(f"[DEBUG] set_mode called: {mode}")
-        self.mode = mode
+    def _step_tiles(self, delta: int):
+        self.set_mode(max(1, min(LAYOUT_MAX_TILES, (self.mode or 1) + delta)), self.kind)
 
-        # 전체 pause (지금 활성 재생을 잠깐 멈춤)
-        self.requestPauseAll.emit()
+    def _toggle_focus_layout(self):
+        mode = self.mode or 1
+        self.set_mode(mode, GRID if resolve_kind(mode, self.kind) == FOCUS else FOCUS)
 
-        # 기존 셀 정리
-        for c in self.cells:
+    def set_mode(self, mode: int, kind: str = AUTO):
+        """분할 모드 변경: 기존 셀은 재사용하고 모자란 셀만 추가, 남는 셀만 제거
+        mode = 타일 수, kind = layout_engine 배치 종류"""
+        print(f"[DEBUG] set_mode called: {mode} ({kind})")
+        mode = max(1, min(LAYOUT_MAX_TILES, int(mode)))
+        if mode == self.mode and kind == self.kind and len(self.cells) == mode:
+            return
+        t0 = time.perf_counter()
+        self.mode = mode
+        self.kind = kind
+
+        # 남는 셀 제거 (그 셀의 배정은 layoutChanged에서 해제)
+        for c in self.cells[mode:]:
             try:
                 c.clear()
+                if c.placeholder is not None:
+                    self._placeholder_pool.append(c.placeholder)
+                    c.placeholder = None
                 c.setParent(None)
                 c.deleteLater()
             except Exception:
                 pass
-        self.cells.clear()
+        del self.cells[mode:]
 
-        # 새 셀 생성
-        self.cells = [Cell() for _ in range(mode)]
-        for idx, cell in enumerate(self.cells):
+        # 모자란 셀 추가
+        new_cells = list(range(len(self.cells), mode))
+        for idx in new_cells:
+            cell = Cell()
             cell.clicked.connect(lambda i=idx: self._set_focus(i))
+            cell.resized.connect(self._on_cell_resized)
+            self.cells.append(cell)
 
-        # Grid 재배치
-        self.ui.apply_layout(mode, self.cells)
-        self._set_focus(0 if self.cells else -1)
+        self.layoutChanged.emit(mode)
 
-        # 다시 한 번 전체 pause (레이아웃 전환 직후 상태 수립)
-        self.requestPauseAll.emit()
+        # Grid 재배치 (기존 셀은 위치만 바뀌고 안의 네이티브 창은 유지)
+        self.ui.apply_layout(mode, self.cells, kind)
+        for idx in new_cells:
+            self._show_placeholder(idx)
+        self._set_focus(self.focus_index if 0 <= self.focus_index < mode else (0 if self.cells else -1))
+        metrics.record("layout/set_mode", (time.perf_counter() - t0) * 1000.0)
 
     def _set_focus(self, idx: int):
-        self.focus_index = idx
-        for i, cell in enumerate(self.cells):
-            cell.setStyleSheet("""
-                QFrame {
-                    background: white;
-                    border: 1px solid black;
-                }
-            """)
-            placeholder = QtWidgets.QWidget(cell)
-            placeholder.setStyleSheet("background: transparent; border: none;")
-            layout = QtWidgets.QVBoxLayout(placeholder)
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.setAlignment(QtCore.Qt.AlignCenter)
-
-            # 아이콘 (PNG 불러오기)
-            icon_label = QtWidgets.QLabel()
-            pixmap = QtGui.QPixmap("icons/person.png").scaled(90, 90, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            icon_label.setPixmap(pixmap)
-            icon_label.setAlignment(QtCore.Qt.AlignCenter)
-
-            # 텍스트
-            text_label = QtWidgets.QLabel("· · ·  대기 중  · · ·")
-            text_label.setAlignment(QtCore.Qt.AlignCenter)
-            text_label.setStyleSheet("""
-                QLabel {
-                    color: #6b7280;
-                    font-size: 22px;
-                    font-weight: bold;
-                }
-            """)
-
-            layout.addWidget(icon_label)
-            layout.addSpacing(8)
-            layout.addWidget(text_label)
-
-            cell.put_widget(placeholder)
+        """포커스 이동: 이전/새 포커스 셀 두 개의 focused 속성만 전환"""
+        t0 = time.perf_counter()
+        prev, self.focus_index = self.focus_index, idx
+        for i in {prev, idx}:
+            if 0 <= i < len(self.cells):
+                self.cells[i].set_focused(i == idx)
+        if self._manager:
+            self._manager.on_focus_changed()
+        metrics.record("layout/focus-change", (time.perf_counter() - t0) * 1000.0)
+
+    def _on_cell_resized(self):
+        """셀 픽셀 크기가 바뀌면 피어 렌더 크기/인코딩 상한 갱신 (매니저가 한 번으로 모음)"""
+        if self._manager:
+            self._manager.on_cells_resized()
+
+    def clear_cell(self, idx: int):
+        """배정이 해제된 셀을 placeholder로 되돌림 (Qt 스레드)"""
+        if 0 <= idx < len(self.cells):
+            self._show_placeholder(idx)
+
+    def _show_placeholder(self, idx: int):
+        """빈 셀(새로 만든 셀/배정 해제된 셀)에만 대기 화면 표시 (셀별 위젯 재사용)"""
+        cell = self.cells[idx]
+        if cell.placeholder is None:
+            cell.placeholder = (self._placeholder_pool.pop() if self._placeholder_pool
+                                else self._make_placeholder())
+        cell.put_widget(cell.placeholder)
+        cell.placeholder.show()
+
+    def _make_placeholder(self):
+        placeholder = QtWidgets.QWidget()
+        placeholder.setStyleSheet("background: transparent; border: none;")
+        layout = QtWidgets.QVBoxLayout(placeholder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setAlignment(QtCore.Qt.AlignCenter)
+
+        # 아이콘 (캐시된 pixmap)
+        icon_label = QtWidgets.QLabel()
+        icon_label.setPixmap(_person_pixmap())
+        icon_label.setAlignment(QtCore.Qt.AlignCenter)
+
+        # 텍스트
+        text_label = QtWidgets.QLabel("· · ·  대기 중  · · ·")
+        text_label.setAlignment(QtCore.Qt.AlignCenter)
+        text_label.setStyleSheet("""
+            QLabel {
+                color: #6b7280;
+                font-size: 22px;
+                font-weight: bold;
+            }
+        """)
+
+        layout.addWidget(icon_label)
+        layout.addSpacing(8)
+        layout.addWidget(text_label)
+        return placeholder
 
     def _open_sender_picker(self):
         if not self._senders_provider:
@@ -223,6 +290,29 @@ class ViewModeManager(QtCore.QObject):
 
         menu.exec_(QtGui.QCursor.pos())
 
+    @QtCore.pyqtSlot(int)
+    def _switch_focused(self, step: int):
+        """Left/Right: 포커스 셀의 sender를 목록의 이전/다음 sender로 교체"""
+        now = time.monotonic()
+        if (now - self._last_switch) * 1000.0 < SWITCH_COOLDOWN_MS:
+            return
+        if not self._manager or not self._senders_provider:
+            return
+        ids = [sid for sid, _ in self._senders_provider()]
+        if not ids:
+            return
+        if not self.cells:
+            self.set_mode(1)
+        idx = self.focus_index if (0 <= self.focus_index < len(self.cells)) else 0
+        current = self._manager.sender_in_cell(idx)
+        pos = ids.index(current) + step if current in ids else (0 if step > 0 else -1)
+        target = ids[pos % len(ids)]
+        if target == current:
+            return
+        self._last_switch = now
+        print(f"[DEBUG] switch cell {idx}: {current} → {target}")
+        self._manager.assign_sender_to_cell(idx, target, reason="switch")
+
     def _assign_to_focus(self, sender_id: str):
         if not self.cells:
             # 혹시 모를 타이밍 이슈 보강
@@ -25,17 +25,6 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # 관리자 비밀번호
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "319319319") # 관리 패스워드
 
-receiver = None # 현재 등록된 리시버의 소켓 ID
-senders = {} # 연결된 sender 목록
-
-
-def emit_sender_list():
-    global receiver, senders
-    if receiver:
-        sender_arr = [{"id": s["id"], "name": s["name"]} for s in senders.values()]
-        socketio.emit("sender-list", sender_arr, to=receiver)
-
-
 @app.route("/")
 def main():
     return render_template("enter.html")
@@ -92,19 +81,23 @@ def start_receiver():
     print(f"[Flask] Receiver started (PID {receiver_process.pid})")
 
 
+# 시그널링 서버 스크립트 (index.py: Flask-SocketIO, index_async.py: asyncio)
+SIGNALING_SCRIPT = os.getenv("SIGNALING_SCRIPT", "index.py")
+
+
 def start_signaling():
-    """index.py 시그널링 서버 실행"""
+    """시그널링 서버 실행"""
     global signaling_process
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../server"))
     if is_windows: # 윈도우
         signaling_process = subprocess.Popen(
-            ["python", "index.py"],
+            ["python", SIGNALING_SCRIPT],
             cwd=base_dir,
             creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
         )
     else: # 유닉스
         signaling_process = subprocess.Popen(
-            ["python3", "index.py"],
+            ["python3", SIGNALING_SCRIPT],
             cwd=base_dir,
             preexec_fn=os.setsid,
         )
@@ -1,5 +1,61 @@
 // administrator.js - UI 관리 및 상태 관리
 
+// === 배치 계산 (receiver layout_engine.py와 같은 규칙) ===
+const MAX_TILES = 16;         // receiver LAYOUT_MAX_TILES
+const TILE_ASPECT = 16 / 9;
+// auto 2·4분할: 화면 비율과 무관하게 이전 배치 (좌우 / 2×2)
+const LEGACY_DIMS = { 2: { rows: 1, cols: 2 }, 4: { rows: 2, cols: 2 } };
+
+function gcd(a, b) {
+    return b ? gcd(b, a % b) : a;
+}
+
+// 16:9 영상이 가장 크게 보이는 행×열 (같으면 열이 많은 쪽)
+function gridDims(count, aspect) {
+    let best = { rows: 1, cols: 1 }, bestArea = -1;
+    for (let cols = 1; cols <= count; cols++) {
+        const rows = Math.ceil(count / cols);
+        const vw = Math.min(aspect / cols, TILE_ASPECT / rows);
+        const area = vw * vw / TILE_ASPECT;
+        if (area > bestArea + 1e-9 || (Math.abs(area - bestArea) <= 1e-9 && cols > best.cols)) {
+            best = { rows, cols };
+            bestArea = area;
+        }
+    }
+    return best;
+}
+
+// 타일 배치 { rows, cols, tiles: [{row, col, rowSpan, colSpan}] } (kind: auto/grid/focus)
+function tilePlacements(count, aspect = TILE_ASPECT, kind = 'auto') {
+    if (count <= 1) return { rows: 1, cols: 1, tiles: [{ row: 0, col: 0, rowSpan: 1, colSpan: 1 }] };
+    const focus = kind === 'focus' || (kind === 'auto' && count === 3);
+    if (focus) {
+        const strip = count - 1;
+        if (strip <= 3) {
+            // 오른쪽 세로 띠
+            const cols = Math.max(2, strip);
+            const tiles = [{ row: 0, col: 0, rowSpan: strip, colSpan: cols - 1 }];
+            for (let i = 0; i < strip; i++) tiles.push({ row: i, col: cols - 1, rowSpan: 1, colSpan: 1 });
+            return { rows: strip, cols, tiles };
+        }
+        // 아래 가로 띠
+        const tiles = [{ row: 0, col: 0, rowSpan: 3, colSpan: strip }];
+        for (let i = 0; i < strip; i++) tiles.push({ row: 3, col: i, rowSpan: 1, colSpan: 1 });
+        return { rows: 4, cols: strip, tiles };
+    }
+    // 마지막 행이 덜 차면 열 수를 lcm으로 잡아 마지막 행도 가로를 꽉 채움
+    const { rows, cols } = (kind === 'auto' && LEGACY_DIMS[count]) || gridDims(count, aspect);
+    const last = count - cols * (rows - 1);
+    const spanCols = cols * last / gcd(cols, last);
+    const tiles = [];
+    for (let i = 0; i < count; i++) {
+        const r = Math.floor(i / cols), c = i % cols;
+        const span = spanCols / (r === rows - 1 ? last : cols);
+        tiles.push({ row: r, col: c * span, rowSpan: 1, colSpan: span });
+    }
+    return { rows, cols: spanCols, tiles };
+}
+
 // === 상태 관리 ===
 const stateManager = {
     // 전체 참여자 목록 (MQTT로부터 받은 전체 사용자 - 객체 배열)
@@ -8,8 +64,9 @@ const stateManager = {
     // 비디오 영역에 배치된 참여자들 
     placedParticipants: [], //[{id: "...", name: "..."}, ...] 형태
 
-    // 현재 레이아웃
+    // 현재 레이아웃 (타일 수) / 배치 종류 (auto, grid, focus)
     currentLayout: 1,
+    currentKind: 'auto',
 
     // 전체 참여자 목록 업데이트 (MQTT에서 호출)
     updateAllParticipants(participants) {
@@ -88,6 +145,7 @@ const stateManager = {
         if (window.publishPlacementState) {
             const placementData = {
                 layout: this.currentLayout,
+                kind: this.currentKind,
                 participants: this.placedParticipants  // 객체 배열 [{id, name}, ...]
             };
             window.publishPlacementState(JSON.stringify(placementData));
@@ -125,10 +183,12 @@ const stateManager = {
 
     // 최적 레이아웃 계산
     getOptimalLayout(participantCount) {
-        if (participantCount <= 1) return 1;
-        if (participantCount <= 2) return 2;
-        if (participantCount <= 3) return 3;
-        return 4;
+        return Math.min(Math.max(participantCount, 1), MAX_TILES);
+    },
+
+    // 더 배치할 수 없는지 (최대 타일 수까지 모두 배치됨)
+    isFull() {
+        return this.placedParticipants.length >= MAX_TILES;
     },
 
     // 배치된 참여자 이름 목록만 반환 (UI 호환성을 위해)
@@ -141,6 +201,7 @@ const stateManager = {
         try {
             // 서버 상태로 업데이트
             this.currentLayout = screenData.layout || 1;
+            this.currentKind = screenData.kind || 'auto';
             this.placedParticipants = screenData.participants || [];
 
             console.log(`[STATE] 동기화: 레이아웃 ${this.currentLayout}, 참가자 ${this.placedParticipants.length}명`);
@@ -395,8 +456,8 @@ const uiManager = {
     handleDragStart(e) {
         const participantName = e.target.querySelector('span').textContent;
 
-        // 4분할이고 4명이 모두 참여 중이면 드래그 방지
-        if (stateManager.currentLayout === 4 && stateManager.placedParticipants.length >= 4) {
+        // 최대 타일 수까지 모두 참여 중이면 드래그 방지
+        if (stateManager.isFull()) {
             e.preventDefault();
             return false;
         }
@@ -449,8 +510,8 @@ const uiManager = {
             return;
         }
 
-        // 4분할에서 4명이 모두 참여 중이면 드롭 방지
-        if (stateManager.currentLayout === 4 && stateManager.placedParticipants.length >= 4) {
+        // 최대 타일 수까지 모두 참여 중이면 드롭 방지
+        if (stateManager.isFull()) {
             return;
         }
 
@@ -459,8 +520,14 @@ const uiManager = {
             this.selectLayout(1);
         }
 
+        // 빈 슬롯이 없으면 타일 하나 추가
+        let emptySlot = document.querySelector('.slot:not([data-occupied])');
+        if (!emptySlot) {
+            this.relayoutParticipants(stateManager.currentLayout + 1);
+            emptySlot = document.querySelector('.slot:not([data-occupied])');
+        }
+
         // 빈 슬롯이 있으면 자동으로 배치
-        const emptySlot = document.querySelector('.slot:not([data-occupied])');
         if (emptySlot) {
             this.addParticipantToSlot(participantName, emptySlot);
             this.checkAndExpandLayout();
@@ -544,7 +611,9 @@ const uiManager = {
         const slotsContainer = document.createElement('div');
         slotsContainer.className = 'slots-container';
 
-        if (currentLayout === 1) {
+        if (stateManager.currentKind !== 'auto' || currentLayout > 4) {
+            this.createTileLayout(slotsContainer, currentLayout);
+        } else if (currentLayout === 1) {
             this.create1Layout(slotsContainer);
         } else if (currentLayout === 2) {
             this.create2Layout(slotsContainer);
@@ -705,6 +774,43 @@ const uiManager = {
         }
     },
 
+    // N분할 (5분할 이상 또는 배치 종류 지정): receiver와 같은 배치를 CSS grid로
+    createTileLayout(container, count) {
+        const area = this.videoArea;
+        const aspect = area && area.clientHeight ? area.clientWidth / area.clientHeight : TILE_ASPECT;
+        const { rows, cols, tiles } = tilePlacements(count, aspect, stateManager.currentKind);
+        container.style.cssText = `
+            display: grid;
+            grid-template-columns: repeat(${cols}, 1fr);
+            grid-template-rows: repeat(${rows}, 1fr);
+            width: 100%;
+            height: 100%;
+            padding: 10px;
+            box-sizing: border-box;
+            gap: 1%;
+        `;
+
+        tiles.forEach((t, i) => {
+            const slot = this.createSlot(`slot-${i}`);
+            slot.style.cssText = `
+                grid-row: ${t.row + 1} / span ${t.rowSpan};
+                grid-column: ${t.col + 1} / span ${t.colSpan};
+                min-width: 0;
+                min-height: 0;
+                background: transparent;
+                border: 2px dashed rgba(255, 255, 255, 1);
+                border-radius: 10px;
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                color: white;
+                font-weight: bold;
+                box-sizing: border-box;
+            `;
+            container.appendChild(slot);
+        });
+    },
+
     // 슬롯 생성 헬퍼
     createSlot(id) {
         const slot = document.createElement('div');
@@ -827,27 +933,7 @@ const uiManager = {
     adjustLayoutAfterRemoval() {
         if (stateManager.placedParticipants.length > 0) {
             const optimalLayout = stateManager.getOptimalLayout(stateManager.placedParticipants.length);
-
-            // 현재 참가자들 정보 백업
-            const currentParticipantNames = stateManager.getPlacedParticipantNames();
-
-            // 상태 초기화
-            currentParticipantNames.forEach(name => {
-                stateManager.removeFromVideoArea(name);
-            });
-
-            // 새 레이아웃 생성
-            stateManager.setLayout(optimalLayout);
-            this.createVideoSlots();
-
-            // 참가자들 재배치
-            currentParticipantNames.forEach((name, index) => {
-                const targetSlot = document.querySelector(`#slot-${index}`);
-                if (targetSlot) {
-                    this.addParticipantToSlot(name, targetSlot);
-                }
-            });
-
+            this.relayoutParticipants(optimalLayout);
         } else {
             // 모든 참가자가 제거되면 초기 상태로
             this.resetVideoArea();
@@ -859,37 +945,38 @@ const uiManager = {
         const currentParticipantCount = stateManager.placedParticipants.length;
         let targetLayout = stateManager.currentLayout;
 
-        // 자동 확장 규칙
-        if (stateManager.currentLayout === 1 && currentParticipantCount === 2) {
-            targetLayout = 2;
-        } else if (stateManager.currentLayout === 2 && currentParticipantCount === 3) {
-            targetLayout = 3;
-        } else if (stateManager.currentLayout === 3 && currentParticipantCount === 4) {
-            targetLayout = 4;
+        // 자동 확장 규칙: 배치 인원이 타일 수보다 많아지면 인원 수만큼
+        if (currentParticipantCount > stateManager.currentLayout) {
+            targetLayout = stateManager.getOptimalLayout(currentParticipantCount);
         }
 
         // 레이아웃 확장이 필요한 경우
         if (targetLayout > stateManager.currentLayout) {
-            // 현재 참가자들 정보 백업
-            const currentParticipantNames = stateManager.getPlacedParticipantNames();
+            this.relayoutParticipants(targetLayout);
+        }
+    },
 
-            // 상태 초기화
-            currentParticipantNames.forEach(name => {
-                stateManager.removeFromVideoArea(name);
-            });
+    // 새 타일 수로 슬롯을 다시 만들고 배치된 참가자를 순서대로 재배치
+    relayoutParticipants(targetLayout) {
+        // 현재 참가자들 정보 백업
+        const currentParticipantNames = stateManager.getPlacedParticipantNames();
 
-            // 새 레이아웃 생성
-            stateManager.setLayout(targetLayout);
-            this.createVideoSlots();
+        // 상태 초기화
+        currentParticipantNames.forEach(name => {
+            stateManager.removeFromVideoArea(name);
+        });
 
-            // 참가자들 재배치
-            currentParticipantNames.forEach((name, index) => {
-                const targetSlot = document.querySelector(`#slot-${index}`);
-                if (targetSlot) {
-                    this.addParticipantToSlot(name, targetSlot);
-                }
-            });
-        }
+        // 새 레이아웃 생성
+        stateManager.setLayout(Math.min(targetLayout, MAX_TILES));
+        this.createVideoSlots();
+
+        // 참가자들 재배치
+        currentParticipantNames.forEach((name, index) => {
+            const targetSlot = document.querySelector(`#slot-${index}`);
+            if (targetSlot) {
+                this.addParticipantToSlot(name, targetSlot);
+            }
+        });
     },
 
     // 비디오 영역 초기화
@@ -8,7 +8,17 @@ let localStream = null;      // 현재 송출 중인 화면 스트림
 let pc = null;               // 단일 RTCPeerConnection
 let pendingOffer = null;     // 보류된 offer
 let pendingCandidates = [];  // 보류 ICE 후보
+let pendingEncoding = null;  // 보류된 수신 측 인코딩 요청 (video sender 생성 전)
+let receiverCaps = {};       // offer signal에 실린 receiver 기능 (candidateBatch 등)
+let candidateBatch = [];     // 묶어서 보낼 로컬 ICE 후보
+let candidateTimer = null;
+let receiverIce = null;      // offer signal에 실린 ICE 정책 { policy, iceServers, gatheringDeadlineMs }
+let gatheringDeadlinePassed = false;
+const CANDIDATE_BATCH_MS = 30;
+const SENDER_CAPS = { candidateBatch: true };   // answer에 실어 receiver에 알리는 기능
 const servers = { iceServers: [{ urls: "stun:stun.l.google.com:19302" }] };
+// 입장할 방 ID (?room=<id>, 없으면 기본 방)
+const roomId = new URLSearchParams(window.location.search).get('room') || 'default';
 
 let senderName = '';         // 송신자 이름
 let shareAnnounced = false;  // sender-share-started 전송 여부
@@ -44,15 +54,30 @@ resetLocalPreview();
 // ---------- RTCPeerConnection ----------
 function createPc() {
   if (pc) return pc;
-  pc = new RTCPeerConnection(servers);
+  // receiver가 정한 ICE 정책을 따름 (lan이면 iceServers 없음 → host 후보만)
+  const config = receiverIce?.iceServers ? { iceServers: receiverIce.iceServers } : servers;
+  pc = new RTCPeerConnection(config);
+  gatheringDeadlinePassed = false;
+  console.log('[SENDER] ICE policy:', receiverIce?.policy || 'default');
 
   pc.onicecandidate = (e) => {
+    // receiver가 묶음을 지원하지 않으면 후보별 전송 (이전 방식)
+    if (!receiverCaps.candidateBatch) {
+      if (e.candidate) {
+        socket.emit('signal', {
+          type: 'candidate',
+          payload: e.candidate,
+          from: socket.id
+        });
+      }
+      return;
+    }
     if (e.candidate) {
-      socket.emit('signal', {
-        type: 'candidate',
-        payload: e.candidate,
-        from: socket.id
-      });
+      candidateBatch.push(e.candidate.toJSON());
+      if (gatheringDeadlinePassed) flushLocalCandidates();
+      else if (!candidateTimer) candidateTimer = setTimeout(flushLocalCandidates, CANDIDATE_BATCH_MS);
+    } else {
+      flushLocalCandidates();  // end-of-candidates
     }
   };
 
@@ -68,6 +93,32 @@ function createPc() {
   return pc;
 }
 
+// ---------- 로컬 ICE 후보 묶음 전송 ----------
+function flushLocalCandidates() {
+  if (candidateTimer) {
+    clearTimeout(candidateTimer);
+    candidateTimer = null;
+  }
+  if (candidateBatch.length === 0) return;
+  const batch = candidateBatch;
+  candidateBatch = [];
+  socket.emit('signal', {
+    type: 'candidates',
+    payload: { candidates: batch },
+    from: socket.id
+  });
+}
+
+// 수집 마감: 늦게 오는 후보(STUN 타임아웃 등)를 기다리지 않고 바로 전송
+function startGatheringDeadline() {
+  const ms = receiverIce?.gatheringDeadlineMs;
+  if (!ms) return;
+  setTimeout(() => {
+    gatheringDeadlinePassed = true;
+    flushLocalCandidates();
+  }, ms);
+}
+
 // ---------- ICE Candidate 보류 처리 ----------
 async function flushPendingCandidates() {
   if (!pc || !pc.remoteDescription) return;
@@ -81,6 +132,44 @@ async function flushPendingCandidates() {
   }
 }
 
+// ---------- 수신 측 인코딩 제어 ----------
+// receiver가 셀 크기/포커스에 맞춰 보내는 상한: { active, maxBitrate, maxFramerate, maxWidth, maxHeight }
+async function applyEncoding(req) {
+  const sender = pc?.getSenders().find(s => s.track?.kind === 'video');
+  if (!sender) {
+    pendingEncoding = req;
+    return;
+  }
+  pendingEncoding = null;
+
+  const params = sender.getParameters();
+  if (!params.encodings || params.encodings.length === 0) {
+    params.encodings = [{}];
+  }
+  const enc = params.encodings[0];
+
+  enc.active = req.active !== false;
+  if (req.maxBitrate) enc.maxBitrate = req.maxBitrate;
+  else delete enc.maxBitrate;
+  if (req.maxFramerate) enc.maxFramerate = req.maxFramerate;
+  else delete enc.maxFramerate;
+
+  // 셀 크기 → 캡처 해상도 대비 축소 배율 (확대는 하지 않음)
+  const { width, height } = sender.track.getSettings();
+  let scale = 1;
+  if (req.maxWidth && req.maxHeight && width && height) {
+    scale = Math.max(1, width / req.maxWidth, height / req.maxHeight);
+  }
+  enc.scaleResolutionDownBy = Math.round(scale * 100) / 100;
+
+  try {
+    await sender.setParameters(params);
+    console.log('[SENDER] encoding 적용:', JSON.stringify(enc));
+  } catch (e) {
+    console.warn('[SENDER] setParameters 실패:', e);
+  }
+}
+
 // ---------- 송신 통계 ----------
 let lastStats = {};
 async function logSenderStats() {
@@ -184,14 +273,17 @@ async function announceShareAndProcessOffer() {
 
       const answer = await pc.createAnswer();
       await pc.setLocalDescription(answer);
+      startGatheringDeadline();
       socket.emit('signal', {
         type: 'answer',
         from: socket.id,
-        payload: { type: 'answer', sdp: answer.sdp }
+        payload: { type: 'answer', sdp: answer.sdp },
+        caps: SENDER_CAPS
       });
       console.log('[SENDER] answer 전송');
 
       pendingOffer = null;
+      if (pendingEncoding) await applyEncoding(pendingEncoding);
     } catch (e) {
       console.warn('[SENDER] 보류 offer 처리 실패:', e);
     }
@@ -217,10 +309,11 @@ enterBtn.addEventListener('click', async () => {
     enterBtn.disabled = false;
   };
 
-  const onSuccess = async ({ name: confirmedName }) => {
+  const onSuccess = async ({ name: confirmedName, room }) => {
     if (handled) return; handled = true;
     senderName = confirmedName || name;
     myNameEl.innerText = senderName;
+    if (roomDisplay) roomDisplay.textContent = room || roomId;
 
     startCard.style.display = 'none';
     mainHeader.style.display = 'flex';
@@ -240,9 +333,9 @@ enterBtn.addEventListener('click', async () => {
   socket.once('join-complete', onSuccess);
   socket.once('join-error', onError);
 
-  socket.emit('join-room', { role: 'sender', name }, (ack) => {
+  socket.emit('join-room', { role: 'sender', name, room: roomId }, (ack) => {
     if (handled) return;
-    if (ack?.success) onSuccess({ name: ack.name || name });
+    if (ack?.success) onSuccess({ name: ack.name || name, room: ack.room });
     else onError(ack?.message || '입장 실패');
   });
 });
@@ -252,6 +345,8 @@ socket.on('signal', async (data) => {
   console.log('[SENDER] signal recv:', data.type);
 
   if (data.type === 'offer') {
+    receiverCaps = data.caps || {};
+    receiverIce = data.ice || null;
     try {
       if (!localStream) {
         const ok = await startLocalCaptureAndPreview();
@@ -283,18 +378,33 @@ socket.on('signal', async (data) => {
 
       const answer = await pc.createAnswer();
       await pc.setLocalDescription(answer);
+      startGatheringDeadline();
       socket.emit('signal', {
         type: 'answer',
         from: socket.id,
-        payload: { type: 'answer', sdp: answer.sdp }
+        payload: { type: 'answer', sdp: answer.sdp },
+        caps: SENDER_CAPS
       });
       console.log('[SENDER] answer 전송');
 
       pendingOffer = null;
+      if (pendingEncoding) await applyEncoding(pendingEncoding);
       await announceShareAndProcessOffer();
     } catch (e) {
       console.warn('[SENDER] offer 처리 실패:', e);
     }
+  } else if (data.type === 'encoding') {
+    await applyEncoding(data.payload || {});
+  } else if (data.type === 'candidates') {
+    // receiver가 묶어 보낸 후보들을 한 번에 적용
+    const list = data.payload?.candidates || [];
+    if (!pc || !pc.remoteDescription) {
+      pendingCandidates.push(...list);
+      return;
+    }
+    await Promise.all(list.map(c =>
+      pc.addIceCandidate(new RTCIceCandidate(c))
+        .catch(e => console.warn('ICE candidate 에러:', e))));
   } else if (data.type === 'candidate') {
     if (!pc || !pc.remoteDescription) {
       pendingCandidates.push(data.payload);
@@ -2,54 +2,90 @@ import os
 from flask import Flask, request
 from flask_socketio import SocketIO, emit
 
+from rooms import RoomRegistry
+
 app = Flask(__name__)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-receiver = None
-senders = {}  # sender_id -> {id, name}
+rooms = RoomRegistry()  # 방 ID -> receiver/sender 상태
 
 
 # ---------- Helper ----------
-def emit_sender_list():
-    global receiver, senders
-    if receiver:
-        sender_arr = [{"id": s["id"], "name": s["name"]} for s in senders.values()]
-        socketio.emit("sender-list", sender_arr, to=receiver)
+def emit_sender_list(room):
+    if room and room.receiver:
+        socketio.emit("sender-list", room.sender_list(), to=room.receiver)
+
+
+def notify_sender_added(room, sender_id, name):
+    if room.deltas:
+        socketio.emit("sender-added", room.delta(id=sender_id, name=name), to=room.receiver)
+    else:
+        emit_sender_list(room)
+
+
+def notify_sender_renamed(room, sender_id, name):
+    if room.deltas:
+        socketio.emit("sender-renamed", room.delta(id=sender_id, name=name), to=room.receiver)
+    else:
+        emit_sender_list(room)
+
+
+def notify_sender_removed(room, sender_id):
+    if room.deltas:
+        socketio.emit("sender-removed", room.delta(id=sender_id), to=room.receiver)
+    else:
+        socketio.emit("sender-disconnected", {"id": sender_id}, to=room.receiver)
+        emit_sender_list(room)
+
+
+def close_room(room_id):
+    """방 삭제: 해당 방 sender들에게만 room-deleted 전송"""
+    for sender_id in rooms.delete_room(room_id):
+        socketio.emit("room-deleted", to=sender_id)
+
+
+def notify_left(sid, room, role):
+    """sid가 방을 떠남 (연결 종료 / 다른 방 입장): sender면 receiver에 알림, receiver면 방 닫기"""
+    if role == "sender":  # sender out
+        if room.receiver:
+            notify_sender_removed(room, sid)
+    elif role == "receiver":  # receiver out
+        close_room(room.id)
 
 
 # ---------- Socket Events ----------
 @socketio.on("share-request")
 def handle_share_request(data):
+    room = rooms.room_of(request.sid)
     to = data.get("to")
-    emit("share-request", {"from": request.sid}, to=to)
+    if room and to in room.senders:
+        emit("share-request", {"from": request.sid}, to=to)
 
 
 @socketio.on("share-started")
 def handle_share_started(data):
-    global receiver
-    if not receiver:
+    room = rooms.room_of(request.sid)
+    if not room or not room.receiver:
         return
-    sender_info = senders.get(request.sid, {})
+    sender_info = room.senders.get(request.sid, {})
     display_name = sender_info.get("name") or data.get("name") or f"Sender-{request.sid[:5]}"
-    emit("sender-share-started", {"id": request.sid, "name": display_name}, to=receiver)
-    emit_sender_list()
+    emit("sender-share-started", {"id": request.sid, "name": display_name}, to=room.receiver)
+    if not room.deltas:
+        emit_sender_list(room)
 
 
 @socketio.on("sender-share-stopped")
-def handle_sender_stopped():
-    global receiver
-    if receiver:
-        emit("sender-share-stopped", {"id": request.sid}, to=receiver)
+def handle_sender_stopped(data=None):
+    room = rooms.room_of(request.sid)
+    if room and room.receiver:
+        emit("sender-share-stopped", {"id": request.sid}, to=room.receiver)
 
 
 @socketio.on("del-room")
 def handle_del_room(data):
-    global receiver, senders
-    if data.get("role") == "receiver":
-        for sender_id in list(senders.keys()):
-            emit("room-deleted", to=sender_id)
-        receiver = None
-        senders.clear()
+    room = rooms.room_of(request.sid)
+    if data.get("role") == "receiver" and room and room.receiver == request.sid:
+        close_room(room.id)
 
 
 @socketio.on("join-room")
@@ -57,62 +93,71 @@ def handle_join_room(data):
     """
     Flask-SocketIO에서는 서버 핸들러가 return 값을 주면
     클라이언트 emit 의 ack(callback) 함수로 전달됨.
+    data = {role, name, room, caps}  (room이 없으면 기본 방)
+    caps.senderDeltas: receiver가 sender-added/removed/renamed 델타를 받음
+    (전체 목록은 ack의 snapshot으로 한 번만 전달)
     """
-    global receiver, senders
     role = data.get("role")
     name = data.get("name")
+    room_id = data.get("room")
 
     if role == "receiver":
-        receiver = request.sid
-        emit_sender_list()
-        return {"success": True}
+        caps = data.get("caps") or {}
+        room, left = rooms.join_receiver(request.sid, room_id, deltas=caps.get("senderDeltas"))
+        if left[0] is not room:
+            notify_left(request.sid, *left)
+        if room.deltas:
+            return {"success": True, "room": room.id, "snapshot": room.snapshot()}
+        emit_sender_list(room)
+        return {"success": True, "room": room.id}
 
     # sender
-    if not receiver:
-        return {"success": False, "message": "리시버가 없습니다."}
+    room, result, prev_name, left = rooms.join_sender(request.sid, room_id, name)
+    if room is None:
+        return {"success": False, "message": result}
+    assigned_name = result
+    notify_left(request.sid, *left)
 
-    if any(s["name"] == name for s in senders.values()):
-        return {"success": False, "message": "이미 사용 중인 이름입니다."}
+    if prev_name is None:
+        notify_sender_added(room, request.sid, assigned_name)
+    elif prev_name != assigned_name:
+        notify_sender_renamed(room, request.sid, assigned_name)
+    emit("joined-room", {"name": assigned_name, "room": room.id}, to=request.sid)
+    emit("join-complete", {"name": assigned_name, "room": room.id}, to=request.sid)
 
-    assigned_name = name or f"Sender-{request.sid[:5]}"
-    senders[request.sid] = {"id": request.sid, "name": assigned_name}
+    return {"success": True, "name": assigned_name, "room": room.id}
 
-    emit_sender_list()
-    emit("joined-room", {"name": assigned_name}, to=request.sid)
-    emit("join-complete", {"name": assigned_name}, to=request.sid)
 
-    return {"success": True, "name": assigned_name}
+@socketio.on("sender-snapshot")
+def handle_sender_snapshot(data=None):
+    """델타 순번이 어긋난 receiver의 전체 목록 재요청 (ack로 응답)"""
+    room = rooms.room_of(request.sid)
+    if room and room.receiver == request.sid:
+        return room.snapshot()
+    return None
 
 
 @socketio.on("signal")
 def handle_signal(data):
-    global receiver, senders
     data = data or {}
     data["from"] = request.sid
+    room = rooms.room_of(request.sid)
+    if not room:
+        return
 
-    if request.sid in senders:  # sender
-        if receiver:
-            data["to"] = receiver
-            emit("signal", data, to=receiver)
-    elif request.sid == receiver:  # receiver
+    if request.sid in room.senders:  # sender
+        if room.receiver:
+            data["to"] = room.receiver
+            emit("signal", data, to=room.receiver)
+    elif request.sid == room.receiver:  # receiver
         target = data.get("to")
-        if target and target in senders:
+        if target and target in room.senders:
             emit("signal", data, to=target)
 
 
 @socketio.on("disconnect")
 def handle_disconnect():
-    global receiver, senders
-    if request.sid in senders:  # sender out
-        del senders[request.sid]
-        if receiver:
-            emit("sender-disconnected", {"id": request.sid}, to=receiver)
-            emit_sender_list()
-    elif request.sid == receiver:  # receiver out
-        for sender_id in list(senders.keys()):
-            emit("room-deleted", to=sender_id)
-        receiver = None
-        senders.clear()
+    notify_left(request.sid, *rooms.leave(request.sid))
 
 
 # ---------- Start Server ----------
@@ -123,9 +168,13 @@ if __name__ == "__main__":
     cert_path = os.path.abspath(os.path.join(sender_dir, "cert.pem"))
     key_path = os.path.abspath(os.path.join(sender_dir, "key.pem"))
 
+    # 벤치마크용: 포트 변경, MULTIFLEXER_SIGNALING_SSL=0이면 인증서 없이 http
+    port = int(os.environ.get("MULTIFLEXER_SIGNALING_PORT", "3001"))
+    use_ssl = os.environ.get("MULTIFLEXER_SIGNALING_SSL", "1") != "0"
+
     socketio.run(
         app,
         host="0.0.0.0",
-        port=3001,
-        ssl_context=(cert_path, key_path)
+        port=port,
+        ssl_context=(cert_path, key_path) if use_ssl else None
     )
@@ -0,0 +1,182 @@
+"""
+asyncio 시그널링 서버 (python-socketio AsyncServer + aiohttp)
+
+index.py와 같은 이벤트 프로토콜/페이로드를 그대로 사용하므로 receiver_manager.py,
+index.js 쪽 변경 없이 교체할 수 있다. 핸들러는 모두 이벤트 루프 한 스레드에서
+실행되어 스레드 전환 없이 signal(offer/answer/candidate)을 바로 중계한다.
+
+    python3 index_async.py                         # https://0.0.0.0:3001
+    MULTIFLEXER_SIGNALING_SSL=0 python3 index_async.py   # 인증서 없이 http (벤치마크용)
+"""
+import os
+import ssl
+
+import socketio
+from aiohttp import web
+
+from rooms import RoomRegistry
+
+sio = socketio.AsyncServer(async_mode="aiohttp", cors_allowed_origins="*")
+app = web.Application()
+sio.attach(app)
+
+rooms = RoomRegistry()  # 방 ID -> receiver/sender 상태
+
+
+# ---------- Helper ----------
+async def emit_sender_list(room):
+    if room and room.receiver:
+        await sio.emit("sender-list", room.sender_list(), to=room.receiver)
+
+
+async def notify_sender_added(room, sender_id, name):
+    if room.deltas:
+        await sio.emit("sender-added", room.delta(id=sender_id, name=name), to=room.receiver)
+    else:
+        await emit_sender_list(room)
+
+
+async def notify_sender_renamed(room, sender_id, name):
+    if room.deltas:
+        await sio.emit("sender-renamed", room.delta(id=sender_id, name=name), to=room.receiver)
+    else:
+        await emit_sender_list(room)
+
+
+async def notify_sender_removed(room, sender_id):
+    if room.deltas:
+        await sio.emit("sender-removed", room.delta(id=sender_id), to=room.receiver)
+    else:
+        await sio.emit("sender-disconnected", {"id": sender_id}, to=room.receiver)
+        await emit_sender_list(room)
+
+
+async def close_room(room_id):
+    """방 삭제: 해당 방 sender들에게만 room-deleted 전송"""
+    for sender_id in rooms.delete_room(room_id):
+        await sio.emit("room-deleted", to=sender_id)
+
+
+async def notify_left(sid, room, role):
+    """sid가 방을 떠남 (연결 종료 / 다른 방 입장): sender면 receiver에 알림, receiver면 방 닫기"""
+    if role == "sender":  # sender out
+        if room.receiver:
+            await notify_sender_removed(room, sid)
+    elif role == "receiver":  # receiver out
+        await close_room(room.id)
+
+
+# ---------- Socket Events ----------
+@sio.on("share-request")
+async def handle_share_request(sid, data):
+    room = rooms.room_of(sid)
+    to = (data or {}).get("to")
+    if room and to in room.senders:
+        await sio.emit("share-request", {"from": sid}, to=to)
+
+
+@sio.on("share-started")
+async def handle_share_started(sid, data):
+    room = rooms.room_of(sid)
+    if not room or not room.receiver:
+        return
+    sender_info = room.senders.get(sid, {})
+    display_name = sender_info.get("name") or (data or {}).get("name") or f"Sender-{sid[:5]}"
+    await sio.emit("sender-share-started", {"id": sid, "name": display_name}, to=room.receiver)
+    if not room.deltas:
+        await emit_sender_list(room)
+
+
+@sio.on("sender-share-stopped")
+async def handle_sender_stopped(sid, data=None):
+    room = rooms.room_of(sid)
+    if room and room.receiver:
+        await sio.emit("sender-share-stopped", {"id": sid}, to=room.receiver)
+
+
+@sio.on("del-room")
+async def handle_del_room(sid, data):
+    room = rooms.room_of(sid)
+    if (data or {}).get("role") == "receiver" and room and room.receiver == sid:
+        await close_room(room.id)
+
+
+@sio.on("join-room")
+async def handle_join_room(sid, data):
+    """반환값이 클라이언트 emit의 ack(callback)으로 전달됨 (index.py와 동일)
+    data = {role, name, room, caps}  (room이 없으면 기본 방, caps는 index.py 참고)"""
+    data = data or {}
+    role = data.get("role")
+    name = data.get("name")
+    room_id = data.get("room")
+
+    if role == "receiver":
+        caps = data.get("caps") or {}
+        room, left = rooms.join_receiver(sid, room_id, deltas=caps.get("senderDeltas"))
+        if left[0] is not room:
+            await notify_left(sid, *left)
+        if room.deltas:
+            return {"success": True, "room": room.id, "snapshot": room.snapshot()}
+        await emit_sender_list(room)
+        return {"success": True, "room": room.id}
+
+    # sender
+    room, result, prev_name, left = rooms.join_sender(sid, room_id, name)
+    if room is None:
+        return {"success": False, "message": result}
+    assigned_name = result
+    await notify_left(sid, *left)
+
+    if prev_name is None:
+        await notify_sender_added(room, sid, assigned_name)
+    elif prev_name != assigned_name:
+        await notify_sender_renamed(room, sid, assigned_name)
+    await sio.emit("joined-room", {"name": assigned_name, "room": room.id}, to=sid)
+    await sio.emit("join-complete", {"name": assigned_name, "room": room.id}, to=sid)
+
+    return {"success": True, "name": assigned_name, "room": room.id}
+
+
+@sio.on("sender-snapshot")
+async def handle_sender_snapshot(sid, data=None):
+    """델타 순번이 어긋난 receiver의 전체 목록 재요청 (ack로 응답)"""
+    room = rooms.room_of(sid)
+    if room and room.receiver == sid:
+        return room.snapshot()
+    return None
+
+
+@sio.on("signal")
+async def handle_signal(sid, data):
+    data = data or {}
+    data["from"] = sid
+    room = rooms.room_of(sid)
+    if not room:
+        return
+
+    if sid in room.senders:  # sender
+        if room.receiver:
+            data["to"] = room.receiver
+            await sio.emit("signal", data, to=room.receiver)
+    elif sid == room.receiver:  # receiver
+        target = data.get("to")
+        if target and target in room.senders:
+            await sio.emit("signal", data, to=target)
+
+
+@sio.event
+async def disconnect(sid, *_):
+    await notify_left(sid, *rooms.leave(sid))
+
+
+# ---------- Start Server ----------
+if __name__ == "__main__":
+    port = int(os.environ.get("MULTIFLEXER_SIGNALING_PORT", "3001"))
+    ssl_context = None
+    if os.environ.get("MULTIFLEXER_SIGNALING_SSL", "1") != "0":
+        sender_dir = os.path.join(os.path.dirname(__file__), "../sender")
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(os.path.abspath(os.path.join(sender_dir, "cert.pem")),
+                                    os.path.abspath(os.path.join(sender_dir, "key.pem")))
+
+    web.run_app(app, host="0.0.0.0", port=port, ssl_context=ssl_context)
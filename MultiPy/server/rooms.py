@@ -0,0 +1,129 @@
+"""
+방(room) 단위 시그널링 상태
+
+receiver 하나가 방 하나를 소유하고 sender는 방 ID로 입장한다.
+sid → 방, 방 ID → 방, 방 안의 이름 → sid 조회가 모두 dict 한 번(O(1))이므로
+중계/브로드캐스트는 해당 방 멤버만 건드린다. index.py / index_async.py가 공유한다.
+
+sender 목록 변경은 방별 순번(seq)이 붙은 델타(sender-added/removed/renamed)로
+알린다. join-room에서 caps.senderDeltas를 보낸 receiver만 델타를 받고, 그 외
+receiver에는 기존처럼 전체 sender-list를 보낸다.
+"""
+
+DEFAULT_ROOM = "default"
+
+
+class Room:
+    def __init__(self, room_id):
+        self.id = room_id
+        self.receiver = None   # receiver sid
+        self.senders = {}      # sender_id -> {id, name}
+        self.names = {}        # name -> sender_id (중복 이름 검사)
+        self.deltas = False    # receiver가 델타 이벤트를 지원하는지
+        self.seq = 0           # sender 목록 변경 순번
+
+    def sender_list(self):
+        return [{"id": s["id"], "name": s["name"]} for s in self.senders.values()]
+
+    def delta(self, **fields):
+        """다음 순번을 붙인 델타 페이로드"""
+        self.seq += 1
+        return {"seq": self.seq, **fields}
+
+    def snapshot(self):
+        """전체 목록 + 현재 순번 (receiver 접속/순번 누락 시)"""
+        return {"seq": self.seq, "senders": self.sender_list()}
+
+    def is_empty(self):
+        return self.receiver is None and not self.senders
+
+
+class RoomRegistry:
+    def __init__(self):
+        self.rooms = {}    # room_id -> Room
+        self._by_sid = {}  # sid -> room_id
+
+    @staticmethod
+    def normalize(room_id):
+        return str(room_id or DEFAULT_ROOM).strip() or DEFAULT_ROOM
+
+    def get(self, room_id):
+        return self.rooms.get(self.normalize(room_id))
+
+    def room_of(self, sid):
+        room_id = self._by_sid.get(sid)
+        return self.rooms.get(room_id) if room_id is not None else None
+
+    def join_receiver(self, sid, room_id, deltas=False):
+        """receiver 등록 → (room, (떠난 방, 역할)). 같은 방의 이전 receiver는 대체.
+        다른 방/역할로 있던 sid는 먼저 정리하고, 호출자가 떠난 방에 알리도록 돌려준다."""
+        room_id = self.normalize(room_id)
+        current = self.room_of(sid)
+        left = (None, None)
+        if current is None or current.id != room_id or current.receiver != sid:
+            left = self.leave(sid)
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = Room(room_id)
+        if room.receiver and room.receiver != sid:
+            self._by_sid.pop(room.receiver, None)
+        room.receiver = sid
+        room.deltas = bool(deltas)
+        self._by_sid[sid] = room_id
+        return room, left
+
+    def join_sender(self, sid, room_id, name):
+        """sender 입장 → (room, 확정된 이름, 이전 이름, (떠난 방, 역할))
+        실패 시 (None, 메시지, None, (None, None)).
+        같은 방에 이미 있는 sid가 다시 입장하면 이름만 바꾸고 이전 이름을 돌려준다.
+        다른 방에 있던 sid는 그 방에서 정리하고, 호출자가 떠난 방에 알리도록 돌려준다."""
+        room = self.get(room_id)
+        if room is None or not room.receiver:
+            return None, "리시버가 없습니다.", None, (None, None)
+        if room.receiver == sid:
+            return None, "리시버는 sender로 입장할 수 없습니다.", None, (None, None)
+        if name and name in room.names and room.names[name] != sid:
+            return None, "이미 사용 중인 이름입니다.", None, (None, None)
+        assigned_name = name or f"Sender-{sid[:5]}"
+
+        prev = room.senders.get(sid)
+        if prev:
+            prev_name = prev["name"]
+            room.names.pop(prev_name, None)
+            prev["name"] = assigned_name
+            room.names[assigned_name] = sid
+            return room, assigned_name, prev_name, (None, None)
+
+        left = self.leave(sid)
+        room.senders[sid] = {"id": sid, "name": assigned_name}
+        room.names[assigned_name] = sid
+        self._by_sid[sid] = room.id
+        return room, assigned_name, None, left
+
+    def leave(self, sid):
+        """sid 퇴장 → (room, role) / 어느 방에도 없으면 (None, None).
+        receiver가 나가면 방의 sender 목록은 호출자가 delete_room으로 정리한다."""
+        room = self.room_of(sid)
+        if room is None:
+            return None, None
+        self._by_sid.pop(sid, None)
+        if room.receiver == sid:
+            room.receiver = None
+            role = "receiver"
+        else:
+            info = room.senders.pop(sid, None)
+            if info:
+                room.names.pop(info["name"], None)
+            role = "sender"
+        if room.is_empty():
+            self.rooms.pop(room.id, None)
+        return room, role
+
+    def delete_room(self, room_id):
+        """방 삭제 → 내보내야 할 sender sid 목록"""
+        room = self.rooms.pop(self.normalize(room_id), None)
+        if room is None:
+            return []
+        for sid in list(room.senders) + ([room.receiver] if room.receiver else []):
+            self._by_sid.pop(sid, None)
+        return list(room.senders)
@@ -0,0 +1,70 @@
+# conftest.py
+# receiver/, server/ 모듈은 서로 파일 이름으로 import하므로 각 디렉터리를 경로에 추가한다.
+# GStreamer(gi)가 없는 환경에서도 순수 로직 모듈(스케줄러 등)을 import할 수 있도록
+# gi.repository.GLib / Gst / GstVideo 자리에 빈 모듈을 둔다.
+# 타이머가 필요한 테스트는 FakeGLib로 교체한다.
+
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for sub in ("receiver", "server"):
+    path = os.path.join(ROOT, sub)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+try:
+    from gi.repository import GLib  # noqa: F401
+except ImportError:
+    gi = types.ModuleType("gi")
+    gi.require_version = lambda *_: None
+    repository = types.ModuleType("gi.repository")
+    for mod in ("GLib", "Gst", "GstVideo"):
+        setattr(repository, mod, types.ModuleType(mod))
+    gi.repository = repository
+    sys.modules.setdefault("gi", gi)
+    sys.modules.setdefault("gi.repository", repository)
+
+
+class FakeGLib:
+    """timeout_add / idle_add / source_remove 기록, 테스트가 직접 실행"""
+
+    def __init__(self):
+        self.sources = {}     # id -> (kind, interval_ms, fn, args)
+        self._next = 0
+
+    def _add(self, kind, interval, fn, args):
+        self._next += 1
+        self.sources[self._next] = (kind, interval, fn, args)
+        return self._next
+
+    def timeout_add(self, interval, fn, *args):
+        return self._add("timeout", interval, fn, args)
+
+    def idle_add(self, fn, *args):
+        return self._add("idle", 0, fn, args)
+
+    def source_remove(self, source_id):
+        self.sources.pop(source_id, None)
+
+    def of_kind(self, kind):
+        return [sid for sid, s in self.sources.items() if s[0] == kind]
+
+    def run(self, source_id):
+        """소스 하나 실행 (False를 돌려주면 제거)"""
+        kind, interval, fn, args = self.sources[source_id]
+        if not fn(*args):
+            self.sources.pop(source_id, None)
+
+    def run_idle(self):
+        """idle 소스가 없어질 때까지 실행"""
+        while self.of_kind("idle"):
+            self.run(self.of_kind("idle")[0])
+
+
+@pytest.fixture
+def fake_glib():
+    return FakeGLib()
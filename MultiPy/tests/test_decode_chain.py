@@ -0,0 +1,78 @@
+import types
+
+import pytest
+
+import decode_chain
+from config import LATENCY_PROFILES
+from decode_chain import DecodeChain
+
+
+class FakeElement:
+    """GObject 속성 흉내: 기본값 테이블에 있는 속성만 존재"""
+
+    def __init__(self, defaults):
+        self.defaults = dict(defaults)
+        self.props = dict(defaults)
+
+    def find_property(self, name):
+        if name not in self.defaults:
+            return None
+        return types.SimpleNamespace(name=name, default_value=self.defaults[name])
+
+    def set_property(self, name, value):
+        name = name.replace("_", "-")
+        if name not in self.defaults:
+            raise TypeError(f"no property {name}")
+        self.props[name] = value
+
+
+# nvh264dec/avdec 계열처럼 프로파일 속성 일부만 지원하는 디코더
+DECODER_DEFAULTS = {"disable-dpb": False, "max-threads": 0, "low-latency": False}
+QUEUE_DEFAULTS = {"leaky": 0, "max-size-time": 1_000_000_000,
+                  "max-size-buffers": 200, "max-size-bytes": 10_485_760}
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    monkeypatch.setattr(decode_chain, "Gst", types.SimpleNamespace(MSECOND=1_000_000))
+    c = DecodeChain.__new__(DecodeChain)   # GStreamer 없이 apply_profile만 검사
+    c.decoder = FakeElement(DECODER_DEFAULTS)
+    c.queue = FakeElement(QUEUE_DEFAULTS)
+    return c
+
+
+def test_ultra_low_sets_decoder_props(chain):
+    chain.apply_profile(LATENCY_PROFILES["ultra-low"])
+    assert chain.decoder.props == {"disable-dpb": True, "max-threads": 1, "low-latency": True}
+    assert chain.queue.props["leaky"] == 2
+
+
+@pytest.mark.parametrize("name", ["balanced", "smooth"])
+def test_switch_from_ultra_low_restores_defaults(chain, name):
+    chain.apply_profile(LATENCY_PROFILES["ultra-low"])
+    chain.apply_profile(LATENCY_PROFILES[name])
+    expected = dict(DECODER_DEFAULTS)
+    expected.update({k.replace("_", "-"): v
+                     for k, v in LATENCY_PROFILES[name]["decoder_props"].items()
+                     if k.replace("_", "-") in DECODER_DEFAULTS})
+    assert chain.decoder.props == expected
+    assert chain.decoder.props["disable-dpb"] is False
+    assert chain.decoder.props["max-threads"] == 0
+
+
+def test_smooth_resets_queue(chain):
+    chain.apply_profile(LATENCY_PROFILES["ultra-low"])
+    chain.apply_profile(LATENCY_PROFILES["smooth"])
+    assert chain.queue.props["leaky"] == 0
+    assert chain.queue.props["max-size-time"] == 1000 * 1_000_000
+
+
+def test_reused_chain_matches_fresh_chain(chain):
+    for name in ("ultra-low", "smooth", "balanced"):
+        chain.apply_profile(LATENCY_PROFILES[name])
+    fresh = DecodeChain.__new__(DecodeChain)
+    fresh.decoder = FakeElement(DECODER_DEFAULTS)
+    fresh.queue = FakeElement(QUEUE_DEFAULTS)
+    fresh.apply_profile(LATENCY_PROFILES["balanced"])
+    assert chain.decoder.props == fresh.decoder.props
+    assert chain.queue.props == fresh.queue.props
@@ -0,0 +1,44 @@
+import pytest
+
+import decoder_probe
+import gst_utils
+
+
+@pytest.fixture
+def probe_env(monkeypatch):
+    saved = []
+    applied = []
+    monkeypatch.setattr(decoder_probe, "_registry_key", lambda: "1.22|abc")
+    monkeypatch.setattr(decoder_probe, "_load_cache", lambda key: None)
+    monkeypatch.setattr(decoder_probe, "_save_cache", lambda key, ranking: saved.append(ranking))
+    monkeypatch.setattr(gst_utils, "set_decoder_ranking", applied.append)
+    return saved, applied
+
+
+def test_measured_ranking_is_cached(probe_env, monkeypatch):
+    saved, applied = probe_env
+    ranking = [("nvh264dec", "cudaconvert", 240.0), ("avdec_h264", "videoconvert", 0.0)]
+    monkeypatch.setattr(decoder_probe, "probe", lambda: ranking)
+    assert decoder_probe.load_or_probe() == ranking
+    assert saved == [ranking]
+    assert applied == [[("nvh264dec", "cudaconvert"), ("avdec_h264", "videoconvert")]]
+
+
+def test_fallback_ranking_is_not_cached(probe_env, monkeypatch):
+    """x264enc 없음 / 모든 조합 실패·시간 초과 → 고정 우선순위는 적용만 하고 저장하지 않음"""
+    saved, applied = probe_env
+    fallback = [("nvh264dec", "cudaconvert", 0.0), ("avdec_h264", "videoconvert", 0.0)]
+    monkeypatch.setattr(decoder_probe, "probe", lambda: fallback)
+    decoder_probe.load_or_probe()
+    assert saved == []
+    assert applied == [[("nvh264dec", "cudaconvert"), ("avdec_h264", "videoconvert")]]
+
+
+def test_cached_ranking_skips_probe(probe_env, monkeypatch):
+    saved, applied = probe_env
+    cached = [["avdec_h264", "videoconvert", 120.0]]
+    monkeypatch.setattr(decoder_probe, "_load_cache", lambda key: cached)
+    monkeypatch.setattr(decoder_probe, "probe", lambda: pytest.fail("probe() called"))
+    decoder_probe.load_or_probe()
+    assert saved == []
+    assert applied == [[("avdec_h264", "videoconvert")]]
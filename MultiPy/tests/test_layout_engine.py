@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from layout_engine import (AUTO, FOCUS, GRID, TILE_ASPECT, cell_rects, grid_dims,
+                           placements, resolve_kind)
+
+ADMIN_JS = os.path.join(os.path.dirname(__file__), "..", "sender", "static", "js", "administrator.js")
+
+# 16:9 화면에서 타일 수별 (행, 열) — 열 수는 마지막 행 lcm span 반영 전
+GRID_DIMS_16_9 = {
+    1: (1, 1), 2: (1, 2), 3: (2, 2), 4: (2, 2), 5: (2, 3), 6: (2, 3), 7: (3, 3), 8: (3, 3),
+    9: (3, 3), 10: (3, 4), 11: (3, 4), 12: (3, 4), 13: (4, 4), 14: (4, 4), 15: (4, 4), 16: (4, 4),
+}
+
+
+def _covered(rows, cols, tiles):
+    """모든 칸이 정확히 한 번씩 덮이는지"""
+    seen = {}
+    for i, (r, c, rs, cs) in enumerate(tiles):
+        for rr in range(r, r + rs):
+            for cc in range(c, c + cs):
+                assert 0 <= rr < rows and 0 <= cc < cols, (i, rr, cc)
+                assert (rr, cc) not in seen, (i, rr, cc)
+                seen[(rr, cc)] = i
+    return len(seen) == rows * cols
+
+
+@pytest.mark.parametrize("count", sorted(GRID_DIMS_16_9))
+def test_grid_dims(count):
+    assert grid_dims(count, TILE_ASPECT) == GRID_DIMS_16_9[count]
+
+
+@pytest.mark.parametrize("count", range(1, 17))
+@pytest.mark.parametrize("kind", [GRID, FOCUS, AUTO])
+def test_placements_tile_whole_grid(count, kind):
+    rows, cols, tiles = placements(count, TILE_ASPECT, kind)
+    assert len(tiles) == count
+    assert _covered(rows, cols, tiles)
+
+
+@pytest.mark.parametrize("count", range(1, 17))
+def test_grid_last_row_spans_full_width(count):
+    rows, cols, tiles = placements(count, TILE_ASPECT, GRID)
+    dims_rows, dims_cols = GRID_DIMS_16_9[count]
+    assert rows == dims_rows
+    last = [t for t in tiles if t[0] == rows - 1]
+    assert sum(t[3] for t in last) == cols
+    assert len({t[3] for t in last}) == 1          # 마지막 행 타일 너비가 같음
+
+
+def test_grid_lcm_span_example():
+    assert placements(5, TILE_ASPECT, GRID) == (2, 6, [
+        (0, 0, 1, 2), (0, 2, 1, 2), (0, 4, 1, 2), (1, 0, 1, 3), (1, 3, 1, 3)])
+
+
+def test_focus_right_strip_and_bottom_strip():
+    assert placements(4, kind=FOCUS) == (3, 3, [
+        (0, 0, 3, 2), (0, 2, 1, 1), (1, 2, 1, 1), (2, 2, 1, 1)])
+    assert placements(6, kind=FOCUS) == (4, 5, [(0, 0, 3, 5)] + [(3, i, 1, 1) for i in range(5)])
+
+
+def test_auto_resolves_focus_only_for_three():
+    assert resolve_kind(3) == FOCUS
+    assert all(resolve_kind(n) == GRID for n in (1, 2, 4, 5, 16))
+    assert resolve_kind(3, GRID) == GRID
+
+
+def _old_mode_rects(mode, width, height):
+    """user-023 이전 compositor.cell_rects (1~4분할 고정 배치)"""
+    hw, hh = width // 2, height // 2
+    return {
+        1: [(0, 0, width, height)],
+        2: [(0, 0, hw, height), (hw, 0, width - hw, height)],
+        3: [(0, 0, hw, height), (hw, 0, width - hw, hh), (hw, hh, width - hw, height - hh)],
+        4: [(0, 0, hw, hh), (hw, 0, width - hw, hh),
+            (0, hh, hw, height - hh), (hw, hh, width - hw, height - hh)],
+    }[mode]
+
+
+@pytest.mark.parametrize("mode", [1, 2, 3, 4])
+@pytest.mark.parametrize("size", [(1920, 1080), (1921, 1081), (1280, 720)])
+def test_old_modes_unchanged(mode, size):
+    assert cell_rects(mode, *size) == _old_mode_rects(mode, *size)
+
+
+def test_cell_rects_fill_canvas():
+    for count in range(1, 17):
+        rects = cell_rects(count, 1920, 1080)
+        assert sum(w * h for _, _, w, h in rects) == 1920 * 1080
+
+
+def _js_placements(cases):
+    """administrator.js의 배치 계산 부분만 node로 실행"""
+    with open(ADMIN_JS, encoding="utf-8") as f:
+        src = f.read()
+    start = src.index("// === 배치 계산")
+    end = src.index("// === 상태 관리")
+    script = src[start:end] + (
+        "\nconst cases = JSON.parse(process.argv[1]);"
+        "\nconsole.log(JSON.stringify(cases.map(([n, a, k]) => tilePlacements(n, a, k))));")
+    out = subprocess.run(["node", "-e", script, json.dumps(cases)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_admin_js_matches_layout_engine():
+    cases = [[n, a, k] for n in range(1, 17) for a in (TILE_ASPECT, 4 / 3, 21 / 9, 1.0)
+             for k in (GRID, FOCUS, AUTO)]
+    for (n, a, k), js in zip(cases, _js_placements(cases)):
+        rows, cols, tiles = placements(n, a, k)
+        assert (js["rows"], js["cols"]) == (rows, cols), (n, a, k)
+        assert [(t["row"], t["col"], t["rowSpan"], t["colSpan"]) for t in js["tiles"]] == tiles, (n, a, k)
+
+
+@pytest.mark.parametrize("aspect", [16 / 10, 4 / 3, 21 / 9])
+def test_auto_two_and_four_keep_legacy_shape(aspect):
+    assert placements(2, aspect) == (1, 2, [(0, 0, 1, 1), (0, 1, 1, 1)])
+    assert placements(4, aspect)[:2] == (2, 2)
+    assert placements(3, aspect) == placements(3, TILE_ASPECT)
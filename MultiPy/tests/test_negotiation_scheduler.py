@@ -0,0 +1,106 @@
+import pytest
+
+import negotiation_scheduler
+from negotiation_scheduler import NegotiationScheduler, PRIORITY_ASSIGNED
+
+
+@pytest.fixture
+def sched(fake_glib, monkeypatch):
+    monkeypatch.setattr(negotiation_scheduler, "GLib", fake_glib)
+    started = []
+    s = NegotiationScheduler(lambda sid, name: started.append(sid), parallelism=2, timeout_ms=500)
+    s.started = started
+    return s
+
+
+def test_parallelism_limits_active(sched, fake_glib):
+    for sid in ("a", "b", "c"):
+        assert sched.submit(sid, sid)
+    fake_glib.run_idle()
+    assert sched.started == ["a", "b"]
+    st = sched.status()
+    assert st["active"] == 2 and st["queue_depth"] == 1 and "c" in st["waiting_ms"]
+
+
+def test_duplicate_submit_rejected(sched, fake_glib):
+    assert sched.submit("a", "a")
+    assert not sched.submit("a", "a")
+    fake_glib.run_idle()
+    assert not sched.submit("a", "a")   # 진행 중
+    assert sched.is_pending("a")
+
+
+def test_priority_then_fifo(sched, fake_glib):
+    sched.submit("a", "a")
+    sched.submit("b", "b")
+    sched.submit("c", "c", PRIORITY_ASSIGNED)
+    fake_glib.run_idle()
+    assert sched.started == ["c", "a"]
+
+
+def test_bump_moves_queued_sender_ahead(sched, fake_glib):
+    for sid in ("a", "b", "c", "d"):
+        sched.submit(sid, sid)
+    sched.bump("d")
+    fake_glib.run_idle()
+    assert sched.started == ["d", "a"]
+    # 남은 대기열에 bump 전 항목이 있어도 d가 다시 시작되지 않음
+    sched.finish("d")
+    sched.finish("a")
+    fake_glib.run_idle()
+    assert sched.started == ["d", "a", "b", "c"]
+
+
+def test_finish_frees_slot(sched, fake_glib):
+    for sid in ("a", "b", "c"):
+        sched.submit(sid, sid)
+    fake_glib.run_idle()
+    sched.finish("a")
+    assert not sched.is_pending("a")
+    fake_glib.run_idle()
+    assert sched.started == ["a", "b", "c"]
+    # 진행 중 협상마다 타임아웃 하나
+    assert len(fake_glib.of_kind("timeout")) == 2
+
+
+def test_cancel_queued_and_active(sched, fake_glib):
+    for sid in ("a", "b", "c", "d"):
+        sched.submit(sid, sid)
+    fake_glib.run_idle()
+    sched.cancel("c")            # 대기 중
+    sched.cancel("a")            # 진행 중 → 슬롯 반환
+    assert not sched.is_pending("a") and not sched.is_pending("c")
+    fake_glib.run_idle()
+    assert sched.started == ["a", "b", "d"]
+    assert len(fake_glib.of_kind("timeout")) == 2
+
+
+def test_timeout_frees_slot(sched, fake_glib):
+    for sid in ("a", "b", "c"):
+        sched.submit(sid, sid)
+    fake_glib.run_idle()
+    first = min(fake_glib.of_kind("timeout"))
+    assert fake_glib.sources[first][1] == 500
+    fake_glib.run(first)
+    assert not sched.is_pending("a")
+    fake_glib.run_idle()
+    assert sched.started == ["a", "b", "c"]
+    sched.finish("a")            # 이미 반환된 슬롯 → 무시
+    assert sched.status()["active"] == 2
+
+
+def test_start_failure_releases_slot(fake_glib, monkeypatch):
+    monkeypatch.setattr(negotiation_scheduler, "GLib", fake_glib)
+    started = []
+
+    def start(sid, _name):
+        started.append(sid)
+        if sid == "a":
+            raise RuntimeError("boom")
+
+    s = NegotiationScheduler(start, parallelism=1, timeout_ms=500)
+    s.submit("a", "a")
+    s.submit("b", "b")
+    fake_glib.run_idle()
+    assert started == ["a", "b"]
+    assert s.status()["active"] == 1
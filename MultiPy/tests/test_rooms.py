@@ -0,0 +1,127 @@
+from rooms import RoomRegistry, DEFAULT_ROOM
+
+
+def _registry_with_room(room_id="r1", deltas=True):
+    reg = RoomRegistry()
+    room, _ = reg.join_receiver("recv", room_id, deltas=deltas)
+    return reg, room
+
+
+def test_join_receiver_creates_room():
+    reg = RoomRegistry()
+    room, left = reg.join_receiver("recv", "r1", deltas=True)
+    assert left == (None, None)
+    assert room.id == "r1" and room.receiver == "recv" and room.deltas
+    assert reg.room_of("recv") is room
+
+
+def test_normalize_room_id():
+    reg = RoomRegistry()
+    room, _ = reg.join_receiver("recv", "  ")
+    assert room.id == DEFAULT_ROOM
+    assert reg.get(None) is room
+
+
+def test_join_sender_requires_receiver():
+    reg = RoomRegistry()
+    room, msg, prev, left = reg.join_sender("s1", "nobody", "alice")
+    assert room is None and msg and prev is None and left == (None, None)
+
+
+def test_join_sender_assigns_name_and_rejects_duplicate():
+    reg, room = _registry_with_room()
+    r, name, prev, _ = reg.join_sender("s1", "r1", "alice")
+    assert r is room and name == "alice" and prev is None
+    r, msg, _, _ = reg.join_sender("s2", "r1", "alice")
+    assert r is None and msg
+    r, name, _, _ = reg.join_sender("s3", "r1", None)
+    assert name == "Sender-s3"
+
+
+def test_rejoin_same_room_renames():
+    reg, room = _registry_with_room()
+    reg.join_sender("s1", "r1", "alice")
+    r, name, prev, left = reg.join_sender("s1", "r1", "bob")
+    assert (name, prev, left) == ("bob", "alice", (None, None))
+    assert room.names == {"bob": "s1"}
+    assert room.sender_list() == [{"id": "s1", "name": "bob"}]
+
+
+def test_receiver_cannot_join_own_room_as_sender():
+    reg, room = _registry_with_room()
+    r, msg, _, _ = reg.join_sender("recv", "r1", "me")
+    assert r is None and msg
+    assert room.receiver == "recv"
+
+
+def test_leave_sender_and_receiver():
+    reg, room = _registry_with_room()
+    reg.join_sender("s1", "r1", "alice")
+    assert reg.leave("s1") == (room, "sender")
+    assert room.senders == {} and room.names == {}
+    assert reg.leave("s1") == (None, None)
+    assert reg.leave("recv") == (room, "receiver")
+    assert reg.get("r1") is None   # 빈 방은 제거
+
+
+def test_sender_moving_rooms_reports_old_membership():
+    reg, room1 = _registry_with_room("r1")
+    room2, _ = reg.join_receiver("recv2", "r2")
+    reg.join_sender("s1", "r1", "alice")
+    r, name, prev, left = reg.join_sender("s1", "r2", "alice")
+    assert r is room2 and prev is None
+    assert left == (room1, "sender")
+    assert "s1" not in room1.senders and "alice" not in room1.names
+    assert reg.room_of("s1") is room2
+
+
+def test_receiver_moving_rooms_reports_old_room():
+    reg, room1 = _registry_with_room("r1")
+    reg.join_sender("s1", "r1", "alice")
+    room2, left = reg.join_receiver("recv", "r2")
+    assert left == (room1, "receiver")
+    assert room1.receiver is None
+    assert reg.delete_room("r1") == ["s1"]
+    assert reg.room_of("s1") is None
+    assert reg.room_of("recv") is room2
+
+
+def test_receiver_rejoin_keeps_room():
+    reg, room = _registry_with_room()
+    reg.join_sender("s1", "r1", "alice")
+    room.delta(id="s1", name="alice")
+    again, left = reg.join_receiver("recv", "r1", deltas=True)
+    assert again is room and left == (None, None)
+    assert room.seq == 1 and "s1" in room.senders
+
+
+def test_new_receiver_replaces_previous():
+    reg, room = _registry_with_room()
+    again, _ = reg.join_receiver("recv2", "r1")
+    assert again is room and room.receiver == "recv2"
+    assert reg.room_of("recv") is None
+
+
+def test_delta_seq_numbering():
+    reg, room = _registry_with_room()
+    assert room.delta(id="s1", name="a") == {"seq": 1, "id": "s1", "name": "a"}
+    assert room.delta(id="s1") == {"seq": 2, "id": "s1"}
+    assert room.seq == 2
+
+
+def test_snapshot_contents():
+    reg, room = _registry_with_room()
+    reg.join_sender("s1", "r1", "alice")
+    reg.join_sender("s2", "r1", "bob")
+    room.delta(id="s1", name="alice")
+    room.delta(id="s2", name="bob")
+    assert room.snapshot() == {"seq": 2, "senders": [{"id": "s1", "name": "alice"},
+                                                    {"id": "s2", "name": "bob"}]}
+
+
+def test_delete_room_returns_senders():
+    reg, room = _registry_with_room()
+    reg.join_sender("s1", "r1", "alice")
+    assert reg.delete_room("r1") == ["s1"]
+    assert reg.room_of("recv") is None and reg.get("r1") is None
+    assert reg.delete_room("r1") == []
@@ -0,0 +1,96 @@
+import pytest
+
+import ui_scheduler
+from ui_scheduler import (OP_ENCODING, OP_OVERLAY, OP_PLAY, OP_RENDER_SIZE, OP_VISIBLE,
+                          OP_WINDOW, UiCommandScheduler)
+
+
+@pytest.fixture
+def sched(fake_glib, monkeypatch):
+    monkeypatch.setattr(ui_scheduler, "GLib", fake_glib)
+    return UiCommandScheduler(interval_ms=16)
+
+
+def test_last_write_wins_per_key_and_op(sched):
+    calls = []
+    sched.post("a", OP_VISIBLE, lambda v: calls.append(("a", v)), False)
+    sched.post("a", OP_VISIBLE, lambda v: calls.append(("a", v)), True)
+    sched.post("b", OP_VISIBLE, lambda v: calls.append(("b", v)), False)
+    sched._flush()
+    assert calls == [("a", True), ("b", False)]
+    s = sched.stats()
+    assert (s["posted"], s["executed"], s["coalesced"], s["batches"], s["pending"]) == (3, 2, 1, 1, 0)
+
+
+def test_ops_run_in_fixed_order(sched):
+    calls = []
+    for op in (OP_ENCODING, OP_OVERLAY, OP_RENDER_SIZE, OP_VISIBLE, OP_PLAY, OP_WINDOW):
+        sched.post("a", op, calls.append, op)
+    sched.post("b", OP_WINDOW, calls.append, "b-window")
+    sched._flush()
+    assert calls == [OP_WINDOW, "b-window", OP_PLAY, OP_OVERLAY, OP_VISIBLE,
+                     OP_RENDER_SIZE, OP_ENCODING]
+
+
+def test_delayed_command_waits_for_later_batch(sched, fake_glib):
+    calls = []
+    sched.post("a", OP_PLAY, calls.append, "play", delay_ms=10_000)
+    sched.post("a", OP_WINDOW, calls.append, "window")
+    fake_glib.run(sched._timer)
+    assert calls == ["window"]
+    assert sched.stats()["pending"] == 1
+    assert fake_glib.of_kind("timeout") == [sched._timer]   # 남은 명령용 타이머만
+
+
+def test_coalesced_command_takes_latest_delay(sched):
+    calls = []
+    sched.post("a", OP_PLAY, calls.append, "early")
+    sched.post("a", OP_PLAY, calls.append, "late", delay_ms=10_000)
+    sched._flush()
+    assert calls == []
+    assert sched.stats()["coalesced"] == 1
+
+
+def test_cancel_drops_pending_commands_for_key(sched):
+    calls = []
+    sched.post("a", OP_WINDOW, calls.append, "a")
+    sched.post("a", OP_PLAY, calls.append, "a-play")
+    sched.post("b", OP_WINDOW, calls.append, "b")
+    sched.cancel("a")
+    sched._flush()
+    assert calls == ["b"]
+
+
+def test_failing_command_does_not_stop_batch(sched):
+    calls = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    sched.post("a", OP_WINDOW, boom)
+    sched.post("b", OP_WINDOW, calls.append, "b")
+    sched._flush()
+    assert calls == ["b"]
+    assert sched.stats()["executed"] == 2
+
+
+def test_single_timer_per_frame(sched, fake_glib):
+    for key in "abcdef":
+        sched.post(key, OP_VISIBLE, lambda: None)
+    assert len(fake_glib.of_kind("timeout")) == 1
+    sched._flush()
+    assert sched.stats()["batches"] == 1
+
+
+def test_earlier_command_reschedules_timer(sched, fake_glib):
+    sched.post("a", OP_PLAY, lambda: None, delay_ms=10_000)
+    late = fake_glib.of_kind("timeout")
+    sched.post("b", OP_PLAY, lambda: None)
+    now = fake_glib.of_kind("timeout")
+    assert len(now) == 1 and now != late
+    assert fake_glib.sources[now[0]][1] <= 16
+
+
+def test_empty_flush_is_not_a_batch(sched):
+    assert sched._flush() is False
+    assert sched.stats()["batches"] == 0